@@ -1,15 +0,0 @@
-"""
-Validation modules for Word document processing.
-"""
-
-from .base import BaseSchemaValidator
-from .docx import DOCXSchemaValidator
-from .pptx import PPTXSchemaValidator
-from .redlining import RedliningValidator
-
-__all__ = [
-    "BaseSchemaValidator",
-    "DOCXSchemaValidator",
-    "PPTXSchemaValidator",
-    "RedliningValidator",
-]
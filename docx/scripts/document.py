@@ -36,6 +36,7 @@ from pathlib import Path
 from defusedxml import minidom
 from ooxml.scripts.pack import pack_document
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
+from ooxml.scripts.validation.original import OriginalDocument
 from ooxml.scripts.validation.redlining import RedliningValidator
 
 from .utilities import XMLEditor
@@ -619,6 +620,7 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        xsd_cache=None,
     ):
         """
         Initialize with path to unpacked Word document directory.
@@ -630,6 +632,7 @@ class Document:
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            xsd_cache: Optional XSDResultCache to reuse XSD results across saves (default: None)
         """
         self.original_path = Path(unpacked_dir)
 
@@ -646,6 +649,7 @@ class Document:
         pack_document(self.original_path, self.original_docx, validate=False)
 
         self.word_path = self.unpacked_path / "word"
+        self.xsd_cache = xsd_cache
 
         # Generate RSID if not provided
         self.rsid = rsid if rsid else _generate_rsid()
@@ -842,19 +846,25 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
-        # Create validators with current state
-        schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
-        redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
+        with OriginalDocument(self.original_docx) as original:
+            # Create validators with current state, sharing the original snapshot.
+            # XSD errors of the original are memoized per process, so repeated
+            # saves only validate the edited side.
+            schema_validator = DOCXSchemaValidator(
+                self.unpacked_path,
+                original,
+                verbose=False,
+                result_cache=self.xsd_cache,
+            )
+            redlining_validator = RedliningValidator(
+                self.unpacked_path, original, verbose=False
+            )
 
-        # Run validations
-        if not schema_validator.validate():
-            raise ValueError("Schema validation failed")
-        if not redlining_validator.validate():
-            raise ValueError("Redlining validation failed")
+            # Run validations
+            if not schema_validator.validate():
+                raise ValueError("Schema validation failed")
+            if not redlining_validator.validate():
+                raise ValueError("Redlining validation failed")
 
     def save(self, destination=None, validate=True) -> None:
         """
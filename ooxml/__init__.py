@@ -0,0 +1,8 @@
+"""
+Shared OOXML tooling (unpack, pack, validate) for the docx, pptx and pptx-hard skills.
+
+Each skill's ooxml/ directory is a symlink to this package, so there is a
+single copy of the scripts and schemas. A process serving several skills
+imports it once and shares its caches between them, such as the compiled XSD
+schemas in ooxml.scripts.validation.base.
+"""
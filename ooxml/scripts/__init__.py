@@ -0,0 +1,3 @@
+"""
+Command-line scripts and library code for unpacking, packing and validating Office files.
+"""
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Unpack or pack many Office files in one process with a pool of workers.
+
+Inputs come from glob patterns (outputs go to --output-dir) or from a manifest
+with one JSON object per line: {"input": "...", "output": "..."}. One JSON line
+is written to stdout per file, with its timing and any error.
+
+Example usage:
+    python batch.py unpack 'inbox/*.docx' --output-dir work/
+    python batch.py pack 'work/*' --output-dir outbox/ --deterministic
+    python batch.py pack --manifest jobs.jsonl -j 8
+"""
+
+import argparse
+import glob
+import io
+import json
+import multiprocessing.util
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr
+from pathlib import Path
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the ooxml package importable
+    sys.path.insert(0, str(Path(__file__).absolute().parents[2]))
+
+from ooxml.scripts.pack import pack_document  # noqa: E402
+from ooxml.scripts.soffice import SofficePool  # noqa: E402
+from ooxml.scripts.unpack import unpack_document  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack or pack many Office files with a pool of workers"
+    )
+    parser.add_argument("operation", choices=["unpack", "pack"])
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="Glob patterns of Office files (unpack) or unpacked directories (pack)",
+    )
+    parser.add_argument(
+        "--manifest",
+        help='JSON lines file of {"input": ..., "output": ...} objects',
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="Directory for the outputs of files given as glob patterns",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes (default: 0 = one per CPU)",
+    )
+    parser.add_argument("--force", action="store_true", help="pack: skip validation")
+    parser.add_argument(
+        "--soffice",
+        action="store_true",
+        help="pack: always validate with soffice, even if the structural checks pass",
+    )
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="pack: produce identical bytes for identical content",
+    )
+    args = parser.parse_args()
+
+    try:
+        tasks = collect_tasks(
+            args.operation, args.inputs, args.manifest, args.output_dir
+        )
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    options = {
+        "validate": not args.force,
+        "always_use_soffice": args.soffice,
+        "deterministic": args.deterministic,
+    }
+    started = time.perf_counter()
+    failures = 0
+    for record in run_batch(args.operation, tasks, options, args.jobs):
+        failures += not record["ok"]
+        print(json.dumps(record), flush=True)
+
+    print(
+        f"{len(tasks) - failures} succeeded, {failures} failed "
+        f"in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr,
+    )
+    if failures:
+        sys.exit(1)
+
+
+def collect_tasks(operation, patterns, manifest=None, output_dir=None):
+    """Return the (input, output) pairs to process.
+
+    Raises:
+        ValueError: If there is nothing to do, glob patterns are given
+            without an output directory, or two inputs share an output.
+    """
+    tasks = []
+    if manifest:
+        with open(manifest, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    tasks.append((entry["input"], entry["output"]))
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError(
+                        f"{manifest}: Line {line_number}: invalid entry"
+                    ) from e
+
+    if patterns:
+        if not output_dir:
+            raise ValueError("--output-dir is required with glob patterns")
+        for pattern in patterns:
+            for path in sorted(glob.glob(pattern)):
+                tasks.append((path, str(output_path_for(operation, path, output_dir))))
+
+    if not tasks:
+        raise ValueError("No inputs given or matched")
+
+    outputs = Counter(str(Path(target).resolve()) for _, target in tasks)
+    duplicates = sorted(target for target, count in outputs.items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Several inputs would write to {', '.join(duplicates)}")
+    return tasks
+
+
+def output_path_for(operation, input_path, output_dir):
+    """Default output for an input matched by a glob pattern.
+
+    Unpacking report.docx gives output_dir/report; packing a directory gives
+    output_dir/<name> with the extension of its document type.
+    """
+    input_path = Path(input_path)
+    if operation == "unpack":
+        return Path(output_dir) / input_path.stem
+    for folder, extension in (("word", ".docx"), ("ppt", ".pptx"), ("xl", ".xlsx")):
+        if (input_path / folder).is_dir():
+            return Path(output_dir) / f"{input_path.name}{extension}"
+    raise ValueError(f"{input_path} is not an unpacked .docx, .pptx or .xlsx")
+
+
+def run_batch(operation, tasks, options, jobs=0):
+    """Process tasks in a worker pool, yielding one result record per task in order."""
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+        work = [(operation, source, target, options) for source, target in tasks]
+        yield from executor.map(_run_task, work)
+
+
+# soffice processes of a batch worker, kept for all the files it packs
+_worker_soffice_pool = None
+
+
+def _init_worker():
+    """Process pool initializer: create the worker's soffice pool."""
+    global _worker_soffice_pool
+    _worker_soffice_pool = SofficePool(size=1)
+    # Worker processes skip atexit handlers, so stop soffice from a finalizer
+    multiprocessing.util.Finalize(None, _worker_soffice_pool.close, exitpriority=10)
+
+
+def _run_task(task):
+    """Unpack or pack one file and return its result record."""
+    operation, source, target, options = task
+    record = {"operation": operation, "input": source, "output": target}
+    started = time.perf_counter()
+    messages = io.StringIO()
+    try:
+        with redirect_stderr(messages):
+            if operation == "unpack":
+                unpack_document(source, target)
+                record["ok"] = True
+            else:
+                record["ok"] = pack_document(
+                    source, target, soffice_pool=_worker_soffice_pool, **options
+                )
+                if not record["ok"]:
+                    record["error"] = "Validation failed"
+    except Exception as e:
+        record["ok"] = False
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    if messages.getvalue().strip():
+        record["messages"] = messages.getvalue().strip().splitlines()
+    return record
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Benchmark unpack, validation and pack on synthetic Office packages.
+
+Each case generates a .docx, .pptx or .xlsx file of a given size, then times
+unpacking it, every validation check, and packing it again. Results can be
+saved as a baseline and later runs compared against it, so a slowdown in the
+validators or in pack.py shows up as a number.
+
+Example usage:
+    python benchmark.py --save baseline.json
+    python benchmark.py --compare baseline.json
+    python benchmark.py --case 'docx-*' --case pptx-media --repeat 5
+"""
+
+import argparse
+import fnmatch
+import io
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from contextlib import redirect_stdout
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the ooxml package importable
+    sys.path.insert(0, str(Path(__file__).absolute().parents[2]))
+
+from ooxml.scripts.pack import pack_document  # noqa: E402
+from ooxml.scripts.unpack import unpack_document  # noqa: E402
+from ooxml.scripts.validation import (  # noqa: E402
+    DOCXSchemaValidator,
+    OriginalDocument,
+    PPTXSchemaValidator,
+    RedliningValidator,
+    ValidationProfile,
+)
+
+# Case name: (document type, generator options)
+CASES = {
+    "docx-1p": ("docx", {"paragraphs": 1}),
+    "docx-100p": ("docx", {"paragraphs": 100}),
+    "docx-1kp": ("docx", {"paragraphs": 1000}),
+    "docx-10kp": ("docx", {"paragraphs": 10000}),
+    "docx-media": ("docx", {"paragraphs": 100, "images": 4, "image_mb": 8}),
+    "pptx-1s": ("pptx", {"slides": 1}),
+    "pptx-10s": ("pptx", {"slides": 10}),
+    "pptx-100s": ("pptx", {"slides": 100}),
+    "pptx-1000s": ("pptx", {"slides": 1000}),
+    "pptx-media": ("pptx", {"slides": 10, "images": 4, "image_mb": 8}),
+    "xlsx-1r": ("xlsx", {"rows": 1}),
+    "xlsx-1kr": ("xlsx", {"rows": 1000}),
+    "xlsx-10kr": ("xlsx", {"rows": 10000}),
+}
+
+VALIDATORS = {
+    "docx": [DOCXSchemaValidator, RedliningValidator],
+    "pptx": [PPTXSchemaValidator],
+    "xlsx": [],
+}
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+PACKAGE_RELATIONSHIPS = "http://schemas.openxmlformats.org/package/2006/relationships"
+DOCUMENT_RELATIONSHIPS = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+CONTENT_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+S = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+OFFICE_TYPE = "application/vnd.openxmlformats-officedocument"
+
+# Every generated package is built from the same seed, so runs are comparable
+SEED = 20240101
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark unpack, validation and pack on synthetic packages"
+    )
+    parser.add_argument(
+        "--case",
+        action="append",
+        metavar="GLOB",
+        help=f"Cases to run (repeatable, default: all): {', '.join(CASES)}",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per case; the median time is reported (default: 3)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for unpack, XSD validation and pack (default: 1)",
+    )
+    parser.add_argument(
+        "--work-dir",
+        help="Keep generated and unpacked files here (default: a temporary directory)",
+    )
+    parser.add_argument("--save", metavar="PATH", help="Write the results as JSON")
+    parser.add_argument(
+        "--compare",
+        metavar="PATH",
+        help="Compare against results saved with --save; exit 1 on regressions",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Slowdown counted as a regression, as a fraction (default: 0.25)",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.01,
+        help="Ignore slowdowns smaller than this many seconds (default: 0.01)",
+    )
+    args = parser.parse_args()
+
+    names = [
+        name
+        for name in CASES
+        if not args.case or any(fnmatch.fnmatchcase(name, p) for p in args.case)
+    ]
+    if not names:
+        sys.exit(f"Error: No case matches {', '.join(args.case)}")
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_dir = Path(args.work_dir or temp_dir)
+        results = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "jobs": args.jobs,
+            "cases": {},
+        }
+        for name in names:
+            print(f"Running {name}...", file=sys.stderr)
+            results["cases"][name] = run_case(
+                name, work_dir, repeat=args.repeat, jobs=args.jobs
+            )
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    regressions = compare_results(
+        results, baseline, tolerance=args.tolerance, min_delta=args.min_delta
+    )
+    print(format_results(results, baseline, regressions))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) found", file=sys.stderr)
+        sys.exit(1)
+
+
+def generate_package(kind, path, **options):
+    """Write a synthetic .docx, .pptx or .xlsx file to path."""
+    generators = {"docx": _docx_parts, "pptx": _pptx_parts, "xlsx": _xlsx_parts}
+    rng = random.Random(SEED)
+    images = options.pop("images", 0)
+    image_size = int(options.pop("image_mb", 0) * 1024 * 1024)
+    media = [rng.randbytes(image_size) for _ in range(images)]
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in generators[kind](media=media, **options):
+            compress_type = zipfile.ZIP_STORED if name.endswith(".png") else None
+            zf.writestr(name, data, compress_type=compress_type)
+
+
+def _relationships(items):
+    """Relationships part for (Id, type, target) triples."""
+    entries = "".join(
+        f'<Relationship Id="{rid}" Type="{DOCUMENT_RELATIONSHIPS}/{type_}" '
+        f'Target="{target}"/>'
+        for rid, type_, target in items
+    )
+    return f'{XML_DECLARATION}<Relationships xmlns="{PACKAGE_RELATIONSHIPS}">{entries}</Relationships>'
+
+
+def _content_types(overrides):
+    """[Content_Types].xml for (part name, content type) overrides."""
+    entries = "".join(
+        f'<Override PartName="{part}" ContentType="{content_type}"/>'
+        for part, content_type in overrides
+    )
+    return (
+        f'{XML_DECLARATION}<Types xmlns="{CONTENT_TYPES}">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Default Extension="png" ContentType="image/png"/>'
+        f"{entries}</Types>"
+    )
+
+
+def _sentence(rng, words=12):
+    vocabulary = "the quick brown fox jumps over lazy dog & <office> document".split()
+    return escape(" ".join(rng.choice(vocabulary) for _ in range(words)))
+
+
+def _docx_parts(paragraphs=1, media=()):
+    rng = random.Random(SEED)
+    body = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{_sentence(rng)} </w:t></w:r>'
+        f"<w:r><w:rPr><w:b/></w:rPr><w:t>{i}</w:t></w:r></w:p>"
+        for i in range(paragraphs)
+    )
+    yield (
+        "[Content_Types].xml",
+        _content_types(
+            [
+                ("/word/document.xml", f"{OFFICE_TYPE}.wordprocessingml.document.main+xml"),
+                ("/word/styles.xml", f"{OFFICE_TYPE}.wordprocessingml.styles+xml"),
+            ]
+        ),
+    )
+    yield "_rels/.rels", _relationships([("rId1", "officeDocument", "word/document.xml")])
+    yield (
+        "word/_rels/document.xml.rels",
+        _relationships(
+            [("rId1", "styles", "styles.xml")]
+            + [
+                (f"rId{i + 2}", "image", f"media/image{i + 1}.png")
+                for i in range(len(media))
+            ]
+        ),
+    )
+    yield (
+        "word/document.xml",
+        f'{XML_DECLARATION}<w:document xmlns:w="{W}"><w:body>{body}<w:sectPr/></w:body></w:document>',
+    )
+    yield (
+        "word/styles.xml",
+        f'{XML_DECLARATION}<w:styles xmlns:w="{W}"><w:style w:type="paragraph" '
+        'w:styleId="Normal"><w:name w:val="Normal"/></w:style></w:styles>',
+    )
+    for i, data in enumerate(media):
+        yield f"word/media/image{i + 1}.png", data
+
+
+def _shape_tree(shapes, rng):
+    """p:cSld with a group header and the given number of text shapes."""
+    tree = "".join(
+        f'<p:sp><p:nvSpPr><p:cNvPr id="{i + 2}" name="Text {i + 2}"/><p:cNvSpPr/>'
+        "<p:nvPr/></p:nvSpPr><p:spPr/><p:txBody><a:bodyPr/><a:p><a:r>"
+        f"<a:t>{_sentence(rng)}</a:t></a:r></a:p></p:txBody></p:sp>"
+        for i in range(shapes)
+    )
+    return (
+        '<p:cSld><p:spTree><p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/>'
+        f"<p:nvPr/></p:nvGrpSpPr><p:grpSpPr/>{tree}</p:spTree></p:cSld>"
+    )
+
+
+def _theme():
+    colors = "".join(
+        f'<a:{name}><a:srgbClr val="000000"/></a:{name}>'
+        for name in (
+            "dk1 lt1 dk2 lt2 accent1 accent2 accent3 accent4 accent5 accent6 "
+            "hlink folHlink"
+        ).split()
+    )
+    font = '<a:latin typeface="Arial"/><a:ea typeface=""/><a:cs typeface=""/>'
+    effect = "<a:effectStyle><a:effectLst/></a:effectStyle>"
+    return (
+        f'{XML_DECLARATION}<a:theme xmlns:a="{A}" name="Benchmark"><a:themeElements>'
+        f'<a:clrScheme name="Benchmark">{colors}</a:clrScheme>'
+        f'<a:fontScheme name="Benchmark"><a:majorFont>{font}</a:majorFont>'
+        f"<a:minorFont>{font}</a:minorFont></a:fontScheme>"
+        '<a:fmtScheme name="Benchmark">'
+        f"<a:fillStyleLst>{'<a:noFill/>' * 3}</a:fillStyleLst>"
+        f"<a:lnStyleLst>{'<a:ln/>' * 3}</a:lnStyleLst>"
+        f"<a:effectStyleLst>{effect * 3}</a:effectStyleLst>"
+        f"<a:bgFillStyleLst>{'<a:noFill/>' * 3}</a:bgFillStyleLst>"
+        "</a:fmtScheme></a:themeElements></a:theme>"
+    )
+
+
+def _pptx_parts(slides=1, media=()):
+    rng = random.Random(SEED)
+    namespaces = f'xmlns:a="{A}" xmlns:r="{DOCUMENT_RELATIONSHIPS}" xmlns:p="{P}"'
+    presentation_type = f"{OFFICE_TYPE}.presentationml"
+    yield (
+        "[Content_Types].xml",
+        _content_types(
+            [
+                ("/ppt/presentation.xml", f"{presentation_type}.presentation.main+xml"),
+                ("/ppt/slideMasters/slideMaster1.xml", f"{presentation_type}.slideMaster+xml"),
+                ("/ppt/slideLayouts/slideLayout1.xml", f"{presentation_type}.slideLayout+xml"),
+                ("/ppt/theme/theme1.xml", f"{OFFICE_TYPE}.theme+xml"),
+            ]
+            + [
+                (f"/ppt/slides/slide{i + 1}.xml", f"{presentation_type}.slide+xml")
+                for i in range(slides)
+            ]
+        ),
+    )
+    yield "_rels/.rels", _relationships([("rId1", "officeDocument", "ppt/presentation.xml")])
+    slide_ids = "".join(
+        f'<p:sldId id="{256 + i}" r:id="rId{i + 3}"/>' for i in range(slides)
+    )
+    yield (
+        "ppt/presentation.xml",
+        f"{XML_DECLARATION}<p:presentation {namespaces}><p:sldMasterIdLst>"
+        '<p:sldMasterId id="2147483648" r:id="rId1"/></p:sldMasterIdLst>'
+        f'<p:sldIdLst>{slide_ids}</p:sldIdLst><p:sldSz cx="9144000" cy="6858000"/>'
+        '<p:notesSz cx="6858000" cy="9144000"/></p:presentation>',
+    )
+    yield (
+        "ppt/_rels/presentation.xml.rels",
+        _relationships(
+            [
+                ("rId1", "slideMaster", "slideMasters/slideMaster1.xml"),
+                ("rId2", "theme", "theme/theme1.xml"),
+            ]
+            + [(f"rId{i + 3}", "slide", f"slides/slide{i + 1}.xml") for i in range(slides)]
+        ),
+    )
+    color_map = 'bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2"' + "".join(
+        f' {name}="{name}"'
+        for name in "accent1 accent2 accent3 accent4 accent5 accent6 hlink folHlink".split()
+    )
+    yield (
+        "ppt/slideMasters/slideMaster1.xml",
+        f"{XML_DECLARATION}<p:sldMaster {namespaces}>{_shape_tree(2, rng)}"
+        f"<p:clrMap {color_map}/><p:sldLayoutIdLst>"
+        '<p:sldLayoutId id="2147483649" r:id="rId1"/></p:sldLayoutIdLst></p:sldMaster>',
+    )
+    yield (
+        "ppt/slideMasters/_rels/slideMaster1.xml.rels",
+        _relationships(
+            [
+                ("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml"),
+                ("rId2", "theme", "../theme/theme1.xml"),
+            ]
+        ),
+    )
+    yield (
+        "ppt/slideLayouts/slideLayout1.xml",
+        f"{XML_DECLARATION}<p:sldLayout {namespaces}>{_shape_tree(1, rng)}</p:sldLayout>",
+    )
+    yield (
+        "ppt/slideLayouts/_rels/slideLayout1.xml.rels",
+        _relationships([("rId1", "slideMaster", "../slideMasters/slideMaster1.xml")]),
+    )
+    yield "ppt/theme/theme1.xml", _theme()
+    for i in range(slides):
+        yield (
+            f"ppt/slides/slide{i + 1}.xml",
+            f"{XML_DECLARATION}<p:sld {namespaces}>{_shape_tree(4, rng)}</p:sld>",
+        )
+        # Spread the media over the first slides
+        images = [
+            (f"rId{j + 2}", "image", f"../media/image{j + 1}.png")
+            for j in range(len(media))
+            if j % slides == i
+        ]
+        yield (
+            f"ppt/slides/_rels/slide{i + 1}.xml.rels",
+            _relationships(
+                [("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml")] + images
+            ),
+        )
+    for i, data in enumerate(media):
+        yield f"ppt/media/image{i + 1}.png", data
+
+
+def _xlsx_parts(rows=1, media=()):
+    rng = random.Random(SEED)
+    sheet_rows = "".join(
+        f'<row r="{r + 1}"><c r="A{r + 1}"><v>{r}</v></c>'
+        f'<c r="B{r + 1}"><v>{rng.random():.6f}</v></c>'
+        f'<c r="C{r + 1}" t="inlineStr"><is><t>{_sentence(rng, 4)}</t></is></c></row>'
+        for r in range(rows)
+    )
+    yield (
+        "[Content_Types].xml",
+        _content_types(
+            [
+                ("/xl/workbook.xml", f"{OFFICE_TYPE}.spreadsheetml.sheet.main+xml"),
+                ("/xl/worksheets/sheet1.xml", f"{OFFICE_TYPE}.spreadsheetml.worksheet+xml"),
+            ]
+        ),
+    )
+    yield "_rels/.rels", _relationships([("rId1", "officeDocument", "xl/workbook.xml")])
+    yield (
+        "xl/workbook.xml",
+        f'{XML_DECLARATION}<workbook xmlns="{S}" xmlns:r="{DOCUMENT_RELATIONSHIPS}">'
+        '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>',
+    )
+    yield (
+        "xl/_rels/workbook.xml.rels",
+        _relationships([("rId1", "worksheet", "worksheets/sheet1.xml")]),
+    )
+    yield (
+        "xl/worksheets/sheet1.xml",
+        f'{XML_DECLARATION}<worksheet xmlns="{S}"><sheetData>{sheet_rows}'
+        "</sheetData></worksheet>",
+    )
+    for i, data in enumerate(media):
+        yield f"xl/media/image{i + 1}.png", data
+
+
+def run_case(name, work_dir, repeat=3, jobs=1):
+    """Generate the package for a case and time it repeat times.
+
+    Returns:
+        dict: Median seconds per stage, the package size and whether it validated
+    """
+    kind, options = CASES[name]
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    source = work_dir / f"{name}.{kind}"
+    if not source.exists():
+        generate_package(kind, source, **options)
+
+    timings = {}
+    valid = True
+    for _ in range(repeat):
+        unpacked = work_dir / name
+        output = work_dir / f"{name}-packed.{kind}"
+        shutil.rmtree(unpacked, ignore_errors=True)
+
+        started = time.perf_counter()
+        unpack_document(source, unpacked, jobs=jobs)
+        timings.setdefault("unpack", []).append(time.perf_counter() - started)
+
+        if VALIDATORS[kind]:
+            profile = ValidationProfile(unpacked)
+            started = time.perf_counter()
+            with redirect_stdout(io.StringIO()), OriginalDocument(source) as original:
+                for V in VALIDATORS[kind]:
+                    if V is RedliningValidator:
+                        validator = V(unpacked, original)
+                        validate = profile.wrap_check(
+                            f"{V.__name__}.validate", validator.validate
+                        )
+                    else:
+                        validator = V(unpacked, original, jobs=jobs, profile=profile)
+                        validate = validator.validate
+                    valid = validate() and valid
+            timings.setdefault("validate", []).append(time.perf_counter() - started)
+            for check in profile.report()["checks"]:
+                stage = f"check:{check['name']}"
+                timings.setdefault(stage, []).append(check["seconds"])
+
+        started = time.perf_counter()
+        pack_document(unpacked, output, jobs=jobs)
+        timings.setdefault("pack", []).append(time.perf_counter() - started)
+
+    return {
+        "bytes": source.stat().st_size,
+        "valid": valid if VALIDATORS[kind] else None,
+        "seconds": {
+            stage: round(statistics.median(values), 6)
+            for stage, values in timings.items()
+        },
+    }
+
+
+def compare_results(results, baseline, tolerance=0.25, min_delta=0.01):
+    """Return (case, stage) pairs that got slower than the baseline allows.
+
+    A stage regresses when it takes more than (1 + tolerance) times its
+    baseline time and at least min_delta seconds longer.
+    """
+    if not baseline:
+        return set()
+    regressions = set()
+    for name, case in results["cases"].items():
+        old_case = baseline.get("cases", {}).get(name)
+        if old_case is None:
+            continue
+        for stage, seconds in case["seconds"].items():
+            old = old_case["seconds"].get(stage)
+            if old is None:
+                continue
+            if seconds > old * (1 + tolerance) and seconds - old >= min_delta:
+                regressions.add((name, stage))
+    return regressions
+
+
+def format_results(results, baseline=None, regressions=()):
+    """Return the results as a plain-text table, with changes against baseline."""
+    lines = [f"{'case':<12} {'stage':<62} {'seconds':>9} {'baseline':>9} {'change':>8}"]
+    for name, case in results["cases"].items():
+        old_case = (baseline or {}).get("cases", {}).get(name, {})
+        for stage, seconds in case["seconds"].items():
+            old = old_case.get("seconds", {}).get(stage)
+            if old is None:
+                old_text, change = "", ""
+            else:
+                old_text = f"{old:9.3f}"
+                change = f"{(seconds - old) / old:+8.0%}" if old else ""
+            flag = "  REGRESSION" if (name, stage) in regressions else ""
+            lines.append(
+                f"{name:<12} {stage:<62} {seconds:9.3f} {old_text:>9} {change:>8}{flag}"
+            )
+        if case["valid"] is False:
+            lines.append(f"{name:<12} (generated package did not validate)")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    main()
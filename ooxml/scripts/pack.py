@@ -0,0 +1,804 @@
+#!/usr/bin/env python3
+"""
+Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
+
+Example usage:
+    python pack.py <input_directory> <office_file> [--force]
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import defusedxml.minidom
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the ooxml package importable
+    sys.path.insert(0, str(Path(__file__).absolute().parents[2]))
+
+from ooxml.scripts.soffice import SofficeUnavailable  # noqa: E402
+from ooxml.scripts.validation import BaseSchemaValidator  # noqa: E402
+from ooxml.scripts.validation.original import (  # noqa: E402
+    LAZY_MANIFEST,
+    read_lazy_manifest,
+)
+from ooxml.scripts.xml_stream import (  # noqa: E402
+    DoctypeFound,
+    Frame,
+    StreamingXMLWriter,
+    escape_text,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
+    parser.add_argument("input_directory", help="Unpacked Office document directory")
+    parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--soffice",
+        action="store_true",
+        help="Always validate with soffice, even if the structural checks pass",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for condensing and compressing (default: 1, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--xml-level",
+        type=int,
+        choices=range(10),
+        default=CompressionPolicy.DEFAULT_LEVEL,
+        metavar="0-9",
+        help="Deflate level for XML parts, 0 = store (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--binary-level",
+        type=int,
+        choices=range(10),
+        default=CompressionPolicy.DEFAULT_LEVEL,
+        metavar="0-9",
+        help="Deflate level for other parts, 0 = store (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--compress-media",
+        action="store_true",
+        help="Also deflate already-compressed media (JPEG, PNG, MP4, ...) "
+        "instead of storing it",
+    )
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="Produce identical bytes for identical content "
+        "(canonical member order, fixed timestamps)",
+    )
+    args = parser.parse_args()
+
+    compression = CompressionPolicy(
+        xml_level=args.xml_level,
+        binary_level=args.binary_level,
+        store_compressed_media=not args.compress_media,
+    )
+    try:
+        success = pack_document(
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            always_use_soffice=args.soffice,
+            jobs=args.jobs,
+            compression=compression,
+            deterministic=args.deterministic,
+        )
+
+        # Show warning if validation was skipped
+        if args.force:
+            print("Warning: Skipped validation, file may be corrupt", file=sys.stderr)
+        # Exit with error if validation failed
+        elif not success:
+            print("Contents would produce a corrupt file.", file=sys.stderr)
+            print("Please validate XML before repacking.", file=sys.stderr)
+            print("Use --force to skip validation and pack anyway.", file=sys.stderr)
+            sys.exit(1)
+
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+
+class CompressionPolicy:
+    """Decides how each member of a packed file is compressed.
+
+    XML parts and other parts get their own deflate level (0 stores them).
+    Media in formats that are already compressed is stored by default:
+    deflating it again costs time and saves next to nothing.
+    """
+
+    # zlib's default level, which ZipFile uses when none is given
+    DEFAULT_LEVEL = 6
+
+    COMPRESSED_MEDIA_EXTENSIONS = {
+        # Images
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".gif",
+        ".webp",
+        ".wdp",
+        ".jxr",
+        # Audio and video
+        ".mp3",
+        ".m4a",
+        ".wma",
+        ".mp4",
+        ".m4v",
+        ".mov",
+        ".wmv",
+        ".avi",
+        ".webm",
+        ".ogg",
+        # Embedded packages, which are zip archives themselves
+        ".docx",
+        ".xlsx",
+        ".pptx",
+        ".zip",
+    }
+
+    def __init__(
+        self,
+        xml_level=DEFAULT_LEVEL,
+        binary_level=DEFAULT_LEVEL,
+        store_compressed_media=True,
+    ):
+        for level in (xml_level, binary_level):
+            if not 0 <= level <= 9:
+                raise ValueError(f"Compression level must be 0-9, got {level}")
+        self.xml_level = xml_level
+        self.binary_level = binary_level
+        self.store_compressed_media = store_compressed_media
+
+    def compression_for(self, path):
+        """Return (compress_type, compresslevel) for the member stored at path."""
+        if is_xml_part(path):
+            level = self.xml_level
+        elif (
+            self.store_compressed_media
+            and path.suffix.lower() in self.COMPRESSED_MEDIA_EXTENSIONS
+        ):
+            level = 0
+        else:
+            level = self.binary_level
+        if level == 0:
+            return zipfile.ZIP_STORED, None
+        return zipfile.ZIP_DEFLATED, level
+
+
+def pack_document(
+    input_dir,
+    output_file,
+    validate=False,
+    always_use_soffice=False,
+    jobs=1,
+    compression=None,
+    deterministic=False,
+    soffice_pool=None,
+):
+    """Pack a directory into an Office file (.docx/.pptx/.xlsx).
+
+    Members that unpack.py --lazy left inside the original file, and that have
+    not been written to input_dir since, are copied from the original file.
+
+    Args:
+        input_dir: Path to unpacked Office document directory
+        output_file: Path to output Office file
+        validate: If True, validates the result (default: False). Packages
+            that pass the in-process structural checks (see check_structure)
+            are accepted without soffice; the rest are converted with soffice,
+            which decides.
+        always_use_soffice: Validate with soffice even if the structural
+            checks pass
+        jobs: Worker processes for condensing and compressing members
+            (0 = one per CPU). Members are written in the same order and with
+            the same bytes as with a single process.
+        compression: CompressionPolicy for the members written from input_dir
+            (default: CompressionPolicy()). Lazy members keep the compression
+            they have in the original file.
+        deterministic: Write the same bytes for the same content: members in
+            canonical order ([Content_Types].xml first, then sorted by name)
+            with fixed timestamps and permissions
+        soffice_pool: Optional SofficePool whose long-lived soffice processes
+            are used for validation instead of starting soffice for this file
+
+    Returns:
+        bool: True if successful, False if validation failed
+    """
+    input_dir = Path(input_dir)
+    output_file = Path(output_file)
+
+    if not input_dir.is_dir():
+        raise ValueError(f"{input_dir} is not a directory")
+    if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
+        raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
+
+    lazy_source, lazy_members = read_lazy_manifest(input_dir)
+    if lazy_members and not lazy_source.is_file():
+        raise ValueError(
+            f"{input_dir} was unpacked with --lazy and its source {lazy_source} is missing"
+        )
+
+    # Stream members straight into the archive: XML parts are condensed on
+    # the way in, everything else is read from input_dir as it is. Lazy
+    # members (path None) are copied from the original still compressed.
+    members = [
+        (f.relative_to(input_dir).as_posix(), f)
+        for f in input_dir.rglob("*")
+        if f.is_file() and f.name != LAZY_MANIFEST
+    ]
+    members += [(name, None) for name in sorted(lazy_members)]
+    if deterministic:
+        members.sort(key=canonical_member_order)
+    jobs = jobs or os.cpu_count() or 1
+    compression = compression or CompressionPolicy()
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with contextlib.ExitStack() as stack:
+        zf = stack.enter_context(
+            zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED)
+        )
+        source_zip = None
+        if lazy_members:
+            source_zip = stack.enter_context(zipfile.ZipFile(lazy_source))
+        writer = _MemberWriter(zf, compression, deterministic, source_zip)
+
+        if jobs > 1 and len(members) > 1 and _raw_write_supported(zf):
+            _write_members_in_parallel(writer, members, jobs)
+        else:
+            for arcname, path in members:
+                writer.write(arcname, path)
+
+    # Validate if requested
+    if validate:
+        if always_use_soffice or not check_structure(input_dir):
+            valid = validate_document(output_file, soffice_pool=soffice_pool)
+        else:
+            valid = True
+        if not valid:
+            output_file.unlink()  # Delete the corrupt file
+            return False
+
+    return True
+
+
+def is_xml_part(path):
+    """Return True if the file is an XML part that gets condensed."""
+    return path.name.endswith((".xml", ".rels"))
+
+
+def canonical_member_order(member):
+    """Sort key putting [Content_Types].xml first and the other members by name."""
+    name = member[0]
+    return (name != "[Content_Types].xml", name)
+
+
+class _MemberWriter:
+    """Writes members to a packed file, applying the compression policy."""
+
+    # Timestamp written in deterministic mode: the earliest a zip file can hold
+    FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+    FIXED_EXTERNAL_ATTR = 0o644 << 16  # -rw-r--r--
+
+    def __init__(self, zf, compression, deterministic, source_zip=None):
+        self.zf = zf
+        self.compression = compression
+        self.deterministic = deterministic
+        # Original archive lazy members are copied from
+        self.source_zip = source_zip
+
+    def member_info(self, arcname, path):
+        """Return the ZipInfo for a member written from path."""
+        info = zipfile.ZipInfo.from_file(path, arcname)
+        if self.deterministic:
+            self.normalize(info)
+        return info
+
+    def normalize(self, info):
+        """Replace the platform and filesystem specific fields of info with fixed values."""
+        info.date_time = self.FIXED_DATE_TIME
+        info.external_attr = self.FIXED_EXTERNAL_ATTR
+        info.create_system = 3  # Unix, so permissions are read the same everywhere
+
+    def write(self, arcname, path):
+        """Write one member, condensing it first if it is an XML part."""
+        if path is None:
+            normalize = self.normalize if self.deterministic else None
+            copy_compressed_member(self.source_zip, arcname, self.zf, normalize)
+            return
+
+        info = self.member_info(arcname, path)
+        set_compression(info, *self.compression.compression_for(path))
+        with self.zf.open(info, "w") as member:
+            if is_xml_part(path):
+                condense_xml(path, member)
+            else:
+                with open(path, "rb") as source:
+                    shutil.copyfileobj(source, member, 1024 * 8)
+
+    def needs_worker(self, path):
+        """Return True if the member is worth condensing or compressing in a worker."""
+        if path is None:
+            return False
+        compress_type = self.compression.compression_for(path)[0]
+        return is_xml_part(path) or compress_type != zipfile.ZIP_STORED
+
+    def write_prepared(self, arcname, path, prepared):
+        """Write a member from the result of _compress_member, as write() would have."""
+        data, crc, file_size = prepared
+        info = self.member_info(arcname, path)
+        # ZipFile decides on ZIP64 headers from the size on disk before writing
+        zip64 = info.file_size * 1.05 > zipfile.ZIP64_LIMIT
+        set_compression(info, *self.compression.compression_for(path))
+        info.CRC = crc
+        info.compress_size = len(data)
+        info.file_size = file_size
+        _write_raw_member(self.zf, info, [data], zip64)
+
+
+def _write_members_in_parallel(writer, members, jobs):
+    """Condense and deflate members in worker processes, writing them in order."""
+    with ProcessPoolExecutor(max_workers=min(jobs, len(members))) as executor:
+        # Keep a bounded number of members in flight, so compressed media
+        # does not pile up in memory while an earlier member is still running
+        pending = deque()
+        for arcname, path in members:
+            future = None
+            if writer.needs_worker(path):
+                compress_type, level = writer.compression.compression_for(path)
+                future = executor.submit(
+                    _compress_member, path, is_xml_part(path), compress_type, level
+                )
+            pending.append((arcname, path, future))
+            if len(pending) >= 2 * jobs:
+                _write_pending_member(writer, *pending.popleft())
+        while pending:
+            _write_pending_member(writer, *pending.popleft())
+
+
+def _write_pending_member(writer, arcname, path, future):
+    """Write a member once its worker has finished; members without one are copied."""
+    if future is None:
+        writer.write(arcname, path)
+    else:
+        writer.write_prepared(arcname, path, future.result())
+
+
+def _compress_member(path, is_xml, compress_type, level):
+    """Condense (XML parts only) and compress one file; runs in a worker process.
+
+    Returns:
+        tuple: (compressed bytes, CRC-32, uncompressed size)
+    """
+    sink = _DeflateSink(level if compress_type == zipfile.ZIP_DEFLATED else None)
+    if is_xml:
+        condense_xml(path, sink)
+    else:
+        with open(path, "rb") as source:
+            while chunk := source.read(1024 * 1024):
+                sink.write(chunk)
+    return sink.finish()
+
+
+class _DeflateSink(io.BufferedIOBase):
+    """Write-only file object that deflates its input the way ZipFile does.
+
+    With level None the input is collected uncompressed, for stored members.
+    """
+
+    def __init__(self, level):
+        super().__init__()
+        self._compressor = None
+        if level is not None:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        self._chunks = []
+        self._crc = 0
+        self._size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        if self._compressor is not None:
+            self._chunks.append(self._compressor.compress(data))
+        else:
+            self._chunks.append(data)
+        return len(data)
+
+    def finish(self):
+        """Return (compressed bytes, CRC-32, uncompressed size)."""
+        if self._compressor is not None:
+            self._chunks.append(self._compressor.flush())
+        return b"".join(self._chunks), self._crc, self._size
+
+
+def set_compression(info, compress_type, level):
+    """Set the compression method and deflate level a member is written with."""
+    info.compress_type = compress_type
+    if hasattr(zipfile.ZipInfo, "compress_level"):
+        info.compress_level = level  # Public since Python 3.13
+    elif hasattr(zipfile.ZipInfo, "_compresslevel"):
+        info._compresslevel = level
+    # Otherwise ZipFile uses zlib's default level
+
+
+# There is no public API to append a member whose compressed bytes are
+# already known, so writing one uses these ZipFile and ZipInfo internals.
+# Every one of them is checked before use; without them members are
+# compressed again through the public API.
+_RAW_WRITE_ZIPFILE_ATTRIBUTES = (
+    "fp",
+    "start_dir",
+    "filelist",
+    "NameToInfo",
+    "_lock",
+    "_writecheck",
+    "_didModify",
+    "_writing",
+)
+_RAW_WRITE_ZIPINFO_ATTRIBUTES = ("FileHeader", "header_offset")
+
+
+def _raw_write_supported(zf):
+    """Return True if members with precompressed data can be appended to zf.
+
+    Besides the internals used for the write itself, members written in
+    worker processes need per-member deflate levels, so the output is the
+    same as with ZipFile.open().
+    """
+    return (
+        all(hasattr(zf, attr) for attr in _RAW_WRITE_ZIPFILE_ATTRIBUTES)
+        and all(hasattr(zipfile.ZipInfo, attr) for attr in _RAW_WRITE_ZIPINFO_ATTRIBUTES)
+        and (
+            hasattr(zipfile.ZipInfo, "compress_level")
+            or hasattr(zipfile.ZipInfo, "_compresslevel")
+        )
+    )
+
+
+def _write_raw_member(target_zip, info, chunks, zip64):
+    """Append a member whose compressed bytes, CRC and sizes are already known."""
+    with target_zip._lock:
+        if target_zip._writing:
+            raise ValueError("Can't write a member while another one is open for writing")
+        target_zip.fp.seek(target_zip.start_dir)
+        info.header_offset = target_zip.fp.tell()
+        target_zip._writecheck(info)
+        target_zip._didModify = True
+        target_zip.fp.write(info.FileHeader(zip64))
+        for chunk in chunks:
+            target_zip.fp.write(chunk)
+        target_zip.start_dir = target_zip.fp.tell()
+        target_zip.filelist.append(info)
+        target_zip.NameToInfo[info.filename] = info
+
+
+def copy_compressed_member(source_zip, name, target_zip, normalize=None):
+    """Copy a member between archives without decompressing and recompressing it.
+
+    The compressed bytes are read from the source file at the offset its
+    local header gives. They are inflated on the way through only to check
+    that their CRC and size match the source's central directory, so a
+    corrupt source never yields a corrupt copy. Members that cannot be copied
+    this way (encrypted, compressed with other methods, from an archive that
+    was not opened by file name, or when the zipfile internals are not
+    available) are recompressed with writestr(). normalize,
+    if given, is called with the new member's ZipInfo before it is written.
+    """
+    info = source_zip.getinfo(name)
+    target_info = copy.copy(info)
+    if normalize:
+        normalize(target_info)
+    if (
+        not _raw_write_supported(target_zip)
+        or not source_zip.filename  # Opened from a file object
+        or info.flag_bits & 0x1  # Encrypted
+        or info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+    ):
+        target_zip.writestr(target_info, source_zip.read(info))
+        return
+
+    # Sizes and CRC are known up front, so no data descriptor is written
+    target_info.flag_bits &= ~0x08
+    # Drop extra fields, which may hold a stale ZIP64 record for the source
+    target_info.extra = b""
+    zip64 = (
+        info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+    )
+
+    with open(source_zip.filename, "rb") as source:
+        source.seek(_member_data_offset(source, info))
+        _write_raw_member(
+            target_zip, target_info, _checked_compressed_chunks(source, info), zip64
+        )
+
+
+def _member_data_offset(source, info):
+    """Return the offset of a member's compressed data in the archive file source."""
+    source.seek(info.header_offset)
+    header = source.read(_LOCAL_HEADER.size)
+    if len(header) != _LOCAL_HEADER.size:
+        raise zipfile.BadZipFile(f"Truncated local header of {info.filename}")
+    signature, *_, name_length, extra_length = _LOCAL_HEADER.unpack(header)
+    if signature != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"Bad local header of {info.filename}")
+    return info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+
+
+# Local file header of a zip member: signature, versions, flags, method,
+# time, date, CRC, sizes, name and extra field lengths (APPNOTE 4.3.7)
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+
+
+def _checked_compressed_chunks(source, info):
+    """Yield a member's compressed bytes, checking its CRC and size at the end."""
+    inflater = None
+    if info.compress_type == zipfile.ZIP_DEFLATED:
+        inflater = zlib.decompressobj(-15)
+    crc = 0
+    size = 0
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = source.read(min(remaining, 1024 * 1024))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member {info.filename} in source archive")
+        data = inflater.decompress(chunk) if inflater else chunk
+        crc = zlib.crc32(data, crc)
+        size += len(data)
+        remaining -= len(chunk)
+        yield chunk
+    if inflater:
+        data = inflater.flush()
+        crc = zlib.crc32(data, crc)
+        size += len(data)
+    if crc != info.CRC or size != info.file_size:
+        raise zipfile.BadZipFile(f"Bad CRC or size for {info.filename} in source archive")
+
+
+def check_structure(input_dir):
+    """Return True if input_dir passes the cheap in-process structural checks.
+
+    These are the well-formedness, relationship and content-type checks from
+    validation.BaseSchemaValidator: every part parses, every relationship
+    target exists and every part is referenced and has a content type. Their
+    output is suppressed; False only means soffice has to decide.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        validator = BaseSchemaValidator(input_dir, None)
+        return (
+            validator.validate_xml()
+            and validator.validate_file_references()
+            and validator.validate_content_types()
+        )
+
+
+def validate_document(doc_path, soffice_pool=None):
+    """Validate document by converting to HTML with soffice.
+
+    With a SofficePool the conversion runs in one of its long-lived soffice
+    processes; if the pool cannot start soffice, a one-off soffice process is
+    used as without a pool.
+    """
+    # Determine the correct filter based on file extension
+    match doc_path.suffix.lower():
+        case ".docx":
+            filter_name = "html:HTML"
+        case ".pptx":
+            filter_name = "html:impress_html_Export"
+        case ".xlsx":
+            filter_name = "html:HTML (StarCalc)"
+
+    if soffice_pool is not None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / f"{doc_path.stem}.html"
+            try:
+                success, error_msg = soffice_pool.convert(
+                    doc_path, filter_name.split(":", 1)[1], output_path
+                )
+            except SofficeUnavailable:
+                pass  # Fall back to a one-off soffice process below
+            else:
+                if not success:
+                    print(f"Validation error: {error_msg}", file=sys.stderr)
+                return success
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        try:
+            result = subprocess.run(
+                [
+                    "soffice",
+                    "--headless",
+                    "--convert-to",
+                    filter_name,
+                    "--outdir",
+                    temp_dir,
+                    str(doc_path),
+                ],
+                capture_output=True,
+                timeout=10,
+                text=True,
+            )
+            if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
+                error_msg = result.stderr.strip() or "Document validation failed"
+                print(f"Validation error: {error_msg}", file=sys.stderr)
+                return False
+            return True
+        except FileNotFoundError:
+            print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
+            return True
+        except subprocess.TimeoutExpired:
+            print("Validation error: Timeout during conversion", file=sys.stderr)
+            return False
+        except Exception as e:
+            print(f"Validation error: {e}", file=sys.stderr)
+            return False
+
+
+def condense_xml(xml_file, output):
+    """Write xml_file to output with unnecessary whitespace and comments removed.
+
+    Whitespace-only text and comments are dropped from every element except
+    text elements (w:t, a:t, ...). The part is streamed, so memory use does not
+    grow with its size, and the result is byte-identical to rewriting it with
+    minidom's toxml(encoding="UTF-8").
+
+    Args:
+        xml_file: Path to the XML part
+        output: Binary file object to write the condensed XML to
+    """
+    writer = io.TextIOWrapper(
+        output, encoding="UTF-8", errors="xmlcharrefreplace", newline="\n"
+    )
+    try:
+        with open(xml_file, "rb") as source:
+            StreamingCondenser(writer).parse(source)
+    except DoctypeFound:
+        # Nothing has been written yet; parts with a DTD go through minidom
+        writer.write(_condense_with_minidom(xml_file).decode("utf-8"))
+    finally:
+        writer.flush()
+        writer.detach()
+
+
+def _condense_with_minidom(xml_file):
+    """Condense a part by rewriting its DOM; used for parts with a DOCTYPE."""
+    with open(xml_file, "r", encoding="utf-8") as f:
+        dom = defusedxml.minidom.parse(f)
+
+    # Process each element to remove whitespace and comments
+    for element in dom.getElementsByTagName("*"):
+        # Skip w:t elements and their processing
+        if element.tagName.endswith(":t"):
+            continue
+
+        # Remove whitespace-only text nodes and comment nodes
+        for child in list(element.childNodes):
+            if (
+                child.nodeType == child.TEXT_NODE
+                and child.nodeValue
+                and child.nodeValue.strip() == ""
+            ) or child.nodeType == child.COMMENT_NODE:
+                element.removeChild(child)
+
+    return dom.toxml(encoding="UTF-8")
+
+
+class _Frame(Frame):
+    """An element whose end tag has not been written yet."""
+
+    __slots__ = ("keep_whitespace",)
+
+    def __init__(self, tag, keep_whitespace):
+        super().__init__(tag)
+        # Text elements keep whitespace-only text and comments
+        self.keep_whitespace = keep_whitespace
+
+
+class StreamingCondenser(StreamingXMLWriter):
+    """Remove pretty-printing whitespace and comments from an XML byte stream.
+
+    Mirrors the minidom pass condense_xml used to do: a text node (a run of
+    character data between other nodes) that is whitespace only is dropped,
+    as are comments, unless the parent element's name ends with ":t".
+    Elements left without children are written as empty-element tags.
+    """
+
+    # Parts are read as UTF-8 whatever they declare, as minidom did
+    encoding = "UTF-8"
+
+    def __init__(self, writer):
+        super().__init__(writer)
+        # Output before the root element is held back until the root starts,
+        # so that a DOCTYPE can still be handed to the minidom fallback
+        self._prolog = ['<?xml version="1.0" encoding="UTF-8"?>']
+
+    def parse(self, source):
+        """Read XML from a binary file object and write the condensed form."""
+        self._parse(source)
+        self._flush_prolog()
+
+    def _write(self, data):
+        if self._prolog is not None:
+            self._prolog.append(data)
+        else:
+            self._writer.write(data)
+
+    def _flush_prolog(self):
+        if self._prolog is not None:
+            self._writer.write("".join(self._prolog))
+            self._prolog = None
+
+    def _start_element(self, name, attributes):
+        self._end_text()
+        self._open_parent()
+        self._flush_prolog()
+
+        tag, start_tag = self._start_tag(name, attributes)
+        self._write(start_tag)
+        self._stack.append(_Frame(tag, tag.endswith(":t")))
+
+    def _end_element(self, name):
+        self._end_text()
+        frame = self._stack.pop()
+        self._write(f"</{frame.tag}>" if frame.is_open else "/>")
+
+    def _comment(self, data):
+        self._end_text()
+        # Comments outside the root element are kept
+        if self._stack and not self._stack[-1].keep_whitespace:
+            return
+        self._open_parent()
+        self._write(f"<!--{data}-->")
+
+    def _processing_instruction(self, target, data):
+        self._end_text()
+        self._open_parent()
+        self._write(f"<?{target} {data}?>")
+
+    def _open_parent(self):
+        """A child is being written: end the parent's start tag if still pending."""
+        if self._stack and not self._stack[-1].is_open:
+            self._write(">")
+            self._stack[-1].is_open = True
+
+    def _end_text(self):
+        """Write the text node being accumulated, unless it is dropped."""
+        text = self._take_text()
+        if text is None:
+            return
+        kind, data = text
+
+        if kind == "text":
+            if data.strip() == "" and not self._stack[-1].keep_whitespace:
+                return
+            self._open_parent()
+            self._write(escape_text(data))
+        else:
+            self._open_parent()
+            self._write(f"<![CDATA[{data}]]>")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Long-lived headless LibreOffice processes for conversion-based validation.
+
+Starting soffice costs seconds, converting a typical document a fraction of
+that. SofficePool keeps a few soffice processes listening on UNO pipes and
+reuses them for many conversions, restarting any process that crashes or hangs.
+It needs LibreOffice's Python UNO bindings (the `uno` module); callers fall back
+to running `soffice --convert-to` once per document when they are missing.
+
+Example usage:
+    with SofficePool(size=2) as pool:
+        ok, error = pool.convert("deck.pptx", "impress_html_Export", "out.html")
+"""
+
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.connection import NoConnectException
+except ImportError:
+    uno = None
+
+
+class SofficeUnavailable(Exception):
+    """Raised when no soffice listener can be started or reached."""
+
+
+def _properties(**values):
+    """Build the tuple of PropertyValue structs UNO calls take as options."""
+    return tuple(
+        PropertyValue(Name=name, Value=value) for name, value in values.items()
+    )
+
+
+class SofficeProcess:
+    """One headless soffice process listening on a private UNO pipe.
+
+    Each process gets its own user profile, so several can run side by side.
+    """
+
+    def __init__(self, soffice="soffice", startup_timeout=30):
+        self.soffice = soffice
+        self.startup_timeout = startup_timeout
+        self._process = None
+        self._profile_dir = None
+        self._desktop = None
+
+    def start(self):
+        """Start soffice and connect to it.
+
+        If connecting fails for any reason, the process is stopped and its
+        profile removed before the error propagates.
+
+        Raises:
+            SofficeUnavailable: If UNO is missing, soffice is not installed, or
+                the listener does not come up within startup_timeout seconds.
+        """
+        if uno is None:
+            raise SofficeUnavailable("LibreOffice Python bindings (uno) not found")
+
+        pipe_name = f"ooxml-{uuid.uuid4().hex}"
+        self._profile_dir = tempfile.mkdtemp(prefix="ooxml-soffice-")
+        try:
+            self._process = subprocess.Popen(
+                [
+                    self.soffice,
+                    "--headless",
+                    "--invisible",
+                    "--nologo",
+                    "--norestore",
+                    "--nodefault",
+                    f"--accept=pipe,name={pipe_name};urp;StarOffice.ComponentContext",
+                    f"-env:UserInstallation={Path(self._profile_dir).as_uri()}",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except FileNotFoundError:
+            self.stop()
+            raise SofficeUnavailable(f"{self.soffice} not found")
+
+        try:
+            self._connect(pipe_name)
+        except BaseException:
+            # Never leave a half-started soffice behind, whatever went wrong
+            # (including KeyboardInterrupt while waiting for the listener)
+            self.stop()
+            raise
+
+    def _connect(self, pipe_name):
+        """Wait for the listener on pipe_name and connect to its desktop."""
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        url = f"uno:pipe,name={pipe_name};urp;StarOffice.ComponentContext"
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            if self._process.poll() is not None:
+                raise SofficeUnavailable("soffice exited during startup")
+            try:
+                context = resolver.resolve(url)
+                break
+            except NoConnectException:
+                if time.monotonic() > deadline:
+                    raise SofficeUnavailable("Timeout waiting for soffice to start")
+                time.sleep(0.1)
+
+        self._desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    @property
+    def is_running(self):
+        return self._process is not None and self._process.poll() is None
+
+    def convert(self, doc_path, filter_name, output_path):
+        """Load doc_path and store it to output_path with the given export filter.
+
+        Raises:
+            Exception: Whatever UNO raises if loading or storing fails, including
+                bridge errors when the process has died.
+        """
+        document = self._desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(Path(doc_path).resolve())),
+            "_blank",
+            0,
+            _properties(Hidden=True, ReadOnly=True),
+        )
+        if document is None:
+            raise RuntimeError("Document could not be loaded")
+        try:
+            document.storeToURL(
+                uno.systemPathToFileUrl(str(Path(output_path).resolve())),
+                _properties(FilterName=filter_name),
+            )
+        finally:
+            document.close(True)
+
+    def stop(self):
+        """Terminate the process and remove its profile."""
+        self._desktop = None
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.terminate()
+                try:
+                    self._process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+                    self._process.wait()
+            self._process = None
+        if self._profile_dir is not None:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+
+
+class SofficePool:
+    """A small pool of SofficeProcess instances shared by many conversions.
+
+    Processes are started on first use. A process whose conversion fails
+    because it crashed or timed out is stopped and replaced on the next
+    checkout. If soffice cannot be started at all, every later conversion
+    raises SofficeUnavailable straight away. Safe to use from several threads.
+    """
+
+    def __init__(self, size=1, timeout=10, soffice="soffice"):
+        """
+        Args:
+            size: Number of soffice processes
+            timeout: Seconds a single conversion may take
+            soffice: soffice executable
+        """
+        self.size = size
+        self.timeout = timeout
+        self.soffice = soffice
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(None)  # Started on first checkout
+        self._all = []
+        self._lock = threading.Lock()
+        self._unavailable = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _checkout(self):
+        if self._unavailable is not None:
+            raise self._unavailable
+        process = self._idle.get()
+        if process is not None and process.is_running:
+            return process
+        if process is not None:
+            # Crashed or killed since its last use
+            process.stop()
+            with self._lock:
+                self._all.remove(process)
+        process = SofficeProcess(self.soffice)
+        try:
+            process.start()
+        except SofficeUnavailable as e:
+            self._unavailable = e
+            self._idle.put(None)
+            raise
+        with self._lock:
+            self._all.append(process)
+        return process
+
+    def convert(self, doc_path, filter_name, output_path):
+        """Convert doc_path with a pooled soffice process.
+
+        Returns:
+            tuple: (True, None) on success, (False, error message) if the
+            document could not be converted
+
+        Raises:
+            SofficeUnavailable: If no soffice process could be started
+        """
+        process = self._checkout()
+        outcome = {}
+
+        def run():
+            try:
+                process.convert(doc_path, filter_name, output_path)
+            except Exception as e:
+                outcome["error"] = e
+
+        # UNO calls cannot be interrupted, so a hung conversion is ended by
+        # killing its process; the pool starts a new one on the next checkout
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        worker.join(self.timeout)
+        if worker.is_alive():
+            process.stop()
+            self._idle.put(process)
+            return False, "Timeout during conversion"
+
+        self._idle.put(process)
+        if "error" in outcome:
+            if not process.is_running:
+                return False, f"soffice crashed: {outcome['error']}"
+            return False, str(outcome["error"]) or "Document validation failed"
+        if not Path(output_path).exists():
+            return False, "Document validation failed"
+        return True, None
+
+    def close(self):
+        """Stop every process the pool has started."""
+        with self._lock:
+            processes, self._all = self._all, []
+        for process in processes:
+            process.stop()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
+
+Example usage:
+    python unpack.py <office_file> <output_dir>
+    python unpack.py <office_file> <output_dir> --include 'ppt/slides/slide3.xml' --lazy
+"""
+
+import argparse
+import fnmatch
+import io
+import os
+import random
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
+
+import defusedxml.minidom
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the ooxml package importable
+    sys.path.insert(0, str(Path(__file__).absolute().parents[2]))
+
+from ooxml.scripts.validation.original import (  # noqa: E402
+    LAZY_MANIFEST,
+    write_lazy_manifest,
+)
+from ooxml.scripts.xml_stream import (  # noqa: E402
+    DoctypeFound,
+    Frame,
+    StreamingXMLWriter,
+    escape_text,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack an Office file and pretty-print its XML parts"
+    )
+    parser.add_argument("input_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for pretty-printing (default: 1, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="GLOB",
+        help="Only unpack members matching this glob (repeatable), e.g. 'word/document.xml'",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="GLOB",
+        help="Do not unpack members matching this glob (repeatable), e.g. 'ppt/media/*'",
+    )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="Leave members that are not unpacked inside the original file; "
+        "pack.py copies them from there",
+    )
+    args = parser.parse_args()
+
+    skipped = unpack_document(
+        args.input_file,
+        args.output_dir,
+        jobs=args.jobs,
+        include=args.include,
+        exclude=args.exclude,
+        lazy=args.lazy,
+    )
+    if skipped and not args.lazy:
+        print(
+            f"Warning: {len(skipped)} members were not unpacked; "
+            "use --lazy to be able to pack this directory",
+            file=sys.stderr,
+        )
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.input_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(
+    input_file, output_dir, jobs=1, include=None, exclude=None, lazy=False
+):
+    """Extract an Office file and pretty-print its XML parts.
+
+    XML parts are streamed from the archive straight into the formatted output,
+    so memory use stays roughly constant regardless of part size.
+
+    Args:
+        input_file: Path to Office file (.docx/.pptx/.xlsx)
+        output_dir: Directory to unpack into (created if missing)
+        jobs: Worker processes for pretty-printing (0 = one per CPU). Every
+            part is written to its own file, so the output is the same as
+            with a single process.
+        include: Glob patterns of members to unpack (default: all members)
+        exclude: Glob patterns of members not to unpack
+        lazy: Record the members that are not unpacked in a manifest, so that
+            pack.py copies them from input_file and validation treats them as
+            present and unchanged
+
+    Returns:
+        list: Names of the members that were not unpacked
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    with zipfile.ZipFile(input_file) as zf:
+        members = [info for info in zf.infolist() if not info.is_dir()]
+        selected = select_members(
+            [info.filename for info in members], include, exclude, lazy
+        )
+        skipped = [info.filename for info in members if info.filename not in selected]
+
+        # A stale manifest from an earlier lazy unpack would make pack.py
+        # add members from the wrong archive
+        manifest = output_path / LAZY_MANIFEST
+        if lazy:
+            write_lazy_manifest(output_path, input_file, skipped)
+        elif manifest.exists():
+            manifest.unlink()
+
+        xml_members = []
+        for info in members:
+            if info.filename not in selected:
+                continue
+            if is_xml_part(info.filename):
+                xml_members.append(info)
+            else:
+                zf.extract(info, output_path)
+
+        jobs = jobs or os.cpu_count() or 1
+        if jobs <= 1 or len(xml_members) <= 1:
+            for info in xml_members:
+                pretty_print_member(zf, info, output_path)
+            return skipped
+
+    # Largest parts first, so one big document.xml does not start last
+    xml_members.sort(key=lambda info: info.file_size, reverse=True)
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(xml_members)),
+        initializer=_init_worker,
+        initargs=(input_file, output_path),
+    ) as executor:
+        names = [info.filename for info in xml_members]
+        for _ in executor.map(_pretty_print_in_worker, names):
+            pass
+    return skipped
+
+
+# Archive and output directory of an unpack worker process, set by _init_worker
+_worker_zip = None
+_worker_output_path = None
+
+
+def _init_worker(input_file, output_path):
+    """Process pool initializer: open the archive once per worker."""
+    global _worker_zip, _worker_output_path
+    _worker_zip = zipfile.ZipFile(input_file)
+    _worker_output_path = output_path
+
+
+def _pretty_print_in_worker(name):
+    """Pretty-print one member in a worker process."""
+    pretty_print_member(_worker_zip, _worker_zip.getinfo(name), _worker_output_path)
+
+
+def select_members(names, include=None, exclude=None, lazy=False):
+    """Return the set of member names to unpack.
+
+    A member is selected if it matches an include pattern (any member when
+    there are none) and no exclude pattern; patterns use fnmatch syntax and
+    "*" also matches "/". The relationships part of a selected part is always
+    selected with it. In lazy mode [Content_Types].xml and every .rels part
+    are unpacked too, as validation needs the whole relationship graph.
+    """
+    include = include or []
+    exclude = exclude or []
+
+    def matches(name, patterns):
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+    selected = {
+        name
+        for name in names
+        if (not include or matches(name, include)) and not matches(name, exclude)
+    }
+
+    all_names = set(names)
+    for name in list(selected):
+        path = PurePosixPath(name)
+        rels_name = str(path.parent / "_rels" / f"{path.name}.rels")
+        if rels_name in all_names:
+            selected.add(rels_name)
+
+    if lazy:
+        selected.update(
+            name
+            for name in names
+            if name == "[Content_Types].xml" or name.endswith(".rels")
+        )
+    return selected
+
+
+def is_xml_part(name):
+    """Return True if the member is an XML part that gets pretty-printed."""
+    return name.endswith((".xml", ".rels"))
+
+
+def member_path(output_path, name):
+    """Map a zip member name to a path under output_path, like ZipFile.extract."""
+    parts = [p for p in PurePosixPath(name).parts if p not in ("/", ".", "..")]
+    return output_path.joinpath(*parts)
+
+
+def pretty_print_member(zf, info, output_path):
+    """Write the pretty-printed form of one XML member under output_path."""
+    target = member_path(output_path, info.filename)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with zf.open(info) as source, _open_writer(target) as writer:
+            StreamingPrettyPrinter(writer).parse(source)
+    except DoctypeFound:
+        # Documents with a DTD go through the defused DOM parser, which
+        # handles internal subsets and rejects entity declarations
+        content = zf.read(info).decode("utf-8")
+        dom = defusedxml.minidom.parseString(content)
+        target.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
+    except Exception:
+        # Leave the part as it was in the archive, then report the error
+        zf.extract(info, output_path)
+        raise
+
+
+def _open_writer(target):
+    """Open target for writing with the same encoding behaviour as minidom's toprettyxml."""
+    return io.TextIOWrapper(
+        open(target, "wb"), encoding="ascii", errors="xmlcharrefreplace", newline="\n"
+    )
+
+
+class _Frame(Frame):
+    """An element whose closing tag has not been written yet."""
+
+    __slots__ = ("start_tag", "indent", "held")
+
+    def __init__(self, tag, start_tag, indent):
+        super().__init__(tag)
+        self.start_tag = start_tag
+        self.indent = indent
+        # The only child so far, if it is a text or CDATA node: (kind, data)
+        self.held = None
+
+
+class StreamingPrettyPrinter(StreamingXMLWriter):
+    """Pretty-print an XML byte stream exactly like minidom's toprettyxml.
+
+    Produces the same output as defusedxml.minidom.parse() followed by
+    toprettyxml(indent="  ", encoding="ascii") without building a DOM.
+    Output is written as soon as it is known; only the start tag of the
+    innermost element and its first text node are held back, to decide
+    whether the element is written inline.
+    """
+
+    def __init__(self, writer, indent="  "):
+        super().__init__(writer)
+        self._indent = indent
+
+    def parse(self, source):
+        """Read XML from a binary file object and write the pretty-printed form."""
+        self._writer.write('<?xml version="1.0" encoding="ascii"?>\n')
+        self._parse(source)
+
+    def _start_element(self, name, attributes):
+        self._end_text()
+        self._open_parent()
+        tag, start_tag = self._start_tag(name, attributes)
+        indent = self._indent * len(self._stack)
+        self._stack.append(_Frame(tag, start_tag, indent))
+
+    def _end_element(self, name):
+        self._end_text()
+        frame = self._stack.pop()
+        if frame.is_open:
+            self._writer.write(f"{frame.indent}</{frame.tag}>\n")
+        elif frame.held is None:
+            self._writer.write(f"{frame.indent}{frame.start_tag}/>\n")
+        else:
+            kind, data = frame.held
+            inline = escape_text(data) if kind == "text" else f"<![CDATA[{data}]]>"
+            self._writer.write(
+                f"{frame.indent}{frame.start_tag}>{inline}</{frame.tag}>\n"
+            )
+
+    def _comment(self, data):
+        self._end_text()
+        self._open_parent()
+        self._writer.write(f"{self._child_indent()}<!--{data}-->\n")
+
+    def _processing_instruction(self, target, data):
+        self._end_text()
+        self._open_parent()
+        self._writer.write(f"{self._child_indent()}<?{target} {data}?>\n")
+
+    def _child_indent(self):
+        return self._indent * len(self._stack)
+
+    def _open_parent(self):
+        """A new child is starting: write the parent's start tag and any held text."""
+        if not self._stack:
+            return
+        frame = self._stack[-1]
+        if frame.is_open:
+            return
+        self._writer.write(f"{frame.indent}{frame.start_tag}>\n")
+        frame.is_open = True
+        if frame.held is not None:
+            self._write_text_node(*frame.held)
+            frame.held = None
+
+    def _end_text(self):
+        """Finish the text node being accumulated and attach it to its parent."""
+        text = self._take_text()
+        if text is None:
+            return
+        kind, data = text
+
+        frame = self._stack[-1]
+        if not frame.is_open and frame.held is None:
+            # Might be the only child, in which case it is written inline
+            frame.held = (kind, data)
+            return
+        self._open_parent()
+        self._write_text_node(kind, data)
+
+    def _write_text_node(self, kind, data):
+        if kind == "text":
+            self._writer.write(escape_text(f"{self._child_indent()}{data}\n"))
+        else:
+            self._writer.write(f"<![CDATA[{data}]]>")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Command line tool to validate Office document XML files against XSD schemas and tracked changes.
+
+Usage:
+    python validate.py <dir> --original <original_file>
+    python validate.py <office_file> --original <original_file>
+"""
+
+import argparse
+import sys
+import zipfile
+from pathlib import Path
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the ooxml package importable
+    sys.path.insert(0, str(Path(__file__).absolute().parents[2]))
+
+from ooxml.scripts.validation import (  # noqa: E402
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    OriginalDocument,
+    PPTXSchemaValidator,
+    RedliningValidator,
+    ValidationProfile,
+    XSDResultCache,
+    as_package_source,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate Office document XML files")
+    parser.add_argument(
+        "unpacked_dir",
+        help="Path to unpacked Office document directory, or an Office file "
+        "to validate without unpacking it",
+    )
+    parser.add_argument(
+        "--original",
+        required=True,
+        help="Path to original file (.docx/.pptx/.xlsx)",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable verbose output",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for XSD validation (default: 1, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip per-file checks for parts unchanged since --original "
+        "(cross-part checks still cover every part)",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const="",
+        metavar="DIR",
+        help="Cache XSD results on disk across runs "
+        "(default DIR: ~/.cache/ooxml-validation)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Write per-check and per-part timings, parse counts and bytes as "
+        "JSON to PATH and print the slowest ones to stderr",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of checks and parts shown on stderr with --profile (default: 10)",
+    )
+    args = parser.parse_args()
+
+    # Validate paths
+    unpacked_dir = Path(args.unpacked_dir)
+    original_file = Path(args.original)
+    file_extension = original_file.suffix.lower()
+    assert unpacked_dir.is_dir() or zipfile.is_zipfile(unpacked_dir), (
+        f"Error: {unpacked_dir} is not a directory or an Office file"
+    )
+    assert original_file.is_file(), f"Error: {original_file} is not a file"
+    assert file_extension in [".docx", ".pptx", ".xlsx"], (
+        f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
+    )
+
+    # Run validations
+    match file_extension:
+        case ".docx":
+            validators = [DOCXSchemaValidator, RedliningValidator]
+        case ".pptx":
+            validators = [PPTXSchemaValidator]
+        case _:
+            print(f"Error: Validation not supported for file type {file_extension}")
+            sys.exit(1)
+
+    result_cache = None
+    if args.cache is not None:
+        result_cache = XSDResultCache(args.cache or None)
+
+    profile = ValidationProfile(unpacked_dir) if args.profile else None
+
+    # Run validators, sharing one read-only snapshot of the original file and
+    # one view of the package (read straight from the archive for Office files)
+    success = True
+    with OriginalDocument(original_file) as original, as_package_source(
+        unpacked_dir
+    ) as package:
+        for V in validators:
+            options = {"verbose": args.verbose}
+            if issubclass(V, BaseSchemaValidator):
+                options["jobs"] = args.jobs
+                options["incremental"] = args.incremental
+                options["result_cache"] = result_cache
+                options["profile"] = profile
+            validator = V(package, original, **options)
+            validate = validator.validate
+            if profile is not None and not issubclass(V, BaseSchemaValidator):
+                validate = profile.wrap_check(f"{V.__name__}.validate", validate)
+            if not validate():
+                success = False
+
+    if profile is not None:
+        profile.write_json(args.profile)
+        print(profile.format_table(args.profile_top), file=sys.stderr)
+
+    if success:
+        print("All validations PASSED!")
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
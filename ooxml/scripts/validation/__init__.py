@@ -0,0 +1,27 @@
+"""
+Validation modules for Word document processing.
+"""
+
+from .base import BaseSchemaValidator, clear_original_errors_cache
+from .cache import XSDResultCache
+from .docx import DOCXSchemaValidator
+from .original import OriginalDocument
+from .package import DirectorySource, PackageIndex, ZipSource, as_package_source
+from .pptx import PPTXSchemaValidator
+from .profile import ValidationProfile
+from .redlining import RedliningValidator
+
+__all__ = [
+    "BaseSchemaValidator",
+    "DirectorySource",
+    "DOCXSchemaValidator",
+    "OriginalDocument",
+    "PackageIndex",
+    "PPTXSchemaValidator",
+    "RedliningValidator",
+    "ValidationProfile",
+    "XSDResultCache",
+    "ZipSource",
+    "as_package_source",
+    "clear_original_errors_cache",
+]
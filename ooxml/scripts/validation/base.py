@@ -0,0 +1,1375 @@
+"""
+Base validator with common validation logic for document files.
+"""
+
+import copy
+import functools
+import io
+import itertools
+import os
+import posixpath
+import re
+import sys
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import lxml.etree
+
+from .original import as_original_document
+from .package import PackageIndex, as_package_source
+from .parts import PartCache
+
+# Compiled XSD schemas, keyed by resolved schema path. Compiling an OOXML schema
+# with all of its imports costs far more than validating a part against it, so
+# every schema is compiled at most once per process and shared by all validators.
+_SCHEMA_CACHE = {}
+# Seconds it took to compile each schema in _SCHEMA_CACHE
+_SCHEMA_LOAD_SECONDS = {}
+
+
+def load_schema(schema_path):
+    """Return the compiled XMLSchema for schema_path, compiling it on first use."""
+    schema_path = Path(schema_path).resolve()
+    schema = _SCHEMA_CACHE.get(schema_path)
+    if schema is None:
+        started = time.perf_counter()
+        with open(schema_path, "rb") as xsd_file:
+            parser = lxml.etree.XMLParser()
+            xsd_doc = lxml.etree.parse(
+                xsd_file, parser=parser, base_url=str(schema_path)
+            )
+        schema = lxml.etree.XMLSchema(xsd_doc)
+        _SCHEMA_CACHE[schema_path] = schema
+        _SCHEMA_LOAD_SECONDS[schema_path] = time.perf_counter() - started
+    return schema
+
+
+def _timed_xsd_validation(validator, xml_file):
+    """Run validate_file_against_xsd on xml_file and time it.
+
+    Returns:
+        tuple: (result, seconds, schema_loads), where schema_loads maps the
+        schemas compiled during the call to the seconds that took, and
+        seconds excludes that time
+    """
+    loaded = set(_SCHEMA_CACHE)
+    started = time.perf_counter()
+    result = validator.validate_file_against_xsd(xml_file, verbose=False)
+    seconds = time.perf_counter() - started
+    schema_loads = {
+        path: _SCHEMA_LOAD_SECONDS[path] for path in _SCHEMA_CACHE.keys() - loaded
+    }
+    return result, seconds - sum(schema_loads.values()), schema_loads
+
+
+# XSD errors of parts of original documents, keyed by (validator class,
+# original file digest, part path). The baseline does not change while a
+# document is edited, so validating again against the same original, e.g. on
+# every Document.save(), only validates the edited side. Least recently used
+# entries are evicted beyond _ORIGINAL_ERRORS_CACHE_SIZE.
+#
+# This is an in-memory layer in front of the optional on-disk XSDResultCache.
+# A hit here skips reading and preprocessing the original part altogether.
+# On a miss, the part is validated as usual, so a result cache can still
+# answer from disk, and it stores what it computes. Clearing one cache leaves
+# the other alone. Use clear_original_errors_cache() after changing schemas
+# or validator preprocessing within one process, or to release the memory.
+_ORIGINAL_ERRORS_CACHE = OrderedDict()
+_ORIGINAL_ERRORS_CACHE_SIZE = 1024
+
+
+def clear_original_errors_cache():
+    """Forget the XSD errors memoized for parts of original documents."""
+    _ORIGINAL_ERRORS_CACHE.clear()
+
+
+# Validator owned by an XSD worker process. Each worker builds its own instance,
+# and therefore its own compiled schemas, once in _init_xsd_worker.
+_worker_validator = None
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file, result_cache):
+    """Process pool initializer: create the worker's validator."""
+    global _worker_validator
+    _worker_validator = validator_class(
+        unpacked_dir, original_file, result_cache=result_cache
+    )
+
+
+def _validate_file_in_worker(xml_file):
+    """Validate one part against its schema in a worker process.
+
+    Returns what _timed_xsd_validation returns for the part.
+    """
+    return _timed_xsd_validation(_worker_validator, xml_file)
+
+
+# Template tags such as {{name}}, removed from text before XSD validation
+_TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+_TEMPLATE_TEXT_XPATH = lxml.etree.XPath("/descendant::text()[contains(., '{{')]")
+
+# Interned (namespace, localname) pairs, keyed by Clark-notation name
+_QNAMES = {}
+
+
+def split_qname(name):
+    """Return the (namespace, localname) pair of a Clark-notation tag or attribute.
+
+    namespace is None for names without one. Pairs are interned and memoized,
+    so each distinct name is split once per process.
+    """
+    qname = _QNAMES.get(name)
+    if qname is None:
+        if name[:1] == "{":
+            namespace, _, localname = name[1:].partition("}")
+            qname = (sys.intern(namespace), sys.intern(localname))
+        else:
+            qname = (None, sys.intern(name))
+        _QNAMES[name] = qname
+    return qname
+
+
+class ElementVisitor:
+    """A per-element check that shares a single walk of each part with other checks.
+
+    A visitor registers interest in elements through TAGS, a set of
+    (namespace, localname) pairs where namespace None matches any namespace,
+    or by overriding wants_element(). Elements carrying any of the
+    Clark-notation ATTRIBUTES are visited too. For every such element the
+    walk calls visit(elem, qname, ancestors); `(namespace, localname) in
+    ancestors` tells whether the element is nested in one with that name.
+    Problems are collected in self.errors as ready-to-print lines.
+    """
+
+    TAGS = frozenset()
+    ATTRIBUTES = ()
+    # Visit only the parts in changed_xml_files, not every part
+    CHANGED_PARTS_ONLY = True
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.errors = []
+        # Part being walked and its path relative to the package, set by the walk
+        self.xml_file = None
+        self.relative_path = None
+
+    def wants_part(self, xml_file):
+        """Return False to skip the part at xml_file."""
+        return True
+
+    def wants_element(self, namespace, localname):
+        """Return True to visit elements with this name; asked once per distinct tag."""
+        return (namespace, localname) in self.TAGS or (None, localname) in self.TAGS
+
+    def start_part(self, part):
+        """Prepare for the elements of a part; return False to skip it."""
+
+    def visit(self, elem, qname, ancestors):
+        raise NotImplementedError("Subclasses must implement the visit method")
+
+    def part_failed(self, error):
+        """Record that the current part could not be parsed or checked."""
+        self.errors.append(f"  {self.relative_path}: Error: {error}")
+
+
+class _Ancestors:
+    """Answers `(namespace, localname) in ancestors` for the element being visited.
+
+    Looked up on demand with iterancestors() rather than tracked during the
+    walk, since only a few visited elements ever ask.
+    """
+
+    __slots__ = ("elem",)
+
+    def __init__(self):
+        self.elem = None
+
+    def __contains__(self, qname):
+        namespace, localname = qname
+        tag = localname if namespace is None else f"{{{namespace}}}{localname}"
+        return next(self.elem.iterancestors(tag), None) is not None
+
+
+def _node_key(node):
+    """What identifies a node apart from its text nodes and children."""
+    if node.tag is lxml.etree.Comment:
+        return ("comment", node.text)
+    if node.tag is lxml.etree.ProcessingInstruction:
+        return ("pi", node.target, node.text)
+    return (node.tag, dict(node.attrib))
+
+
+def _timed(method, seconds, key):
+    """Wrap method so that the time spent in it is added to seconds[key]."""
+
+    @functools.wraps(method)
+    def timed(*args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            seconds[key] += time.perf_counter() - started
+
+    return timed
+
+
+def walk_elements(root, visitors, dispatch=None):
+    """Walk the tree under root once, dispatching each element to interested visitors.
+
+    dispatch caches which visitors want each tag; walks with the same
+    visitors can share one dict so that each tag is looked up once. A visitor
+    that raises is reported through part_failed() and dropped for the rest
+    of the tree; the others carry on.
+    """
+    visitors = list(visitors)
+    ancestors = _Ancestors()
+    # Clark tag -> (qname, visitors that want the tag, (attribute, visitor)
+    # pairs of the other visitors that want elements carrying the attribute)
+    if dispatch is None:
+        dispatch = {}
+
+    for elem in root.iter(lxml.etree.Element):
+        tag = elem.tag
+        entry = dispatch.get(tag)
+        if entry is None:
+            qname = split_qname(tag)
+            by_tag = [v for v in visitors if v.wants_element(*qname)]
+            by_attribute = [
+                (attribute, v)
+                for v in visitors
+                if v not in by_tag
+                for attribute in v.ATTRIBUTES
+            ]
+            entry = dispatch[tag] = (qname, by_tag, by_attribute)
+        qname, interested, by_attribute = entry
+
+        for attribute, visitor in by_attribute:
+            if elem.get(attribute) is not None and visitor not in interested:
+                interested = interested + [visitor]
+        if not interested:
+            continue
+
+        ancestors.elem = elem
+        for visitor in interested:
+            try:
+                visitor.visit(elem, qname, ancestors)
+            except Exception as e:
+                visitor.part_failed(e)
+                visitors.remove(visitor)
+                dispatch = {}  # Leave the caller's dict to the full set of visitors
+
+
+class UniqueIdVisitor(ElementVisitor):
+    """IDs listed in UNIQUE_ID_REQUIREMENTS must be unique in their file or globally.
+
+    Elements inside mc:AlternateContent are skipped: its alternatives repeat
+    the same IDs by design.
+    """
+
+    CHANGED_PARTS_ONLY = False  # Global IDs are compared across all parts
+    ALTERNATE_CONTENT = (
+        "http://schemas.openxmlformats.org/markup-compatibility/2006",
+        "AlternateContent",
+    )
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.requirements = validator.UNIQUE_ID_REQUIREMENTS
+        self.global_ids = {}
+        self.file_ids = {}
+
+    def wants_element(self, namespace, localname):
+        return localname.lower() in self.requirements
+
+    def start_part(self, part):
+        self.file_ids = {}  # IDs that must be unique within this file
+
+    def visit(self, elem, qname, ancestors):
+        if self.ALTERNATE_CONTENT in ancestors:
+            return
+        tag = qname[1].lower()
+        attr_name, scope = self.requirements[tag]
+
+        # Look for the specified attribute
+        id_value = None
+        for attr, value in elem.items():
+            if split_qname(attr)[1].lower() == attr_name:
+                id_value = value
+                break
+        if id_value is None:
+            return
+
+        if scope == "global":
+            if id_value in self.global_ids:
+                prev_file, prev_line, prev_tag = self.global_ids[id_value]
+                self.errors.append(
+                    f"  {self.relative_path}: "
+                    f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
+                    f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                )
+            else:
+                self.global_ids[id_value] = (self.relative_path, elem.sourceline, tag)
+        elif scope == "file":
+            ids = self.file_ids.setdefault((tag, attr_name), {})
+            if id_value in ids:
+                self.errors.append(
+                    f"  {self.relative_path}: "
+                    f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                    f"(first occurrence at line {ids[id_value]})"
+                )
+            else:
+                ids[id_value] = elem.sourceline
+
+
+class RelationshipIdVisitor(ElementVisitor):
+    """r:id attributes must name a relationship of the part, of the expected type."""
+
+    CHANGED_PARTS_ONLY = False
+    ATTRIBUTES = (
+        "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id",
+    )
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.rid_to_type = {}
+
+    def wants_part(self, xml_file):
+        # Parts without a .rels part have nothing to check (that's okay)
+        if xml_file.suffix == ".rels":
+            return False
+        package = self.validator.package
+        return package.relationships_part_for(package.name(xml_file)) in package
+
+    def wants_element(self, namespace, localname):
+        return False  # Only elements carrying r:id
+
+    def start_part(self, part):
+        # Valid relationship IDs and their types
+        package = self.validator.package
+        rels_file = package.relationships_part_for(self.relative_path.as_posix())
+        self.rid_to_type = {}
+        for rel in package.relationships(rels_file):
+            if rel.id:
+                # Check for duplicate rIds
+                if rel.id in self.rid_to_type:
+                    self.errors.append(
+                        f"  {rels_file}: Line {rel.sourceline}: "
+                        f"Duplicate relationship ID '{rel.id}' (IDs must be unique)"
+                    )
+                # Extract just the type name from the full URL
+                self.rid_to_type[rel.id] = rel.type.split("/")[-1]
+
+    def visit(self, elem, qname, ancestors):
+        rid_attr = elem.get(self.ATTRIBUTES[0])
+        if not rid_attr:
+            return
+        elem_name = qname[1]
+        rid_to_type = self.rid_to_type
+
+        # Check if the ID exists
+        if rid_attr not in rid_to_type:
+            self.errors.append(
+                f"  {self.relative_path}: Line {elem.sourceline}: "
+                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+            )
+        # Check if we have type expectations for this element
+        elif self.validator.ELEMENT_RELATIONSHIP_TYPES:
+            expected_type = self.validator._get_expected_relationship_type(elem_name)
+            if expected_type:
+                actual_type = rid_to_type[rid_attr]
+                # Check if the actual type matches or contains the expected type
+                if expected_type not in actual_type.lower():
+                    self.errors.append(
+                        f"  {self.relative_path}: Line {elem.sourceline}: "
+                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                        f"but should point to a '{expected_type}' relationship"
+                    )
+
+    def part_failed(self, error):
+        self.errors.append(f"  Error processing {self.relative_path}: {error}")
+
+
+class BaseSchemaValidator:
+    """Base validator with common validation logic for document files."""
+
+    # Elements whose 'id' attributes must be unique within their file
+    # Format: element_name -> (attribute_name, scope)
+    # scope can be 'file' (unique within file) or 'global' (unique across all files)
+    UNIQUE_ID_REQUIREMENTS = {
+        # Word elements
+        "comment": ("id", "file"),  # Comment IDs in comments.xml
+        "commentrangestart": ("id", "file"),  # Must match comment IDs
+        "commentrangeend": ("id", "file"),  # Must match comment IDs
+        "bookmarkstart": ("id", "file"),  # Bookmark start IDs
+        "bookmarkend": ("id", "file"),  # Bookmark end IDs
+        # Note: ins and del (track changes) can share IDs when part of same revision
+        # PowerPoint elements
+        "sldid": ("id", "file"),  # Slide IDs in presentation.xml
+        "sldmasterid": ("id", "global"),  # Slide master IDs must be globally unique
+        "sldlayoutid": ("id", "global"),  # Slide layout IDs must be globally unique
+        "cm": ("authorid", "file"),  # Comment author IDs
+        # Excel elements
+        "sheet": ("sheetid", "file"),  # Sheet IDs in workbook.xml
+        "definedname": ("id", "file"),  # Named range IDs
+        # Drawing/Shape elements (all formats)
+        "cxnsp": ("id", "file"),  # Connection shape IDs
+        "sp": ("id", "file"),  # Shape IDs
+        "pic": ("id", "file"),  # Picture IDs
+        "grpsp": ("id", "file"),  # Group shape IDs
+    }
+
+    # Mapping of element names to expected relationship types
+    # Subclasses should override this with format-specific mappings
+    ELEMENT_RELATIONSHIP_TYPES = {}
+
+    # Per-element checks that share one walk of each part, by the name of
+    # their validate_<name> method
+    ELEMENT_VISITORS = {
+        "unique_ids": UniqueIdVisitor,
+        "all_relationship_ids": RelationshipIdVisitor,
+    }
+
+    # Unified schema mappings for all Office document types
+    SCHEMA_MAPPINGS = {
+        # Document type specific schemas
+        "word": "ISO-IEC29500-4_2016/wml.xsd",  # Word documents
+        "ppt": "ISO-IEC29500-4_2016/pml.xsd",  # PowerPoint presentations
+        "xl": "ISO-IEC29500-4_2016/sml.xsd",  # Excel spreadsheets
+        # Common file types
+        "[Content_Types].xml": "ecma/fouth-edition/opc-contentTypes.xsd",
+        "app.xml": "ISO-IEC29500-4_2016/shared-documentPropertiesExtended.xsd",
+        "core.xml": "ecma/fouth-edition/opc-coreProperties.xsd",
+        "custom.xml": "ISO-IEC29500-4_2016/shared-documentPropertiesCustom.xsd",
+        ".rels": "ecma/fouth-edition/opc-relationships.xsd",
+        # Word-specific files
+        "people.xml": "microsoft/wml-2012.xsd",
+        "commentsIds.xml": "microsoft/wml-cid-2016.xsd",
+        "commentsExtensible.xml": "microsoft/wml-cex-2018.xsd",
+        "commentsExtended.xml": "microsoft/wml-2012.xsd",
+        # Chart files (common across document types)
+        "chart": "ISO-IEC29500-4_2016/dml-chart.xsd",
+        # Theme files (common across document types)
+        "theme": "ISO-IEC29500-4_2016/dml-main.xsd",
+        # Drawing and media files
+        "drawing": "ISO-IEC29500-4_2016/dml-main.xsd",
+    }
+
+    # Unified namespace constants
+    MC_NAMESPACE = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+    XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+    # Common OOXML namespaces used across validators
+    PACKAGE_RELATIONSHIPS_NAMESPACE = (
+        "http://schemas.openxmlformats.org/package/2006/relationships"
+    )
+    OFFICE_RELATIONSHIPS_NAMESPACE = (
+        "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    )
+    CONTENT_TYPES_NAMESPACE = (
+        "http://schemas.openxmlformats.org/package/2006/content-types"
+    )
+
+    # Folders where we should clean ignorable namespaces
+    MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
+
+    # All allowed OOXML namespaces (superset of all document types)
+    OOXML_NAMESPACES = {
+        "http://schemas.openxmlformats.org/officeDocument/2006/math",
+        "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+        "http://schemas.openxmlformats.org/schemaLibrary/2006/main",
+        "http://schemas.openxmlformats.org/drawingml/2006/main",
+        "http://schemas.openxmlformats.org/drawingml/2006/chart",
+        "http://schemas.openxmlformats.org/drawingml/2006/chartDrawing",
+        "http://schemas.openxmlformats.org/drawingml/2006/diagram",
+        "http://schemas.openxmlformats.org/drawingml/2006/picture",
+        "http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing",
+        "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing",
+        "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+        "http://schemas.openxmlformats.org/presentationml/2006/main",
+        "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+        "http://schemas.openxmlformats.org/officeDocument/2006/sharedTypes",
+        "http://www.w3.org/XML/1998/namespace",
+    }
+
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        jobs=1,
+        incremental=False,
+        result_cache=None,
+        profile=None,
+    ):
+        """
+        Args:
+            unpacked_dir: Path to unpacked Office document directory, an Office
+                file to validate without unpacking it, or a shared package source
+            original_file: Path to original file, a shared OriginalDocument, or
+                None to run only the checks that need no original (structure,
+                relationships, content types)
+            verbose: Enable verbose output
+            jobs: Number of worker processes for XSD validation (0 = one per CPU)
+            incremental: Skip per-file checks for parts unchanged since the original;
+                requires original_file
+            result_cache: Optional XSDResultCache to reuse XSD results across runs
+            profile: Optional ValidationProfile recording per-check and per-part
+                timings, parse counts and bytes
+        """
+        # unpacked_dir may be a directory, an Office file or a shared package source
+        self.source = as_package_source(unpacked_dir)
+        self.unpacked_dir = self.source.root
+        # original_file may be a path or an OriginalDocument shared between validators
+        self.original = as_original_document(original_file)
+        self.original_file = self.original.path if self.original else None
+        if incremental and self.original is None:
+            raise ValueError("incremental validation needs an original_file")
+        self.verbose = verbose
+        self.jobs = jobs
+        self.incremental = incremental
+        self.result_cache = result_cache
+        self._changed_xml_files = None
+        self._element_visitors = None
+
+        # Every check reads parsed parts from this cache, so each file is parsed once
+        self.profile = profile
+        self.parts = PartCache(profile, self.source)
+        if profile is not None:
+            self._profile_checks()
+
+        # Set schemas directory
+        self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
+
+        # Files, relationships and content types, from one listing of the package
+        self.package = PackageIndex(self.source, self.parts)
+
+        # Get all XML and .rels files
+        self.xml_files = self.package.xml_files
+
+        if not self.xml_files:
+            print(f"Warning: No XML files found in {self.unpacked_dir}")
+
+        # Members unpack.py --lazy left inside the original archive. They are
+        # unchanged by definition, so only the package-level checks see them.
+        self.lazy_members = self.package.lazy_members
+
+    def validate(self):
+        """Run all validation checks and return True if all pass."""
+        raise NotImplementedError("Subclasses must implement the validate method")
+
+    def _profile_checks(self):
+        """Record every validate_* check of this instance in self.profile."""
+        for name in dir(type(self)):
+            if name.startswith("validate_"):
+                method = getattr(self, name)
+                check_name = f"{type(self).__name__}.{name}"
+                setattr(self, name, self.profile.wrap_check(check_name, method))
+
+    @property
+    def changed_xml_files(self):
+        """XML files that per-file checks must look at.
+
+        In incremental mode this excludes parts whose content is identical to
+        the same part in the original file; cross-part checks (relationships,
+        content types, global IDs) keep using all of self.xml_files.
+        """
+        if self._changed_xml_files is None:
+            if self.incremental:
+                self._changed_xml_files = [
+                    f for f in self.xml_files if not self._is_unchanged(f)
+                ]
+            else:
+                self._changed_xml_files = self.xml_files
+        return self._changed_xml_files
+
+    def element_check_errors(self, name):
+        """Return the errors found by the ELEMENT_VISITORS check called name.
+
+        The first call walks every part once with all of the validator's
+        element visitors; later calls return what that walk found. When
+        profiling, the walk is recorded as its own element_walk check and the
+        time spent in each visitor is credited to its validate_<name> check.
+        """
+        if self._element_visitors is None:
+            visitors = {
+                check: visitor_class(self)
+                for check, visitor_class in self.ELEMENT_VISITORS.items()
+            }
+            if self.profile is None:
+                self._walk_parts(visitors.values())
+            else:
+                self._profile_walk(visitors)
+            self._element_visitors = visitors
+        return self._element_visitors[name].errors
+
+    def _profile_walk(self, visitors):
+        """Walk the parts, recording the time of each visitor in self.profile."""
+        seconds = dict.fromkeys(visitors, 0.0)
+        for check, visitor in visitors.items():
+            for method in ("wants_part", "start_part", "visit", "part_failed"):
+                setattr(
+                    visitor,
+                    method,
+                    _timed(getattr(visitor, method), seconds, check),
+                )
+
+        prefix = type(self).__name__
+        with self.profile.separate_check(f"{prefix}.element_walk"):
+            self._walk_parts(visitors.values())
+            for check, visitor_seconds in seconds.items():
+                self.profile.credit_check(f"{prefix}.validate_{check}", visitor_seconds)
+
+    def _walk_parts(self, visitors):
+        """Walk every part once with the visitors that want it."""
+        changed = set(self.changed_xml_files)
+        dispatches = {}  # Tag dispatch per combination of visitors
+        for xml_file in self.xml_files:
+            active = tuple(
+                v
+                for v in visitors
+                if (xml_file in changed or not v.CHANGED_PARTS_ONLY)
+                and v.wants_part(xml_file)
+            )
+            if active:
+                self._walk_part(xml_file, active, dispatches.setdefault(active, {}))
+
+    def _walk_part(self, xml_file, visitors, dispatch):
+        """Run visitors over one part, reporting parse errors to each of them."""
+        relative_path = xml_file.relative_to(self.unpacked_dir)
+        for visitor in visitors:
+            visitor.xml_file = xml_file
+            visitor.relative_path = relative_path
+        try:
+            part = self.parts.get(xml_file)
+        except Exception as e:
+            for visitor in visitors:
+                visitor.part_failed(e)
+            return
+
+        started = []
+        for visitor in visitors:
+            try:
+                if visitor.start_part(part) is not False:
+                    started.append(visitor)
+            except Exception as e:
+                visitor.part_failed(e)
+        if len(started) < len(visitors):
+            dispatch = None  # Cached for the full set of visitors
+        if started:
+            walk_elements(part.root, started, dispatch)
+
+    def _is_unchanged(self, xml_file):
+        """Return True if xml_file has the same content as its original counterpart."""
+        relative_path = xml_file.relative_to(self.unpacked_dir)
+        info = self.original.info(relative_path)
+        if info is None:
+            return False  # New part
+
+        # First pass: byte-identical, using the CRC from the zip central directory
+        name = relative_path.as_posix()
+        if self.source.size(name) == info.file_size:
+            if zlib.crc32(self.source.read(name)) == info.CRC:
+                return True
+
+        # unpack.py pretty-prints parts, so compare the trees ignoring formatting
+        try:
+            current = self.parts.get(xml_file).root
+            original = lxml.etree.fromstring(self.original.read(relative_path))
+        except Exception:
+            return False
+        return self._same_xml_content(current, original)
+
+    def _same_xml_content(self, root_a, root_b):
+        """Compare two element trees, ignoring only the whitespace pretty-printing adds.
+
+        Every node is compared: elements with their attributes, comments and
+        processing instructions, each with its text and tail, and the nodes
+        around the root element. Whitespace-only text is ignored only where
+        unpack.py may have added it: inside elements that have child nodes
+        and are not under xml:space="preserve". Anywhere else whitespace is
+        content, and any other difference counts as a change.
+        """
+        if root_a.nsmap != root_b.nsmap:
+            return False
+        for siblings in ({"preceding": True}, {}):
+            outside_a = list(root_a.itersiblings(**siblings))
+            outside_b = list(root_b.itersiblings(**siblings))
+            if [_node_key(n) for n in outside_a] != [_node_key(n) for n in outside_b]:
+                return False
+
+        def same_text(text_a, text_b, formatting_allowed):
+            if formatting_allowed:
+                text_a = text_a if text_a and text_a.strip() else None
+                text_b = text_b if text_b and text_b.strip() else None
+            return (text_a or None) == (text_b or None)
+
+        xml_space = f"{{{self.XML_NAMESPACE}}}space"
+        preserve = [False]  # xml:space="preserve" in effect, per open element
+        events = ("start", "end", "comment", "pi")
+        pairs = itertools.zip_longest(
+            lxml.etree.iterwalk(root_a, events=events),
+            lxml.etree.iterwalk(root_b, events=events),
+        )
+        for pair_a, pair_b in pairs:
+            if pair_a is None or pair_b is None:
+                return False
+            (event, a), (event_b, b) = pair_a, pair_b
+            if event != event_b or _node_key(a) != _node_key(b):
+                return False
+
+            if event == "start":
+                space = a.get(xml_space)
+                preserve.append(
+                    space == "preserve" or (preserve[-1] and space != "default")
+                )
+                if not same_text(a.text, b.text, len(a) > 0 and not preserve[-1]):
+                    return False
+                continue
+
+            if event == "end":
+                preserve.pop()
+            # Tails belong to the parent, which has child nodes
+            if a is not root_a and not same_text(a.tail, b.tail, not preserve[-1]):
+                return False
+        return True
+
+    def validate_xml(self):
+        """Validate that all XML files are well-formed."""
+        errors = []
+
+        for xml_file in self.changed_xml_files:
+            try:
+                # Try to parse the XML file
+                self.parts.get(xml_file)
+            except lxml.etree.XMLSyntaxError as e:
+                errors.append(
+                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                    f"Line {e.lineno}: {e.msg}"
+                )
+            except Exception as e:
+                errors.append(
+                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                    f"Unexpected error: {str(e)}"
+                )
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} XML violations:")
+            for error in errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All XML files are well-formed")
+            return True
+
+    def validate_namespaces(self):
+        """Validate that namespace prefixes in Ignorable attributes are declared."""
+        errors = []
+
+        for xml_file in self.changed_xml_files:
+            try:
+                root = self.parts.get(xml_file).root
+                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+
+                for attr_val in [
+                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
+                ]:
+                    undeclared = set(attr_val.split()) - declared
+                    errors.extend(
+                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                        f"Namespace '{ns}' in Ignorable but not declared"
+                        for ns in undeclared
+                    )
+            except lxml.etree.XMLSyntaxError:
+                continue
+
+        if errors:
+            print(f"FAILED - {len(errors)} namespace issues:")
+            for error in errors:
+                print(error)
+            return False
+        if self.verbose:
+            print("PASSED - All namespace prefixes properly declared")
+        return True
+
+    def validate_unique_ids(self):
+        """Validate that specific IDs are unique according to OOXML requirements."""
+        errors = self.element_check_errors("unique_ids")
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
+            for error in errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All required IDs are unique")
+            return True
+
+    def validate_file_references(self):
+        """
+        Validate that all .rels files properly reference files and that all files are referenced.
+        """
+        errors = []
+
+        # Find all .rels files
+        rels_files = self.package.rels_files
+
+        if not rels_files:
+            if self.verbose:
+                print("PASSED - No .rels files found")
+            return True
+
+        # Get all files in the package (excluding reference files)
+        all_files = {
+            name
+            for name in self.package.files
+            if posixpath.basename(name) != "[Content_Types].xml"
+            and not name.endswith(".rels")
+        }  # These files are not referenced by .rels
+
+        # Track all files that are referenced by any .rels file
+        all_referenced_files = set()
+
+        if self.verbose:
+            print(
+                f"Found {len(rels_files)} .rels files and {len(all_files)} target files"
+            )
+
+        # Check each .rels file
+        for rels_file in rels_files:
+            try:
+                # Targets are resolved against the source part's directory;
+                # external URLs have no part
+                broken_refs = []
+                for rel in self.package.relationships(rels_file):
+                    if rel.part is None:
+                        continue
+                    if rel.part in self.package:
+                        all_referenced_files.add(rel.part)
+                    else:
+                        broken_refs.append((rel.target, rel.sourceline))
+
+                # Report broken references
+                for broken_ref, line_num in broken_refs:
+                    errors.append(
+                        f"  {rels_file}: Line {line_num}: Broken reference to {broken_ref}"
+                    )
+
+            except Exception as e:
+                errors.append(f"  Error parsing {rels_file}: {e}")
+
+        # Check for unreferenced files (files that exist but are not referenced anywhere)
+        unreferenced_files = all_files - all_referenced_files
+
+        for unref_file in sorted(unreferenced_files, key=lambda name: name.split("/")):
+            errors.append(f"  Unreferenced file: {unref_file}")
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} relationship validation errors:")
+            for error in errors:
+                print(error)
+            print(
+                "CRITICAL: These errors will cause the document to appear corrupt. "
+                + "Broken references MUST be fixed, "
+                + "and unreferenced files MUST be referenced or removed."
+            )
+            return False
+        else:
+            if self.verbose:
+                print(
+                    "PASSED - All references are valid and all files are properly referenced"
+                )
+            return True
+
+    def validate_all_relationship_ids(self):
+        """
+        Validate that all r:id attributes in XML files reference existing IDs
+        in their corresponding .rels files, and optionally validate relationship types.
+        """
+        errors = self.element_check_errors("all_relationship_ids")
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
+            for error in errors:
+                print(error)
+            print("\nThese ID mismatches will cause the document to appear corrupt!")
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All relationship ID references are valid")
+            return True
+
+    def _get_expected_relationship_type(self, element_name):
+        """
+        Get the expected relationship type for an element.
+        First checks the explicit mapping, then tries pattern detection.
+        """
+        # Normalize element name to lowercase
+        elem_lower = element_name.lower()
+
+        # Check explicit mapping first
+        if elem_lower in self.ELEMENT_RELATIONSHIP_TYPES:
+            return self.ELEMENT_RELATIONSHIP_TYPES[elem_lower]
+
+        # Try pattern detection for common patterns
+        # Pattern 1: Elements ending in "Id" often expect a relationship of the prefix type
+        if elem_lower.endswith("id") and len(elem_lower) > 2:
+            # e.g., "sldId" -> "sld", "sldMasterId" -> "sldMaster"
+            prefix = elem_lower[:-2]  # Remove "id"
+            # Check if this might be a compound like "sldMasterId"
+            if prefix.endswith("master"):
+                return prefix.lower()
+            elif prefix.endswith("layout"):
+                return prefix.lower()
+            else:
+                # Simple case like "sldId" -> "slide"
+                # Common transformations
+                if prefix == "sld":
+                    return "slide"
+                return prefix.lower()
+
+        # Pattern 2: Elements ending in "Reference" expect a relationship of the prefix type
+        if elem_lower.endswith("reference") and len(elem_lower) > 9:
+            prefix = elem_lower[:-9]  # Remove "reference"
+            return prefix.lower()
+
+        return None
+
+    def validate_content_types(self):
+        """Validate that all content files are properly declared in [Content_Types].xml."""
+        errors = []
+
+        # Find [Content_Types].xml file
+        if "[Content_Types].xml" not in self.package:
+            print("FAILED - [Content_Types].xml file not found")
+            return False
+
+        try:
+            # Declared parts (Override) and extensions (Default)
+            content_types = self.package.content_types
+            declared_parts = content_types.overrides.keys()
+            declared_extensions = content_types.defaults.keys()
+
+            # Root elements that require content type declaration
+            declarable_roots = {
+                "sld",
+                "sldLayout",
+                "sldMaster",
+                "presentation",  # PowerPoint
+                "document",  # Word
+                "workbook",
+                "worksheet",  # Excel
+                "theme",  # Common
+            }
+
+            # Common media file extensions that should be declared
+            media_extensions = {
+                "png": "image/png",
+                "jpg": "image/jpeg",
+                "jpeg": "image/jpeg",
+                "gif": "image/gif",
+                "bmp": "image/bmp",
+                "tiff": "image/tiff",
+                "wmf": "image/x-wmf",
+                "emf": "image/x-emf",
+            }
+
+            # Check all XML files for Override declarations
+            for xml_file in self.xml_files:
+                path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
+                    "\\", "/"
+                )
+
+                # Skip non-content files
+                if any(
+                    skip in path_str
+                    for skip in [".rels", "[Content_Types]", "docProps/", "_rels/"]
+                ):
+                    continue
+
+                try:
+                    root_tag = self.parts.get(xml_file).root.tag
+                    root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
+
+                    if root_name in declarable_roots and path_str not in declared_parts:
+                        errors.append(
+                            f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
+                        )
+
+                except Exception:
+                    continue  # Skip unparseable files
+
+            # Check all non-XML files for Default extension declarations
+            for name in self.package.files:
+                # Skip XML files and metadata files (already checked above)
+                extension = posixpath.splitext(name)[1].lstrip(".").lower()
+                if extension in {"xml", "rels"}:
+                    continue
+                if "_rels" in name.split("/") or "docProps" in name.split("/"):
+                    continue
+
+                if extension and extension not in declared_extensions:
+                    # Check if it's a known media extension that should be declared
+                    if extension in media_extensions:
+                        errors.append(
+                            f'  {name}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
+                        )
+
+        except Exception as e:
+            errors.append(f"  Error parsing [Content_Types].xml: {e}")
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} content type declaration errors:")
+            for error in errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print(
+                    "PASSED - All content files are properly declared in [Content_Types].xml"
+                )
+            return True
+
+    def validate_file_against_xsd(self, xml_file, verbose=False):
+        """Validate a single XML file against XSD schema, comparing with original.
+
+        Args:
+            xml_file: Path to XML file to validate
+            verbose: Enable verbose output
+
+        Returns:
+            tuple: (is_valid, new_errors_set) where is_valid is True/False/None (skipped)
+        """
+        # Resolve both paths to handle symlinks
+        xml_file = Path(xml_file).resolve()
+        unpacked_dir = self.unpacked_dir.resolve()
+
+        # Validate current file
+        is_valid, current_errors = self._validate_single_file_xsd(
+            xml_file, unpacked_dir
+        )
+
+        if is_valid is None:
+            return None, set()  # Skipped
+        elif is_valid:
+            return True, set()  # Valid, no errors
+
+        # Get errors from original file for this specific file
+        original_errors = self._get_original_file_errors(xml_file)
+
+        # Compare with original (both are guaranteed to be sets here)
+        assert current_errors is not None
+        new_errors = current_errors - original_errors
+
+        if new_errors:
+            if verbose:
+                relative_path = xml_file.relative_to(unpacked_dir)
+                print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
+                for error in sorted(new_errors)[:3]:
+                    truncated = error[:250] + "..." if len(error) > 250 else error
+                    print(f"  - {truncated}")
+            return False, new_errors
+        else:
+            # All errors existed in original
+            if verbose:
+                print(
+                    f"PASSED - No new errors (original had {len(current_errors)} errors)"
+                )
+            return True, set()
+
+    def validate_against_xsd(self):
+        """Validate XML files against XSD schemas, showing only new errors compared to original."""
+        new_errors = []
+        original_error_count = 0
+        valid_count = 0
+        skipped_count = 0
+
+        xml_files = self.changed_xml_files
+        results = self._validate_files_against_xsd(xml_files)
+        for xml_file, (is_valid, new_file_errors) in zip(xml_files, results):
+            relative_path = str(xml_file.relative_to(self.unpacked_dir))
+
+            if is_valid is None:
+                skipped_count += 1
+                continue
+            elif is_valid and not new_file_errors:
+                valid_count += 1
+                continue
+            elif is_valid:
+                # Had errors but all existed in original
+                original_error_count += 1
+                valid_count += 1
+                continue
+
+            # Has new errors
+            new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
+                new_errors.append(
+                    f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
+                )
+
+        # Print summary
+        if self.verbose:
+            print(f"Validated {len(xml_files)} files:")
+            if len(xml_files) != len(self.xml_files):
+                print(
+                    f"  - Unchanged since original (not re-checked): "
+                    f"{len(self.xml_files) - len(xml_files)}"
+                )
+            print(f"  - Valid: {valid_count}")
+            print(f"  - Skipped (no schema): {skipped_count}")
+            if original_error_count:
+                print(f"  - With original errors (ignored): {original_error_count}")
+            print(
+                f"  - With NEW errors: {len(new_errors) > 0 and len([e for e in new_errors if not e.startswith('    ')]) or 0}"
+            )
+
+        if self.result_cache is not None:
+            self.result_cache.prune_if_due()
+
+        if new_errors:
+            print("\nFAILED - Found NEW validation errors:")
+            for error in new_errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print("\nPASSED - No new XSD validation errors introduced")
+            return True
+
+    def _validate_files_against_xsd(self, xml_files):
+        """Run validate_file_against_xsd on each file, in a process pool if jobs > 1.
+
+        Results are returned in the order of xml_files regardless of which
+        worker finishes first, so the report is identical to a sequential run.
+        """
+        jobs = self.jobs or os.cpu_count() or 1
+        to_check = [f for f in xml_files if self._get_schema_path(f)]
+        if jobs <= 1 or len(to_check) <= 1:
+            results = []
+            for xml_file in xml_files:
+                result, seconds, schema_loads = _timed_xsd_validation(self, xml_file)
+                results.append(result)
+                if self.profile is not None and xml_file in to_check:
+                    self.profile.record_xsd(xml_file, seconds)
+                    for schema_path, load_seconds in schema_loads.items():
+                        self.profile.record_schema_load(schema_path, load_seconds)
+            return results
+
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(to_check)),
+            initializer=_init_xsd_worker,
+            initargs=(
+                type(self),
+                self.unpacked_dir,
+                self.original_file,
+                self.result_cache,
+            ),
+        ) as executor:
+            checked = {}
+            for xml_file, (result, seconds, schema_loads) in zip(
+                to_check, executor.map(_validate_file_in_worker, to_check)
+            ):
+                checked[xml_file] = result
+                if self.profile is not None:
+                    self.profile.record_xsd(xml_file, seconds)
+                    # Each worker compiles its own schemas, while the
+                    # running check waits for all of them
+                    for schema_path, load_seconds in schema_loads.items():
+                        self.profile.record_schema_load(
+                            schema_path, load_seconds, in_worker=True
+                        )
+        return [checked.get(f, (None, set())) for f in xml_files]
+
+    def _get_schema_path(self, xml_file):
+        """Determine the appropriate schema path for an XML file."""
+        # Check exact filename match
+        if xml_file.name in self.SCHEMA_MAPPINGS:
+            return self.schemas_dir / self.SCHEMA_MAPPINGS[xml_file.name]
+
+        # Check .rels files
+        if xml_file.suffix == ".rels":
+            return self.schemas_dir / self.SCHEMA_MAPPINGS[".rels"]
+
+        # Check chart files
+        if "charts/" in str(xml_file) and xml_file.name.startswith("chart"):
+            return self.schemas_dir / self.SCHEMA_MAPPINGS["chart"]
+
+        # Check theme files
+        if "theme/" in str(xml_file) and xml_file.name.startswith("theme"):
+            return self.schemas_dir / self.SCHEMA_MAPPINGS["theme"]
+
+        # Check if file is in a main content folder and use appropriate schema
+        if xml_file.parent.name in self.MAIN_CONTENT_FOLDERS:
+            return self.schemas_dir / self.SCHEMA_MAPPINGS[xml_file.parent.name]
+
+        return None
+
+    def _clean_ignorable_namespaces(self, xml_doc):
+        """Remove attributes and elements not in allowed namespaces, in place."""
+        # Every namespace used in the document is declared in it, so the
+        # declarations tell which namespaces to strip without visiting nodes
+        foreign = {
+            f"{{{uri}}}*"
+            for _, (_, uri) in lxml.etree.iterwalk(xml_doc, events=("start-ns",))
+            if uri and uri not in self.OOXML_NAMESPACES
+        }
+        if foreign:
+            lxml.etree.strip_attributes(xml_doc, *foreign)
+            # Removes elements with their content and tail, never the root
+            lxml.etree.strip_elements(xml_doc, *foreign)
+
+        return xml_doc
+
+    def _preprocess_for_mc_ignorable(self, xml_doc):
+        """Preprocess XML to handle mc:Ignorable attribute properly."""
+        # Remove mc:Ignorable attributes before validation
+        root = xml_doc.getroot()
+
+        # Remove mc:Ignorable attribute from root
+        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
+            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
+
+        return xml_doc
+
+    def _validate_single_file_xsd(self, xml_file, base_path, content=None):
+        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set).
+
+        If content (bytes) is given it is validated in place of the file on disk;
+        xml_file is then only used to pick the schema.
+        """
+        schema_path = self._get_schema_path(xml_file)
+        if not schema_path:
+            return None, None  # Skip file
+
+        try:
+            # Load schema (compiled once per process)
+            schema = load_schema(schema_path)
+
+            # Load XML; preprocessing works in place, so the parse shared
+            # with the other checks is copied once
+            if content is None:
+                xml_doc = copy.deepcopy(self.parts.get(xml_file).tree)
+            else:
+                xml_doc = lxml.etree.parse(io.BytesIO(content))
+
+            self._remove_template_tags_from_text_nodes(xml_doc)
+            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+
+            # Clean ignorable namespaces if needed
+            relative_path = xml_file.relative_to(base_path)
+            if (
+                relative_path.parts
+                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+            ):
+                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+
+            # Reuse the result for identical preprocessed content if caching
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = self.result_cache.key(
+                    schema_path, lxml.etree.tostring(xml_doc)
+                )
+                cached_errors = self.result_cache.get(cache_key)
+                if cached_errors is not None:
+                    return not cached_errors, cached_errors
+
+            # Validate
+            errors = set()
+            if not schema.validate(xml_doc):
+                for error in schema.error_log:
+                    # Store normalized error message (without line numbers for comparison)
+                    errors.add(error.message)
+
+            if cache_key is not None:
+                self.result_cache.put(cache_key, errors)
+            return not errors, errors
+
+        except Exception as e:
+            return False, {str(e)}
+
+    def _get_original_file_errors(self, xml_file):
+        """Get XSD validation errors from a single file in the original document.
+
+        The part is read straight from the original archive; nothing is extracted.
+        Results are kept in a process-wide LRU keyed by the original file's
+        digest, so each part of an original is validated once per process.
+
+        Args:
+            xml_file: Path to the XML file in unpacked_dir to check
+
+        Returns:
+            frozenset: Error messages from the original file
+        """
+        # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
+        xml_file = Path(xml_file).resolve()
+        unpacked_dir = self.unpacked_dir.resolve()
+        relative_path = xml_file.relative_to(unpacked_dir)
+
+        key = (type(self), self.original.digest, relative_path.as_posix())
+        errors = _ORIGINAL_ERRORS_CACHE.get(key)
+        if errors is not None:
+            _ORIGINAL_ERRORS_CACHE.move_to_end(key)
+            return errors
+
+        # Find corresponding file in original
+        content = self.original.read(relative_path)
+        if content is None:
+            # File didn't exist in original, so no original errors
+            errors = frozenset()
+        else:
+            # Validate the specific file in original
+            is_valid, errors = self._validate_single_file_xsd(
+                xml_file, unpacked_dir, content=content
+            )
+            errors = frozenset(errors or ())
+
+        _ORIGINAL_ERRORS_CACHE[key] = errors
+        if len(_ORIGINAL_ERRORS_CACHE) > _ORIGINAL_ERRORS_CACHE_SIZE:
+            _ORIGINAL_ERRORS_CACHE.popitem(last=False)
+        return errors
+
+    def _remove_template_tags_from_text_nodes(self, xml_doc):
+        """Remove template tags from XML text nodes in place and collect warnings.
+
+        Template tags follow the pattern {{ ... }} and are used as placeholders
+        for content replacement. They should be removed from text content before
+        XSD validation while preserving XML structure. Text and tails of w:t
+        elements are left alone.
+
+        Returns:
+            list: Warnings for the template tags found
+        """
+        warnings = []
+
+        # Only text nodes containing "{{" can hold a template tag
+        for text in _TEMPLATE_TEXT_XPATH(xml_doc):
+            owner = text.getparent()
+            # Skip comments, processing instructions and w:t elements
+            if callable(owner.tag):
+                continue
+            if owner.tag.endswith("}t") or owner.tag == "t":
+                continue
+            matches = list(_TEMPLATE_TAG_PATTERN.finditer(text))
+            if not matches:
+                continue
+
+            content_type = "text content" if text.is_text else "tail content"
+            for match in matches:
+                warnings.append(f"Found template tag in {content_type}: {match.group()}")
+            cleaned = _TEMPLATE_TAG_PATTERN.sub("", text)
+            if text.is_text:
+                owner.text = cleaned
+            else:
+                owner.tail = cleaned
+
+        return warnings
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,183 @@
+"""
+Persistent on-disk cache of XSD validation results.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import lxml.etree
+
+XSD_NAMESPACE = "http://www.w3.org/2001/XMLSchema"
+
+
+class XSDResultCache:
+    """On-disk cache mapping (schema, preprocessed part content) to XSD errors.
+
+    Unchanged template parts (layouts, masters, themes) produce the same
+    preprocessed XML on every run, so their XSD errors can be looked up instead
+    of re-validated. Each entry is a small JSON file named by its key; reading
+    an entry refreshes its mtime, and prune() removes the least recently used
+    entries once the cache grows past max_entries or max_bytes.
+
+    prune() lists the whole cache, so validators call prune_if_due() instead,
+    which prunes at most once per prune_interval seconds across all processes
+    sharing the cache. Between prunes the cache can exceed its limits by what
+    is written in that time.
+    """
+
+    # Bump to invalidate all existing entries when the preprocessing changes
+    VERSION = 1
+
+    # Touched by every prune; its mtime is when the cache was last pruned
+    PRUNE_MARKER = "last-prune"
+
+    def __init__(
+        self,
+        cache_dir=None,
+        max_entries=20000,
+        max_bytes=64 * 1024**2,
+        prune_interval=600,
+    ):
+        if cache_dir is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+            cache_dir = Path(cache_home) / "ooxml-validation"
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.prune_interval = prune_interval
+        self._schema_ids = {}
+
+    def key(self, schema_path, content):
+        """Return the cache key for validating content (bytes) against schema_path."""
+        digest = hashlib.sha256()
+        digest.update(f"v{self.VERSION}:".encode())
+        digest.update(self._schema_id(schema_path).encode())
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _schema_id(self, schema_path):
+        """Identify a schema by name and the content of every file it pulls in.
+
+        The hash covers the schema and, recursively, each schema it imports,
+        includes or redefines, so editing any of them never hits stale entries.
+        """
+        schema_path = Path(schema_path)
+        if schema_path not in self._schema_ids:
+            schema_hash = hashlib.sha256()
+            for path in _schema_closure(schema_path):
+                schema_hash.update(path.name.encode())
+                schema_hash.update(b"\0")
+                schema_hash.update(path.read_bytes())
+            self._schema_ids[schema_path] = (
+                f"{schema_path.name}:{schema_hash.hexdigest()}"
+            )
+        return self._schema_ids[schema_path]
+
+    def _entry_path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached error set for key, or None on a miss."""
+        entry = self._entry_path(key)
+        try:
+            errors = json.loads(entry.read_text(encoding="utf-8"))
+            os.utime(entry)  # Mark as recently used
+        except (OSError, ValueError):
+            return None
+        return set(errors)
+
+    def put(self, key, errors):
+        """Store the error set for key. Failures to write are ignored."""
+        entry = self._entry_path(key)
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            # Write atomically so concurrent validators never read partial entries
+            fd, temp_name = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(sorted(errors), f)
+            os.replace(temp_name, entry)
+        except OSError:
+            pass
+
+    def prune_if_due(self):
+        """Run prune() unless the cache was pruned within the last prune_interval seconds.
+
+        Returns:
+            bool: True if the cache was pruned
+        """
+        marker = self.cache_dir / self.PRUNE_MARKER
+        try:
+            last_pruned = marker.stat().st_mtime
+        except OSError:
+            last_pruned = None
+        if last_pruned is not None and time.time() - last_pruned < self.prune_interval:
+            return False
+        self.prune()
+        return True
+
+    def prune(self):
+        """Evict least recently used entries until the cache is within its limits."""
+        marker = self.cache_dir / self.PRUNE_MARKER
+        try:
+            # Touched first, so validators finishing meanwhile skip their prune
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        except OSError:
+            pass
+
+        entries = []
+        total_bytes = 0
+        for entry in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total_bytes += stat.st_size
+
+        entries.sort()
+        excess = len(entries) - self.max_entries
+        for _, size, entry in entries:
+            if excess <= 0 and total_bytes <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            excess -= 1
+            total_bytes -= size
+
+
+def _schema_closure(schema_path):
+    """Return schema_path and every schema file it references, in a stable order.
+
+    References are the schemaLocation of xsd:import, xsd:include and
+    xsd:redefine, followed recursively; ones that do not exist on disk are
+    skipped, as the schema would fail to load with them anyway.
+    """
+    pending = [Path(schema_path).resolve()]
+    seen = []
+    while pending:
+        path = pending.pop(0)
+        if path in seen or not path.is_file():
+            continue
+        seen.append(path)
+        try:
+            root = lxml.etree.parse(str(path)).getroot()
+        except lxml.etree.XMLSyntaxError:
+            continue  # Hashed as is; loading it reports the error
+        for tag in ("import", "include", "redefine"):
+            for element in root.iterfind(f"{{{XSD_NAMESPACE}}}{tag}"):
+                location = element.get("schemaLocation")
+                if location:
+                    pending.append((path.parent / location).resolve())
+    return seen
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
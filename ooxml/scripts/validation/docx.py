@@ -0,0 +1,247 @@
+"""
+Validator for Word document XML files against XSD schemas.
+"""
+
+import io
+import re
+
+import lxml.etree
+
+from .base import BaseSchemaValidator, ElementVisitor
+
+WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+
+def _text_preview(text):
+    """repr() of text, cut to 50 characters."""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+class DocumentBodyVisitor(ElementVisitor):
+    """Base for visitors that only check document.xml parts."""
+
+    def wants_part(self, xml_file):
+        return xml_file.name == "document.xml"
+
+
+class WhitespaceVisitor(DocumentBodyVisitor):
+    """w:t elements starting or ending with whitespace need xml:space='preserve'."""
+
+    TAGS = {(WORD_2006_NAMESPACE, "t")}
+    LEADING_WHITESPACE = re.compile(r"^\s.*")
+    TRAILING_WHITESPACE = re.compile(r".*\s$")
+
+    def visit(self, elem, qname, ancestors):
+        text = elem.text
+        if not text:
+            return
+        if self.LEADING_WHITESPACE.match(text) or self.TRAILING_WHITESPACE.match(text):
+            if elem.get(XML_SPACE) != "preserve":
+                self.errors.append(
+                    f"  {self.relative_path}: "
+                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {_text_preview(text)}"
+                )
+
+
+class DeletionVisitor(DocumentBodyVisitor):
+    """Deleted text must be w:delText, so w:t with text may not be inside w:del."""
+
+    TAGS = {(WORD_2006_NAMESPACE, "t")}
+    DEL = (WORD_2006_NAMESPACE, "del")
+
+    def visit(self, elem, qname, ancestors):
+        if elem.text and self.DEL in ancestors:
+            self.errors.append(
+                f"  {self.relative_path}: "
+                f"Line {elem.sourceline}: <w:t> found within <w:del>: {_text_preview(elem.text)}"
+            )
+
+
+class InsertionVisitor(DocumentBodyVisitor):
+    """w:delText may only be inside w:ins if it is also nested within a w:del."""
+
+    TAGS = {(WORD_2006_NAMESPACE, "delText")}
+    INS = (WORD_2006_NAMESPACE, "ins")
+    DEL = (WORD_2006_NAMESPACE, "del")
+
+    def visit(self, elem, qname, ancestors):
+        if self.INS in ancestors and self.DEL not in ancestors:
+            self.errors.append(
+                f"  {self.relative_path}: "
+                f"Line {elem.sourceline}: <w:delText> within <w:ins>: {_text_preview(elem.text or '')}"
+            )
+
+
+class DOCXSchemaValidator(BaseSchemaValidator):
+    """Validator for Word document XML files against XSD schemas."""
+
+    # Word-specific namespace
+    WORD_2006_NAMESPACE = WORD_2006_NAMESPACE
+
+    # Word-specific element to relationship type mappings
+    # Start with empty mapping - add specific cases as we discover them
+    ELEMENT_RELATIONSHIP_TYPES = {}
+
+    ELEMENT_VISITORS = {
+        **BaseSchemaValidator.ELEMENT_VISITORS,
+        "whitespace_preservation": WhitespaceVisitor,
+        "deletions": DeletionVisitor,
+        "insertions": InsertionVisitor,
+    }
+
+    def validate(self):
+        """Run all validation checks and return True if all pass."""
+        # Test 0: XML well-formedness
+        if not self.validate_xml():
+            return False
+
+        # Test 1: Namespace declarations
+        all_valid = True
+        if not self.validate_namespaces():
+            all_valid = False
+
+        # Test 2: Unique IDs
+        if not self.validate_unique_ids():
+            all_valid = False
+
+        # Test 3: Relationship and file reference validation
+        if not self.validate_file_references():
+            all_valid = False
+
+        # Test 4: Content type declarations
+        if not self.validate_content_types():
+            all_valid = False
+
+        # Test 5: XSD schema validation
+        if not self.validate_against_xsd():
+            all_valid = False
+
+        # Test 6: Whitespace preservation
+        if not self.validate_whitespace_preservation():
+            all_valid = False
+
+        # Test 7: Deletion validation
+        if not self.validate_deletions():
+            all_valid = False
+
+        # Test 8: Insertion validation
+        if not self.validate_insertions():
+            all_valid = False
+
+        # Test 9: Relationship ID reference validation
+        if not self.validate_all_relationship_ids():
+            all_valid = False
+
+        # Count and compare paragraphs
+        self.compare_paragraph_counts()
+
+        return all_valid
+
+    def validate_whitespace_preservation(self):
+        """
+        Validate that w:t elements with whitespace have xml:space='preserve'.
+        """
+        errors = self.element_check_errors("whitespace_preservation")
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
+            for error in errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All whitespace is properly preserved")
+            return True
+
+    def validate_deletions(self):
+        """
+        Validate that w:t elements are not within w:del elements.
+        For some reason, XSD validation does not catch this, so we do it manually.
+        """
+        errors = self.element_check_errors("deletions")
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} deletion validation violations:")
+            for error in errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - No w:t elements found within w:del elements")
+            return True
+
+    def count_paragraphs_in_unpacked(self):
+        """Count the number of paragraphs in the unpacked document."""
+        if "word/document.xml" in self.lazy_members:
+            # Still inside the original archive, so unchanged
+            return self.count_paragraphs_in_original()
+
+        count = 0
+
+        for xml_file in self.xml_files:
+            # Only check document.xml files
+            if xml_file.name != "document.xml":
+                continue
+
+            try:
+                root = self.parts.get(xml_file).root
+                # Count all w:p elements
+                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+                count = len(paragraphs)
+            except Exception as e:
+                print(f"Error counting paragraphs in unpacked document: {e}")
+
+        return count
+
+    def count_paragraphs_in_original(self):
+        """Count the number of paragraphs in the original docx file."""
+        count = 0
+
+        try:
+            # Read document.xml straight from the original archive
+            content = self.original.read("word/document.xml")
+            if content is None:
+                raise FileNotFoundError(
+                    f"word/document.xml not found in {self.original_file}"
+                )
+            root = lxml.etree.parse(io.BytesIO(content)).getroot()
+
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
+
+        except Exception as e:
+            print(f"Error counting paragraphs in original document: {e}")
+
+        return count
+
+    def validate_insertions(self):
+        """
+        Validate that w:delText elements are not within w:ins elements.
+        w:delText is only allowed in w:ins if nested within a w:del.
+        """
+        errors = self.element_check_errors("insertions")
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} insertion validation violations:")
+            for error in errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - No w:delText elements within w:ins elements")
+            return True
+
+    def compare_paragraph_counts(self):
+        """Compare paragraph counts between original and new document."""
+        original_count = self.count_paragraphs_in_original()
+        new_count = self.count_paragraphs_in_unpacked()
+
+        diff = new_count - original_count
+        diff_str = f"+{diff}" if diff > 0 else str(diff)
+        print(f"\nParagraphs: {original_count} → {new_count} ({diff_str})")
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
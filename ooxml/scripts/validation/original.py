@@ -0,0 +1,141 @@
+"""
+Read-only snapshot of the original Office file used as a validation baseline.
+"""
+
+import hashlib
+import json
+import zipfile
+from pathlib import Path, PurePath
+
+# Written by unpack.py --lazy into the unpacked directory. Lists the members that
+# were left compressed inside the source archive and are copied from it on pack.
+LAZY_MANIFEST = ".ooxml-lazy.json"
+
+
+class OriginalDocument:
+    """Read-only snapshot of the original Office file used as a validation baseline.
+
+    Members are read straight from the zip archive on first use and memoized,
+    so comparing parts against the original never extracts the whole package.
+    A single instance can be shared by every validator in a validation session.
+    """
+
+    def __init__(self, original_file):
+        self.path = Path(original_file)
+        self._zip = None
+        self._members = {}
+        self._digest = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying zip archive."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    @property
+    def archive(self):
+        """The open zip archive, opened on first access."""
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.path, "r")
+        return self._zip
+
+    @property
+    def digest(self):
+        """SHA-256 hex digest of the original file, computed on first access."""
+        if self._digest is None:
+            digest = hashlib.sha256()
+            with open(self.path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    @staticmethod
+    def member_name(relative_path):
+        """Convert a path relative to the package root into a zip member name."""
+        if isinstance(relative_path, PurePath):
+            return relative_path.as_posix()
+        return str(relative_path).replace("\\", "/")
+
+    def exists(self, relative_path):
+        """Return True if the original package contains relative_path."""
+        name = self.member_name(relative_path)
+        if name in self._members:
+            return True
+        try:
+            self.archive.getinfo(name)
+        except KeyError:
+            return False
+        return True
+
+    def info(self, relative_path):
+        """Return the ZipInfo (size, CRC) of a member, or None if it is not in the package."""
+        try:
+            return self.archive.getinfo(self.member_name(relative_path))
+        except KeyError:
+            return None
+
+    def read(self, relative_path):
+        """Return the raw bytes of a member, or None if it is not in the package."""
+        name = self.member_name(relative_path)
+        if name not in self._members:
+            try:
+                self._members[name] = self.archive.read(name)
+            except KeyError:
+                return None
+        return self._members[name]
+
+
+def as_original_document(original_file):
+    """Return original_file as an OriginalDocument, wrapping plain paths (None stays None)."""
+    if original_file is None or isinstance(original_file, OriginalDocument):
+        return original_file
+    return OriginalDocument(original_file)
+
+
+def write_lazy_manifest(unpacked_dir, source_file, members):
+    """Record that members of source_file were not unpacked into unpacked_dir."""
+    manifest = {"source": str(Path(source_file).resolve()), "members": sorted(members)}
+    (Path(unpacked_dir) / LAZY_MANIFEST).write_text(
+        json.dumps(manifest, indent=2), encoding="utf-8"
+    )
+
+
+def read_lazy_manifest(unpacked_dir, on_disk=None):
+    """Return (source archive, member names) for lazy members not yet on disk.
+
+    Members that have since been written to unpacked_dir are left out; pass
+    the set of package names already on disk as on_disk to skip the stat
+    calls. Returns (None, set()) if unpacked_dir was not unpacked with --lazy.
+    """
+    unpacked_dir = Path(unpacked_dir)
+    try:
+        manifest = json.loads(
+            (unpacked_dir / LAZY_MANIFEST).read_text(encoding="utf-8")
+        )
+    except (OSError, ValueError):
+        return None, set()
+    if on_disk is None:
+        members = {
+            name
+            for name in manifest.get("members", [])
+            if not (unpacked_dir / name).is_file()
+        }
+    else:
+        members = set(manifest.get("members", [])) - on_disk
+    return Path(manifest["source"]), members
+
+
+def read_lazy_members(unpacked_dir):
+    """Return the names of lazy members that have not been materialized on disk."""
+    return read_lazy_manifest(unpacked_dir)[1]
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,273 @@
+"""
+Package sources and an index of the files, relationships and content types of a package.
+"""
+
+import fnmatch
+import io
+import os
+import posixpath
+import zipfile
+from collections import namedtuple
+from pathlib import Path
+
+import lxml.etree
+
+from .original import LAZY_MANIFEST, read_lazy_manifest
+
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+CONTENT_TYPES_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+# One <Relationship> of a .rels part. part is the package name of the target,
+# or None for external (http, mailto:) and empty targets.
+Relationship = namedtuple("Relationship", ["id", "type", "target", "part", "sourceline"])
+
+# Default content types by lower-case extension, overrides by package name
+ContentTypes = namedtuple("ContentTypes", ["defaults", "overrides"])
+
+
+class DirectorySource:
+    """Package members stored as files in an unpacked directory."""
+
+    def __init__(self, unpacked_dir):
+        self.root = Path(unpacked_dir).resolve()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Nothing to release; present for symmetry with ZipSource."""
+
+    def names(self):
+        """Package names of all files, in directory walk order."""
+        names = []
+        for dirpath, _, filenames in os.walk(self.root):
+            prefix = Path(dirpath).relative_to(self.root).as_posix()
+            prefix = "" if prefix == "." else f"{prefix}/"
+            names.extend(prefix + name for name in filenames if name != LAZY_MANIFEST)
+        return names
+
+    def lazy_members(self, names):
+        """Members unpack.py --lazy left inside the original archive.
+
+        names is the set of package names present in the directory.
+        """
+        return read_lazy_manifest(self.root, names)[1]
+
+    def read(self, name):
+        """Return the bytes of a member."""
+        return (self.root / name).read_bytes()
+
+    def size(self, name):
+        """Return the uncompressed size of a member."""
+        return (self.root / name).stat().st_size
+
+    def parse(self, name):
+        """Parse a member as XML and return the element tree."""
+        return lxml.etree.parse(str(self.root / name))
+
+
+class ZipSource:
+    """Package members read straight from a .docx/.pptx/.xlsx archive.
+
+    Nothing is extracted: each member is decompressed in memory when it is
+    read. Paths of members are the archive path joined with their package
+    name, e.g. report.docx/word/document.xml, so messages look the same as
+    for an unpacked directory.
+    """
+
+    def __init__(self, archive):
+        self.root = Path(archive).resolve()
+        self._zip = zipfile.ZipFile(self.root, "r")
+        self._infos = {
+            info.filename: info for info in self._zip.infolist() if not info.is_dir()
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying zip archive."""
+        self._zip.close()
+
+    def names(self):
+        """Package names of all members, in archive order."""
+        return list(self._infos)
+
+    def lazy_members(self, names):
+        """Archives are complete, so there are never lazy members."""
+        return set()
+
+    def read(self, name):
+        """Return the bytes of a member."""
+        try:
+            return self._zip.read(self._infos[name])
+        except KeyError:
+            raise FileNotFoundError(f"{name} not found in {self.root}")
+
+    def size(self, name):
+        """Return the uncompressed size of a member."""
+        try:
+            return self._infos[name].file_size
+        except KeyError:
+            raise FileNotFoundError(f"{name} not found in {self.root}")
+
+    def parse(self, name):
+        """Parse a member as XML and return the element tree."""
+        return lxml.etree.parse(
+            io.BytesIO(self.read(name)), base_url=str(self.root / name)
+        )
+
+
+def as_package_source(package):
+    """Return package as a package source.
+
+    Directories become a DirectorySource and Office files a ZipSource; sources
+    are returned as they are, so one can be shared by several validators.
+    """
+    if isinstance(package, (DirectorySource, ZipSource)):
+        return package
+    if Path(package).is_dir():
+        return DirectorySource(package)
+    return ZipSource(package)
+
+
+class PackageIndex:
+    """Files, relationship graph and content types of a package.
+
+    The package is listed once, so cross-part checks answer "does this part
+    exist" with a set lookup instead of a stat call. .rels parts and
+    [Content_Types].xml are parsed on first use through the shared PartCache.
+    Parts are named by their package name: the POSIX path relative to the
+    package root, without a leading slash.
+    """
+
+    CONTENT_TYPES_PART = "[Content_Types].xml"
+
+    def __init__(self, source, parts):
+        """
+        Args:
+            source: Unpacked directory, Office file, or a package source
+            parts: PartCache used to parse .rels and [Content_Types].xml
+        """
+        self.source = as_package_source(source)
+        self.unpacked_dir = self.source.root
+        self.parts = parts
+
+        # Files in the directory or archive, in listing order
+        self.present_files = self.source.names()
+
+        # Members unpack.py --lazy left inside the original archive
+        present = set(self.present_files)
+        self.lazy_members = self.source.lazy_members(present)
+        self.files = self.present_files + sorted(self.lazy_members)
+        self._file_set = present | self.lazy_members
+
+        self._relationships = {}
+        self._content_types = None
+
+    def __contains__(self, name):
+        return name in self._file_set
+
+    def path(self, name):
+        """Path of the part with the given package name."""
+        return self.unpacked_dir / name
+
+    def name(self, path):
+        """Package name of a path inside the package."""
+        return Path(path).relative_to(self.unpacked_dir).as_posix()
+
+    @property
+    def xml_files(self):
+        """Paths of all present .xml parts, followed by all .rels parts."""
+        return [self.path(n) for n in self.present_files if n.endswith(".xml")] + [
+            self.path(n) for n in self.present_files if n.endswith(".rels")
+        ]
+
+    @property
+    def rels_files(self):
+        """Package names of all present .rels parts."""
+        return [name for name in self.present_files if name.endswith(".rels")]
+
+    def glob(self, pattern):
+        """Paths of present files matching pattern in one directory, e.g. 'ppt/slides/*.xml'."""
+        directory, name_pattern = posixpath.split(pattern)
+        return [
+            self.path(name)
+            for name in self.present_files
+            if posixpath.dirname(name) == directory
+            and fnmatch.fnmatchcase(posixpath.basename(name), name_pattern)
+        ]
+
+    @staticmethod
+    def relationships_part_for(name):
+        """Package name of the .rels part holding the relationships of a part."""
+        directory, base = posixpath.split(name)
+        return posixpath.join(directory, "_rels", f"{base}.rels")
+
+    def relationships(self, rels_name):
+        """Relationships of a .rels part, in document order.
+
+        Targets are resolved against the directory of the source part: the
+        package root for _rels/.rels, word/ for word/_rels/document.xml.rels.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the .rels part is not well-formed.
+        """
+        if rels_name not in self._relationships:
+            root = self.parts.get(self.path(rels_name)).root
+            base_dir = posixpath.dirname(posixpath.dirname(rels_name))
+            self._relationships[rels_name] = [
+                Relationship(
+                    rel.get("Id"),
+                    rel.get("Type", ""),
+                    rel.get("Target"),
+                    self._resolve_target(base_dir, rel.get("Target")),
+                    rel.sourceline,
+                )
+                for rel in root.iter(f"{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship")
+            ]
+        return self._relationships[rels_name]
+
+    @staticmethod
+    def _resolve_target(base_dir, target):
+        if not target or target.startswith(("http", "mailto:")):
+            return None
+        if target.startswith("/"):
+            return posixpath.normpath(target.lstrip("/"))
+        return posixpath.normpath(posixpath.join(base_dir, target))
+
+    @property
+    def content_types(self):
+        """ContentTypes declared in [Content_Types].xml, or None if it is missing.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If [Content_Types].xml is not well-formed.
+        """
+        if self._content_types is None:
+            if self.CONTENT_TYPES_PART not in self:
+                return None
+            root = self.parts.get(self.path(self.CONTENT_TYPES_PART)).root
+            defaults = {}
+            for default in root.iter(f"{{{CONTENT_TYPES_NAMESPACE}}}Default"):
+                extension = default.get("Extension")
+                if extension is not None:
+                    defaults[extension.lower()] = default.get("ContentType")
+            overrides = {}
+            for override in root.iter(f"{{{CONTENT_TYPES_NAMESPACE}}}Override"):
+                part_name = override.get("PartName")
+                if part_name is not None:
+                    overrides[part_name.lstrip("/")] = override.get("ContentType")
+            self._content_types = ContentTypes(defaults, overrides)
+        return self._content_types
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
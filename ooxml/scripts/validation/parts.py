@@ -0,0 +1,93 @@
+"""
+Cache of parsed XML parts shared by all validation checks.
+"""
+
+import time
+from pathlib import Path
+
+import lxml.etree
+
+from .package import DirectorySource
+
+
+class ParsedPart:
+    """A parsed XML part.
+
+    The tree is shared by every check and must be treated as read-only.
+    """
+
+    def __init__(self, path, tree):
+        self.path = path
+        self.tree = tree
+
+    @property
+    def root(self):
+        """The root element of the part."""
+        return self.tree.getroot()
+
+
+class PartCache:
+    """Parses each XML part at most once and hands the same ParsedPart to every check.
+
+    Parse failures are cached too, so every check sees the same exception
+    without re-reading the file. Parts are read through source (a package
+    source from package.py) if one is given, else straight from the
+    filesystem. With a ValidationProfile, every read and parse is recorded in it.
+    """
+
+    def __init__(self, profile=None, source=None):
+        self._parts = {}
+        self.profile = profile
+        self.source = source
+
+    def get(self, path):
+        """Return the ParsedPart for path, parsing it on first use.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the part is not well-formed.
+        """
+        key = str(path)
+        if key not in self._parts:
+            started = time.perf_counter()
+            try:
+                self._parts[key] = ParsedPart(path, self._parse(path))
+            except Exception as e:
+                self._parts[key] = e
+            if self.profile is not None:
+                self.profile.record_parse(
+                    path, time.perf_counter() - started, self._size(path)
+                )
+        if self.profile is not None:
+            self.profile.record_read(path, self._size(path))
+        part = self._parts[key]
+        if isinstance(part, Exception):
+            raise part
+        return part
+
+    def _name(self, path):
+        return Path(path).relative_to(self.source.root).as_posix()
+
+    def _parse(self, path):
+        if self.source is None:
+            return lxml.etree.parse(str(path))
+        return self.source.parse(self._name(path))
+
+    def _size(self, path):
+        # The uncompressed size of the part, for the profile's byte counts. For
+        # files on disk None lets the profile stat the file itself; members of
+        # an archive have no file, so their size comes from the archive. A
+        # part missing from the archive counts as 0 bytes.
+        if self.source is None or isinstance(self.source, DirectorySource):
+            return None
+        try:
+            return self.source.size(self._name(path))
+        except (OSError, ValueError):
+            return 0
+
+    def clear(self):
+        """Drop all cached parts."""
+        self._parts.clear()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
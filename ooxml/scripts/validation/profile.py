@@ -0,0 +1,197 @@
+"""
+Timing and parse statistics for a validation run.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import time
+from pathlib import Path
+
+
+class ValidationProfile:
+    """Collects wall time, parse counts and bytes per check and per part.
+
+    A check is one validate_* method. Time spent in checks called from another
+    check is counted towards the outer one, except for work recorded with
+    separate_check(), credit_check() or record_schema_load(). Parts are
+    identified by their path relative to the unpacked directory.
+    """
+
+    def __init__(self, unpacked_dir):
+        self.unpacked_dir = Path(unpacked_dir).resolve()
+        self.started = time.perf_counter()
+        self.checks = {}
+        self.parts = {}
+        self._current_check = None
+        self._sizes = {}
+
+    def wrap_check(self, name, method):
+        """Return method wrapped so that each call is recorded under name."""
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            if self._current_check is not None:
+                return method(*args, **kwargs)
+
+            stats = self._check(name)
+            self._current_check = stats
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stats["seconds"] += time.perf_counter() - started
+                stats["calls"] += 1
+                self._current_check = None
+
+        return timed
+
+    @contextlib.contextmanager
+    def separate_check(self, name):
+        """Record the block under check name instead of the check running it.
+
+        Its time, parses and bytes are taken out of the enclosing check, e.g.
+        for work that one check does on behalf of several.
+        """
+        outer = self._current_check
+        stats = self._check(name)
+        self._current_check = stats
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            stats["seconds"] += seconds
+            stats["calls"] += 1
+            self._current_check = outer
+            if outer is not None and outer is not stats:
+                outer["seconds"] -= seconds
+
+    def credit_check(self, name, seconds):
+        """Move seconds spent on behalf of check name from the check running to it."""
+        stats = self._check(name)
+        stats["seconds"] += seconds
+        if self._current_check is not None and self._current_check is not stats:
+            self._current_check["seconds"] -= seconds
+
+    def record_schema_load(self, schema_path, seconds, in_worker=False):
+        """Record compiling the XSD schema at schema_path as its own check.
+
+        The time is taken out of the running check, so it is not charged to
+        the part that happened to need the schema first. Compiles in worker
+        processes overlap with each other and with the running check, so
+        with in_worker they are only recorded.
+        """
+        name = f"load_schema:{Path(schema_path).name}"
+        if in_worker:
+            stats = self._check(name)
+            stats["seconds"] += seconds
+        else:
+            self.credit_check(name, seconds)
+            stats = self._check(name)
+        stats["calls"] += 1
+
+    def _check(self, name):
+        return self.checks.setdefault(
+            name, {"calls": 0, "seconds": 0.0, "parses": 0, "bytes": 0}
+        )
+
+    def _part(self, path, size=None):
+        path = Path(path)
+        try:
+            name = path.resolve().relative_to(self.unpacked_dir).as_posix()
+        except ValueError:
+            name = str(path)
+        if name not in self.parts:
+            if size is None:
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    size = 0
+            self.parts[name] = {
+                "bytes": size,
+                "reads": 0,
+                "parses": 0,
+                "parse_seconds": 0.0,
+                "xsd_seconds": 0.0,
+            }
+        return self.parts[name]
+
+    def record_read(self, path, size=None):
+        """Record that the current check used the parsed part at path.
+
+        size is the part's size in bytes, for parts that are not files on disk.
+        """
+        part = self._part(path, size)
+        part["reads"] += 1
+        if self._current_check is not None:
+            self._current_check["bytes"] += part["bytes"]
+
+    def record_parse(self, path, seconds, size=None):
+        """Record that the part at path was parsed, taking seconds."""
+        part = self._part(path, size)
+        part["parses"] += 1
+        part["parse_seconds"] += seconds
+        if self._current_check is not None:
+            self._current_check["parses"] += 1
+
+    def record_xsd(self, path, seconds):
+        """Record the time spent validating the part at path against its schema."""
+        self._part(path)["xsd_seconds"] += seconds
+
+    def report(self):
+        """Return the profile as a JSON-serializable dict."""
+        return {
+            "unpacked_dir": str(self.unpacked_dir),
+            "total_seconds": round(time.perf_counter() - self.started, 6),
+            "checks": [
+                {"name": name, **self._rounded(stats)}
+                for name, stats in sorted(
+                    self.checks.items(), key=lambda item: -item[1]["seconds"]
+                )
+            ],
+            "parts": [
+                {"path": name, **self._rounded(stats)}
+                for name, stats in sorted(
+                    self.parts.items(),
+                    key=lambda item: -(
+                        item[1]["parse_seconds"] + item[1]["xsd_seconds"]
+                    ),
+                )
+            ],
+        }
+
+    @staticmethod
+    def _rounded(stats):
+        return {
+            key: round(value, 6) if isinstance(value, float) else value
+            for key, value in stats.items()
+        }
+
+    def write_json(self, path):
+        """Write report() as JSON to path."""
+        Path(path).write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+
+    def format_table(self, top=10):
+        """Return the slowest checks and parts as a plain-text table."""
+        report = self.report()
+        lines = [f"Total: {report['total_seconds']:.3f}s", "", "Slowest checks:"]
+        lines.append(f"  {'seconds':>9} {'parses':>7} {'bytes':>12}  check")
+        for check in report["checks"][:top]:
+            lines.append(
+                f"  {check['seconds']:9.3f} {check['parses']:7d} "
+                f"{check['bytes']:12d}  {check['name']}"
+            )
+        lines += ["", "Slowest parts:"]
+        lines.append(f"  {'parse s':>9} {'xsd s':>9} {'bytes':>12}  part")
+        for part in report["parts"][:top]:
+            lines.append(
+                f"  {part['parse_seconds']:9.3f} {part['xsd_seconds']:9.3f} "
+                f"{part['bytes']:12d}  {part['path']}"
+            )
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,183 @@
+"""Streaming XML output that matches what minidom writes.
+
+unpack.py pretty-prints parts and pack.py condenses them without building a
+DOM. Both read the part with expat and write it back the way minidom's
+toprettyxml() and toxml() would, using the helpers in this module.
+"""
+
+import xml.dom.minidom
+import xml.parsers.expat
+
+
+def _minidom_replacements(attribute):
+    """Return the (character, replacement) pairs minidom escapes text or attributes with.
+
+    minidom's escaping differs between Python versions (3.13 stopped escaping
+    '"' in text and started escaping whitespace in attribute values), so it
+    is read off the running minidom instead of being hard-coded.
+    """
+    doc = xml.dom.minidom.Document()
+    replacements = []
+    # "&" first, so the entities added for the other characters stay intact
+    for char in "&<>\"\r\n\t":
+        if attribute:
+            element = doc.createElement("e")
+            element.setAttribute("a", char)
+            written = element.toxml()[len('<e a="') : -len('"/>')]
+        else:
+            written = doc.createTextNode(char).toxml()
+        if written != char:
+            replacements.append((char, written))
+    return tuple(replacements)
+
+
+_TEXT_REPLACEMENTS = _minidom_replacements(attribute=False)
+_ATTRIBUTE_REPLACEMENTS = _minidom_replacements(attribute=True)
+
+
+def escape_text(data):
+    """Escape a text node the way minidom does."""
+    for char, replacement in _TEXT_REPLACEMENTS:
+        if char in data:
+            data = data.replace(char, replacement)
+    return data
+
+
+def escape_attribute(data):
+    """Escape an attribute value the way minidom does."""
+    for char, replacement in _ATTRIBUTE_REPLACEMENTS:
+        if char in data:
+            data = data.replace(char, replacement)
+    return data
+
+
+class DoctypeFound(Exception):
+    """Raised when a part has a DOCTYPE, which the streaming writers do not handle."""
+
+
+class Frame:
+    """An element whose end tag has not been written yet."""
+
+    __slots__ = ("tag", "is_open")
+
+    def __init__(self, tag):
+        self.tag = tag
+        # True once the start tag of the element has been ended with ">"
+        self.is_open = False
+
+
+class StreamingXMLWriter:
+    """Base class for writers that re-serialize an XML byte stream like minidom.
+
+    Handles the expat setup shared by the writers: qualified names,
+    namespace declarations and attributes in minidom's order, and collecting
+    character data into the text and CDATA nodes minidom would have built.
+    Subclasses write the nodes in _start_element, _end_element, _comment,
+    _processing_instruction and _end_text.
+    """
+
+    # Encoding the parser reads parts as, whatever they declare; None follows
+    # the XML declaration
+    encoding = None
+
+    def __init__(self, writer):
+        self._writer = writer
+        self._stack = []
+        self._ns_declarations = []
+        # Text node being accumulated: [kind, list of chunks]
+        self._text = None
+        self._in_cdata = False
+        self._cdata_continue = False
+
+    def _parse(self, source):
+        """Feed a binary file object through expat with this writer's handlers."""
+        parser = xml.parsers.expat.ParserCreate(self.encoding, namespace_separator=" ")
+        parser.namespace_prefixes = True
+        parser.buffer_text = True
+        parser.ordered_attributes = True
+        parser.specified_attributes = True
+        parser.StartDoctypeDeclHandler = self._start_doctype
+        parser.StartNamespaceDeclHandler = self._start_namespace
+        parser.StartElementHandler = self._start_element
+        parser.EndElementHandler = self._end_element
+        parser.CharacterDataHandler = self._character_data
+        parser.StartCdataSectionHandler = self._start_cdata
+        parser.EndCdataSectionHandler = self._end_cdata
+        parser.CommentHandler = self._comment
+        parser.ProcessingInstructionHandler = self._processing_instruction
+        parser.ParseFile(source)
+
+    @staticmethod
+    def _qualified_name(name):
+        """Turn expat's "uri localname prefix" into the prefixed name."""
+        if " " not in name:
+            return name
+        parts = name.split(" ")
+        if len(parts) == 3:
+            return f"{parts[2]}:{parts[1]}"
+        return parts[1]
+
+    def _start_tag(self, name, attributes):
+        """Return the qualified tag and the unterminated start tag of an element."""
+        tag = self._qualified_name(name)
+        # Namespace declarations come first, then attributes in document order
+        start_tag = ["<", tag]
+        for prefix, uri in self._ns_declarations:
+            attr_name = f"xmlns:{prefix}" if prefix else "xmlns"
+            start_tag.append(f' {attr_name}="{escape_attribute(uri or "")}"')
+        self._ns_declarations.clear()
+        for i in range(0, len(attributes), 2):
+            attr_name = self._qualified_name(attributes[i])
+            start_tag.append(f' {attr_name}="{escape_attribute(attributes[i + 1])}"')
+        return tag, "".join(start_tag)
+
+    def _start_doctype(self, *args):
+        raise DoctypeFound()
+
+    def _start_namespace(self, prefix, uri):
+        self._ns_declarations.append((prefix, uri))
+
+    def _character_data(self, data):
+        if self._in_cdata:
+            if self._cdata_continue and self._text and self._text[0] == "cdata":
+                self._text[1].append(data)
+                return
+            self._end_text()
+            self._text = ["cdata", [data]]
+            self._cdata_continue = True
+        elif self._text and self._text[0] == "text":
+            self._text[1].append(data)
+        else:
+            self._end_text()
+            self._text = ["text", [data]]
+
+    def _start_cdata(self):
+        self._in_cdata = True
+        self._cdata_continue = False
+
+    def _end_cdata(self):
+        self._in_cdata = False
+        self._cdata_continue = False
+
+    def _take_text(self):
+        """Return the text node being accumulated as (kind, data), or None."""
+        if self._text is None:
+            return None
+        kind, data = self._text[0], "".join(self._text[1])
+        self._text = None
+        return kind, data
+
+    def _start_element(self, name, attributes):
+        raise NotImplementedError
+
+    def _end_element(self, name):
+        raise NotImplementedError
+
+    def _comment(self, data):
+        raise NotImplementedError
+
+    def _processing_instruction(self, target, data):
+        raise NotImplementedError
+
+    def _end_text(self):
+        raise NotImplementedError
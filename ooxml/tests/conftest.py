@@ -0,0 +1,60 @@
+"""
+Shared fixtures for the ooxml script tests.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Import the scripts through the ooxml package, as the skills' library code does
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from ooxml.scripts.benchmark import generate_package  # noqa: E402
+from ooxml.scripts.unpack import unpack_document  # noqa: E402
+
+
+def edit(path, old, new):
+    """Replace the first occurrence of old in the file at path."""
+    text = path.read_text(encoding="utf-8")
+    assert old in text
+    path.write_text(text.replace(old, new, 1), encoding="utf-8")
+
+
+def add_schema_error(unpacked_dir):
+    """Give an element of word/document.xml a value its schema does not allow."""
+    # A bad value fails fast; a misplaced element makes libxml2 spend seconds
+    # listing what it expected instead
+    edit(unpacked_dir / "word/document.xml", "<w:b/>", '<w:b w:val="maybe"/>')
+
+
+@pytest.fixture
+def docx_file(tmp_path):
+    """A small synthetic .docx file."""
+    path = tmp_path / "sample.docx"
+    generate_package("docx", path, paragraphs=20)
+    return path
+
+
+@pytest.fixture
+def pptx_file(tmp_path):
+    """A small synthetic .pptx file with an image."""
+    path = tmp_path / "sample.pptx"
+    generate_package("pptx", path, slides=3, images=1, image_mb=0.01)
+    return path
+
+
+@pytest.fixture
+def unpacked_docx(tmp_path, docx_file):
+    """docx_file unpacked into a directory."""
+    path = tmp_path / "unpacked_docx"
+    unpack_document(docx_file, path)
+    return path
+
+
+@pytest.fixture
+def unpacked_pptx(tmp_path, pptx_file):
+    """pptx_file unpacked into a directory."""
+    path = tmp_path / "unpacked_pptx"
+    unpack_document(pptx_file, path)
+    return path
@@ -0,0 +1,110 @@
+"""
+Tests for batch unpacking and packing with batch.py.
+"""
+
+import json
+import zipfile
+
+import pytest
+
+from ooxml.scripts.batch import collect_tasks, output_path_for, run_batch
+
+
+def write_manifest(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+class TestCollectTasks:
+    """Tasks come from a manifest or from glob patterns, never sharing an output."""
+
+    def test_manifest(self, tmp_path):
+        manifest = write_manifest(
+            tmp_path / "jobs.jsonl",
+            [
+                json.dumps({"input": "a.docx", "output": "out/a"}),
+                "",
+                json.dumps({"input": "b.pptx", "output": "out/b", "note": "extra"}),
+            ],
+        )
+        assert collect_tasks("unpack", [], manifest) == [
+            ("a.docx", "out/a"),
+            ("b.pptx", "out/b"),
+        ]
+
+    @pytest.mark.parametrize(
+        "line",
+        ["not json", json.dumps({"input": "a.docx"}), json.dumps(["a.docx", "out"])],
+    )
+    def test_invalid_manifest_line(self, tmp_path, line):
+        manifest = write_manifest(
+            tmp_path / "jobs.jsonl",
+            [json.dumps({"input": "a.docx", "output": "out/a"}), line],
+        )
+        with pytest.raises(ValueError, match="Line 2: invalid entry") as excinfo:
+            collect_tasks("unpack", [], manifest)
+        # The parse error stays attached for debugging
+        assert excinfo.value.__cause__ is not None
+
+    def test_duplicate_outputs_are_rejected(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        manifest = write_manifest(
+            tmp_path / "jobs.jsonl",
+            [
+                json.dumps({"input": "a.docx", "output": "out/a"}),
+                json.dumps({"input": "b.docx", "output": str(tmp_path / "out/a")}),
+            ],
+        )
+        with pytest.raises(ValueError, match="Several inputs would write to"):
+            collect_tasks("unpack", [], manifest)
+
+    def test_glob_outputs_that_collide_are_rejected(self, tmp_path):
+        for name in ("report.docx", "report.pptx"):
+            (tmp_path / name).touch()
+        with pytest.raises(ValueError, match="Several inputs"):
+            collect_tasks("unpack", [str(tmp_path / "report.*")], output_dir="out")
+
+    def test_patterns_need_output_dir(self, tmp_path):
+        with pytest.raises(ValueError, match="--output-dir"):
+            collect_tasks("unpack", [str(tmp_path / "*.docx")])
+
+    def test_nothing_matched(self, tmp_path):
+        with pytest.raises(ValueError, match="No inputs"):
+            collect_tasks("unpack", [str(tmp_path / "*.docx")], output_dir="out")
+
+
+class TestOutputPathFor:
+    """Glob-matched inputs get an output named after them."""
+
+    def test_unpack(self, tmp_path):
+        assert output_path_for("unpack", "in/report.docx", tmp_path) == tmp_path / "report"
+
+    def test_pack_uses_document_type(self, tmp_path, unpacked_pptx):
+        expected = tmp_path / f"{unpacked_pptx.name}.pptx"
+        assert output_path_for("pack", unpacked_pptx, tmp_path) == expected
+
+    def test_pack_rejects_other_directories(self, tmp_path):
+        with pytest.raises(ValueError, match="not an unpacked"):
+            output_path_for("pack", tmp_path, tmp_path / "out")
+
+
+class TestRunBatch:
+    """Records come back in task order with the outcome of each task."""
+
+    def test_unpack_and_pack(self, tmp_path, docx_file, pptx_file):
+        tasks = [
+            (str(docx_file), str(tmp_path / "docx")),
+            (str(tmp_path / "missing.docx"), str(tmp_path / "missing")),
+            (str(pptx_file), str(tmp_path / "pptx")),
+        ]
+        records = list(run_batch("unpack", tasks, {}, jobs=2))
+        assert [r["input"] for r in records] == [source for source, _ in tasks]
+        assert [r["ok"] for r in records] == [True, False, True]
+        assert records[1]["error"].startswith("FileNotFoundError")
+
+        tasks = [(str(tmp_path / "pptx"), str(tmp_path / "out.pptx"))]
+        options = {"validate": False, "deterministic": True}
+        (record,) = run_batch("pack", tasks, options, jobs=1)
+        assert record["ok"], record
+        with zipfile.ZipFile(tmp_path / "out.pptx") as zf:
+            assert zf.testzip() is None
@@ -0,0 +1,143 @@
+"""
+Tests for the on-disk XSD result cache in validation/cache.py.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+from ooxml.scripts.validation import DOCXSchemaValidator, XSDResultCache
+from ooxml.scripts.validation import cache as cache_module
+
+
+def age(path, seconds):
+    """Move the mtime of path seconds into the past."""
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+class TestXSDResultCache:
+    """Entries round-trip and the least recently used ones are evicted."""
+
+    def test_put_then_get(self, tmp_path):
+        cache = XSDResultCache(tmp_path)
+        key = cache.key(__file__, b"<a/>")
+        assert cache.get(key) is None
+        cache.put(key, {"error b", "error a"})
+        assert cache.get(key) == {"error a", "error b"}
+
+    def test_key_depends_on_content(self, tmp_path):
+        cache = XSDResultCache(tmp_path)
+        assert cache.key(__file__, b"<a/>") != cache.key(__file__, b"<b/>")
+
+    def test_prune_evicts_least_recently_used(self, tmp_path):
+        cache = XSDResultCache(tmp_path, max_entries=2)
+        keys = [cache.key(__file__, f"<a{i}/>".encode()) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, set())
+            age(cache._entry_path(key), 100 - i)
+        cache.get(keys[0])  # Now the most recently used
+
+        cache.prune()
+        assert cache.get(keys[0]) == set()
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) == set()
+
+
+class TestPruneIfDue:
+    """The cache is listed at most once per prune_interval."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = XSDResultCache(tmp_path, max_entries=1, prune_interval=60)
+        for i in range(3):
+            cache.put(cache.key(__file__, f"<a{i}/>".encode()), set())
+        return cache
+
+    def entries(self, cache):
+        return list(cache.cache_dir.glob("*/*.json"))
+
+    def test_first_call_prunes(self, cache):
+        assert cache.prune_if_due()
+        assert len(self.entries(cache)) == 1
+
+    def test_recent_prune_is_not_repeated(self, cache):
+        cache.prune_if_due()
+        cache.put(cache.key(__file__, b"<b/>"), set())
+        assert not cache.prune_if_due()
+        assert len(self.entries(cache)) == 2
+
+    def test_prunes_again_after_interval(self, cache):
+        cache.prune_if_due()
+        cache.put(cache.key(__file__, b"<b/>"), set())
+        age(cache.cache_dir / XSDResultCache.PRUNE_MARKER, 120)
+        assert cache.prune_if_due()
+        assert len(self.entries(cache)) == 1
+
+    def test_validation_does_not_list_the_cache_every_run(
+        self, monkeypatch, cache, unpacked_docx, docx_file
+    ):
+        cache.max_entries = 20000
+        cache.prune_if_due()
+        monkeypatch.setattr(
+            XSDResultCache, "prune", lambda self: pytest.fail("pruned again")
+        )
+        validator = DOCXSchemaValidator(unpacked_docx, docx_file, result_cache=cache)
+        assert validator.validate_against_xsd()
+
+
+class TestCachedValidation:
+    """A second validation of the same content is answered from the cache."""
+
+    def test_second_run_hits(self, monkeypatch, tmp_path, unpacked_docx, docx_file):
+        cache = XSDResultCache(tmp_path / "cache")
+        validator = DOCXSchemaValidator(unpacked_docx, docx_file, result_cache=cache)
+        assert validator.validate_against_xsd()
+        assert list(cache.cache_dir.glob("*/*.json"))
+
+        puts = []
+        monkeypatch.setattr(XSDResultCache, "put", lambda self, *args: puts.append(args))
+        validator = DOCXSchemaValidator(unpacked_docx, docx_file, result_cache=cache)
+        assert validator.validate_against_xsd()
+        assert puts == []
+
+
+class TestSchemaId:
+    """Keys change when the schema or any schema it imports changes."""
+
+    @pytest.fixture
+    def schemas(self, tmp_path):
+        xs = 'xmlns:xs="http://www.w3.org/2001/XMLSchema"'
+        (tmp_path / "shared").mkdir()
+        (tmp_path / "shared/types.xsd").write_text(
+            f'<xs:schema {xs} targetNamespace="urn:t">'
+            '<xs:simpleType name="T"><xs:restriction base="xs:string"/></xs:simpleType>'
+            "</xs:schema>"
+        )
+        (tmp_path / "part.xsd").write_text(
+            f'<xs:schema {xs} xmlns:t="urn:t">'
+            '<xs:import namespace="urn:t" schemaLocation="shared/types.xsd"/>'
+            '<xs:element name="a" type="t:T"/></xs:schema>'
+        )
+        return tmp_path
+
+    def test_imported_schema_edit_misses(self, tmp_path, schemas):
+        content = b"<a/>"
+        cache = XSDResultCache(tmp_path / "cache")
+        key = cache.key(schemas / "part.xsd", content)
+        cache.put(key, set())
+
+        types = schemas / "shared/types.xsd"
+        types.write_text(types.read_text().replace("xs:string", "xs:token"))
+        cache = XSDResultCache(tmp_path / "cache")
+        assert cache.key(schemas / "part.xsd", content) != key
+        assert cache.get(cache.key(schemas / "part.xsd", content)) is None
+
+    def test_real_schema_covers_its_imports(self):
+        schemas_dir = Path(cache_module.__file__).resolve().parents[2] / "schemas"
+        closure = cache_module._schema_closure(
+            schemas_dir / "ISO-IEC29500-4_2016/wml.xsd"
+        )
+        names = {path.name for path in closure}
+        assert {"wml.xsd", "mc.xsd", "dml-wordprocessingDrawing.xsd"} <= names
@@ -0,0 +1,111 @@
+"""
+Tests for incremental validation: which parts count as unchanged since the original.
+"""
+
+import lxml.etree
+import pytest
+from ooxml.scripts.validation import DOCXSchemaValidator
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+@pytest.fixture
+def validator(unpacked_docx, docx_file):
+    return DOCXSchemaValidator(unpacked_docx, docx_file, incremental=True)
+
+
+def same(validator, xml_a, xml_b):
+    return validator._same_xml_content(
+        lxml.etree.fromstring(xml_a), lxml.etree.fromstring(xml_b)
+    )
+
+
+class TestSameXmlContent:
+    """_same_xml_content ignores only the whitespace unpack.py adds."""
+
+    def test_pretty_printing_is_ignored(self, validator):
+        condensed = f'<w:body {W}><w:p><w:r><w:t xml:space="preserve"> a </w:t></w:r></w:p></w:body>'
+        pretty = (
+            f"<w:body {W}>\n  <w:p>\n    <w:r>\n"
+            '      <w:t xml:space="preserve"> a </w:t>\n'
+            "    </w:r>\n  </w:p>\n</w:body>"
+        )
+        assert same(validator, condensed, pretty)
+
+    def test_comment_text_is_compared(self, validator):
+        assert not same(
+            validator,
+            f"<w:p {W}><!-- one --><w:r/></w:p>",
+            f"<w:p {W}><!-- two --><w:r/></w:p>",
+        )
+
+    def test_tail_after_comment_is_compared(self, validator):
+        assert not same(
+            validator,
+            f"<w:p {W}><!-- c -->old<w:r/></w:p>",
+            f"<w:p {W}><!-- c -->new<w:r/></w:p>",
+        )
+
+    def test_processing_instructions_are_compared(self, validator):
+        assert not same(
+            validator,
+            f'<w:p {W}><?mso-app a="1"?><w:r/></w:p>',
+            f'<w:p {W}><?mso-app a="2"?><w:r/></w:p>',
+        )
+
+    def test_nodes_outside_root_are_compared(self, validator):
+        assert not same(
+            validator, f"<!-- a --><w:p {W}/>", f"<!-- b --><w:p {W}/>"
+        )
+
+    @pytest.mark.parametrize("tag", ["w:t", "w:delText", "w:instrText"])
+    def test_whitespace_of_leaf_text_is_content(self, validator, tag):
+        assert not same(
+            validator,
+            f"<w:r {W}><{tag}> </{tag}></w:r>",
+            f"<w:r {W}><{tag}>  </{tag}></w:r>",
+        )
+
+    def test_whitespace_under_xml_space_preserve_is_content(self, validator):
+        assert not same(
+            validator,
+            f'<w:r {W} xml:space="preserve"> <w:t>a</w:t></w:r>',
+            f'<w:r {W} xml:space="preserve">  <w:t>a</w:t></w:r>',
+        )
+
+    def test_xml_space_default_ends_preserve(self, validator):
+        assert same(
+            validator,
+            f'<w:body {W} xml:space="preserve"><w:p xml:space="default"> <w:r/></w:p></w:body>',
+            f'<w:body {W} xml:space="preserve"><w:p xml:space="default">\n  <w:r/></w:p></w:body>',
+        )
+
+    def test_attribute_change_is_detected(self, validator):
+        assert not same(
+            validator, f'<w:p {W}><w:r w:rsidR="1"/></w:p>', f'<w:p {W}><w:r w:rsidR="2"/></w:p>'
+        )
+
+
+class TestChangedXmlFiles:
+    """Only parts edited since unpacking are re-checked."""
+
+    def test_freshly_unpacked_parts_are_unchanged(self, validator):
+        assert validator.changed_xml_files == []
+
+    def test_edited_part_is_changed(self, unpacked_docx, docx_file):
+        document = unpacked_docx / "word" / "document.xml"
+        content = document.read_text(encoding="ascii")
+        document.write_text(
+            content.replace("<w:sectPr/>", "<!-- note --><w:sectPr/>", 1),
+            encoding="ascii",
+        )
+        validator = DOCXSchemaValidator(unpacked_docx, docx_file, incremental=True)
+        assert validator.changed_xml_files == [document.resolve()]
+
+    def test_without_incremental_every_part_is_checked(self, unpacked_docx, docx_file):
+        validator = DOCXSchemaValidator(unpacked_docx, docx_file)
+        assert validator.changed_xml_files == validator.xml_files
+
+    def test_incremental_needs_an_original(self, unpacked_docx):
+        with pytest.raises(ValueError, match="original_file"):
+            DOCXSchemaValidator(unpacked_docx, None, incremental=True)
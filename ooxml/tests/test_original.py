@@ -0,0 +1,146 @@
+"""
+Tests for reusing the validation results of original documents.
+"""
+
+import importlib
+from pathlib import Path
+
+import pytest
+from conftest import add_schema_error, edit
+from ooxml.scripts.benchmark import generate_package
+from ooxml.scripts.pack import pack_document
+from ooxml.scripts.unpack import unpack_document
+from ooxml.scripts.validation import (
+    DOCXSchemaValidator,
+    base,
+    clear_original_errors_cache,
+)
+
+DOCX_SKILL_DIR = Path(__file__).resolve().parents[2] / "docx"
+WORDPROCESSINGML = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def count_original_validations(monkeypatch):
+    """Record the parts of originals validated from now on, in a returned list."""
+    calls = []
+    validate = base.BaseSchemaValidator._validate_single_file_xsd
+
+    def counting(self, xml_file, base_path, content=None):
+        if content is not None:
+            calls.append(xml_file)
+        return validate(self, xml_file, base_path, content)
+
+    monkeypatch.setattr(base.BaseSchemaValidator, "_validate_single_file_xsd", counting)
+    return calls
+
+
+@pytest.fixture
+def invalid_original(tmp_path):
+    """A .docx with an XSD error, unpacked; the error is not new when validating."""
+    original = tmp_path / "invalid.docx"
+    unpacked = tmp_path / "invalid"
+    generate_package("docx", original, paragraphs=5)
+    unpack_document(original, unpacked)
+    add_schema_error(unpacked)
+    pack_document(unpacked, original)
+    return unpacked, original
+
+
+class TestOriginalErrorsCache:
+    """Each part of an original is validated once per process."""
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        clear_original_errors_cache()
+        yield
+        clear_original_errors_cache()
+
+    def test_second_validation_reuses_original_errors(
+        self, monkeypatch, invalid_original
+    ):
+        unpacked, original = invalid_original
+        calls = count_original_validations(monkeypatch)
+        assert DOCXSchemaValidator(unpacked, original).validate_against_xsd()
+        assert calls
+        calls.clear()
+        assert DOCXSchemaValidator(unpacked, original).validate_against_xsd()
+        assert calls == []
+
+    def test_clear_forgets_original_errors(self, monkeypatch, invalid_original):
+        unpacked, original = invalid_original
+        calls = count_original_validations(monkeypatch)
+        DOCXSchemaValidator(unpacked, original).validate_against_xsd()
+        first = len(calls)
+        assert first
+        clear_original_errors_cache()
+        DOCXSchemaValidator(unpacked, original).validate_against_xsd()
+        assert len(calls) == 2 * first
+
+    def test_changed_original_is_validated_again(
+        self, monkeypatch, invalid_original
+    ):
+        unpacked, original = invalid_original
+        calls = count_original_validations(monkeypatch)
+        DOCXSchemaValidator(unpacked, original).validate_against_xsd()
+        first = len(calls)
+        # Entries are keyed by the original's content, not its path
+        edit(unpacked / "word/document.xml", 'w:val="maybe"', 'w:val="perhaps"')
+        pack_document(unpacked, original)
+        DOCXSchemaValidator(unpacked, original).validate_against_xsd()
+        assert len(calls) == 2 * first
+
+
+class TestDocumentSave:
+    """Saving a Document again only validates the edited side."""
+
+    @pytest.fixture
+    def document_module(self, monkeypatch):
+        monkeypatch.syspath_prepend(str(DOCX_SKILL_DIR))
+        return importlib.import_module("scripts.document")
+
+    @pytest.fixture
+    def document_dir(self, unpacked_docx):
+        """unpacked_docx with the settings part Document needs and an XSD error."""
+        (unpacked_docx / "word/settings.xml").write_text(
+            f'<?xml version="1.0" encoding="UTF-8"?>'
+            f'<w:settings xmlns:w="{WORDPROCESSINGML}"/>',
+            encoding="utf-8",
+        )
+        edit(
+            unpacked_docx / "[Content_Types].xml",
+            "</Types>",
+            '<Override PartName="/word/settings.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/></Types>',
+        )
+        edit(
+            unpacked_docx / "word/_rels/document.xml.rels",
+            "</Relationships>",
+            '<Relationship Id="rId90" Type="http://schemas.openxmlformats.org/'
+            'officeDocument/2006/relationships/settings" Target="settings.xml"/>'
+            "</Relationships>",
+        )
+        add_schema_error(unpacked_docx)
+        return unpacked_docx
+
+    def test_document_shares_the_validators(self, document_module):
+        # The skill's ooxml link resolves to this package, not a second copy
+        assert document_module.DOCXSchemaValidator is DOCXSchemaValidator
+
+    def test_second_save_reuses_cached_entries(
+        self, monkeypatch, tmp_path, document_module, document_dir
+    ):
+        clear_original_errors_cache()
+        calls = count_original_validations(monkeypatch)
+        try:
+            doc = document_module.Document(document_dir)
+            doc.save(tmp_path / "first")
+            assert calls
+            cached = dict(base._ORIGINAL_ERRORS_CACHE)
+            assert cached
+
+            calls.clear()
+            doc.save(tmp_path / "second")
+            assert calls == []
+            assert dict(base._ORIGINAL_ERRORS_CACHE) == cached
+        finally:
+            clear_original_errors_cache()
@@ -0,0 +1,279 @@
+"""
+Tests for writing packages with pack.py.
+"""
+
+import io
+import os
+import types
+import zipfile
+
+import pytest
+
+from ooxml.scripts import pack
+from ooxml.scripts.pack import pack_document
+from ooxml.scripts.unpack import unpack_document
+from test_unpack import SAMPLES
+
+
+def condense(path):
+    """Return the output of condense_xml for the part at path."""
+    output = io.BytesIO()
+    pack.condense_xml(path, output)
+    return output.getvalue()
+
+
+def read_members(path):
+    """Return {name: uncompressed bytes} for every member of a zip file."""
+    with zipfile.ZipFile(path) as zf:
+        return {name: zf.read(name) for name in zf.namelist()}
+
+
+class TestRoundTrip:
+    """Packed files are valid archives holding the unpacked content."""
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_archive_is_intact(self, tmp_path, unpacked_pptx, jobs):
+        output = tmp_path / "out.pptx"
+        assert pack_document(unpacked_pptx, output, jobs=jobs)
+        with zipfile.ZipFile(output) as zf:
+            assert zf.testzip() is None
+            assert zf.namelist()[0] == "[Content_Types].xml"
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_repacked_archive_matches(self, tmp_path, unpacked_docx, jobs):
+        first = tmp_path / "first.docx"
+        second = tmp_path / "second.docx"
+        pack_document(unpacked_docx, first, jobs=jobs)
+        unpack_dir = tmp_path / "again"
+        unpack_document(first, unpack_dir)
+        pack_document(unpack_dir, second, jobs=jobs)
+        assert read_members(first) == read_members(second)
+
+    def test_media_is_stored(self, tmp_path, unpacked_pptx):
+        output = tmp_path / "out.pptx"
+        pack_document(unpacked_pptx, output)
+        with zipfile.ZipFile(output) as zf:
+            methods = {info.filename: info.compress_type for info in zf.infolist()}
+        assert methods["ppt/media/image1.png"] == zipfile.ZIP_STORED
+        assert methods["ppt/presentation.xml"] == zipfile.ZIP_DEFLATED
+
+
+class TestRawWriteSupport:
+    """Raw member writes are only used when every internal they need exists."""
+
+    def test_supported_here(self, tmp_path):
+        with zipfile.ZipFile(tmp_path / "out.zip", "w") as zf:
+            assert pack._raw_write_supported(zf)
+
+    @pytest.mark.parametrize("attr", pack._RAW_WRITE_ZIPFILE_ATTRIBUTES)
+    def test_missing_internal_is_detected(self, attr):
+        present = [name for name in pack._RAW_WRITE_ZIPFILE_ATTRIBUTES if name != attr]
+        zf = types.SimpleNamespace(**dict.fromkeys(present))
+        assert not pack._raw_write_supported(zf)
+
+    def test_fallback_writes_the_same_content(
+        self, tmp_path, monkeypatch, unpacked_pptx
+    ):
+        raw = tmp_path / "raw.pptx"
+        pack_document(unpacked_pptx, raw, jobs=2)
+        monkeypatch.setattr(pack, "_raw_write_supported", lambda zf: False)
+        fallback = tmp_path / "fallback.pptx"
+        pack_document(unpacked_pptx, fallback, jobs=2)
+        with zipfile.ZipFile(fallback) as zf:
+            assert zf.testzip() is None
+        assert read_members(raw) == read_members(fallback)
+
+
+class TestParallelPacking:
+    """Worker processes produce the same bytes as packing in one process."""
+
+    @pytest.mark.parametrize("unpacked", ["unpacked_docx", "unpacked_pptx"])
+    @pytest.mark.parametrize(
+        "compression",
+        [
+            None,
+            pack.CompressionPolicy(xml_level=9, binary_level=1),
+            pack.CompressionPolicy(store_compressed_media=False),
+        ],
+    )
+    def test_output_is_byte_identical(self, request, tmp_path, unpacked, compression):
+        input_dir = request.getfixturevalue(unpacked)
+        suffix = "." + unpacked.split("_")[1]
+        sequential = tmp_path / f"sequential{suffix}"
+        parallel = tmp_path / f"parallel{suffix}"
+        pack_document(input_dir, sequential, compression=compression, deterministic=True)
+        pack_document(
+            input_dir, parallel, jobs=2, compression=compression, deterministic=True
+        )
+        assert parallel.read_bytes() == sequential.read_bytes()
+
+    def test_workers_are_used(self, tmp_path, monkeypatch, unpacked_pptx):
+        calls = []
+        write_prepared = pack._MemberWriter.write_prepared
+
+        def record(writer, arcname, path, prepared):
+            calls.append(arcname)
+            write_prepared(writer, arcname, path, prepared)
+
+        monkeypatch.setattr(pack._MemberWriter, "write_prepared", record)
+        pack_document(unpacked_pptx, tmp_path / "out.pptx", jobs=2)
+        assert "ppt/presentation.xml" in calls
+
+
+class TestLazyMembers:
+    """Members left in the original by unpack.py --lazy are copied from it."""
+
+    @pytest.fixture
+    def lazy_pptx(self, tmp_path, pptx_file):
+        path = tmp_path / "lazy"
+        unpack_document(pptx_file, path, include=["ppt/slides/slide1.xml"], lazy=True)
+        return path
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_lazy_unpack_then_pack(self, tmp_path, pptx_file, lazy_pptx, jobs):
+        full = tmp_path / "full"
+        unpack_document(pptx_file, full)
+        repacked = tmp_path / "repacked.pptx"
+        pack_document(full, repacked, deterministic=True)
+
+        output = tmp_path / "out.pptx"
+        assert pack_document(lazy_pptx, output, jobs=jobs, deterministic=True)
+        with zipfile.ZipFile(output) as zf:
+            assert zf.testzip() is None
+        members = read_members(output)
+        original = read_members(pptx_file)
+        condensed = read_members(repacked)
+        assert members.keys() == original.keys()
+        for name, data in members.items():
+            if (lazy_pptx / name).exists():
+                assert data == condensed[name]
+            else:
+                assert data == original[name]
+        assert not (lazy_pptx / "ppt/media/image1.png").exists()
+
+    def test_compressed_bytes_are_copied_unchanged(self, tmp_path, pptx_file):
+        source = tmp_path / "source.pptx"
+        # Compress the media, so the copy is not just of stored bytes
+        with zipfile.ZipFile(pptx_file) as original:
+            with zipfile.ZipFile(source, "w", zipfile.ZIP_DEFLATED) as zf:
+                for info in original.infolist():
+                    zf.writestr(info.filename, original.read(info), compresslevel=1)
+        output = tmp_path / "out.zip"
+        with zipfile.ZipFile(source) as src, zipfile.ZipFile(output, "w") as dst:
+            pack.copy_compressed_member(src, "ppt/media/image1.png", dst)
+        with zipfile.ZipFile(source) as src, zipfile.ZipFile(output) as dst:
+            assert dst.testzip() is None
+            copied = dst.getinfo("ppt/media/image1.png")
+            original = src.getinfo("ppt/media/image1.png")
+            assert (copied.CRC, copied.compress_size, copied.file_size) == (
+                original.CRC,
+                original.compress_size,
+                original.file_size,
+            )
+            assert dst.read(copied) == src.read(original)
+
+    def test_corrupt_source_is_rejected(self, tmp_path, pptx_file, lazy_pptx):
+        with zipfile.ZipFile(pptx_file) as zf:
+            info = zf.getinfo("ppt/media/image1.png")
+        with open(pptx_file, "r+b") as f:
+            offset = pack._member_data_offset(f, info) + info.compress_size // 2
+            f.seek(offset)
+            byte = f.read(1)
+            f.seek(offset)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        with pytest.raises(zipfile.BadZipFile, match="image1.png"):
+            pack_document(lazy_pptx, tmp_path / "out.pptx")
+
+    def test_source_without_file_name_is_recompressed(self, tmp_path, pptx_file):
+        output = tmp_path / "out.zip"
+        with open(pptx_file, "rb") as f:
+            with zipfile.ZipFile(f) as src, zipfile.ZipFile(output, "w") as dst:
+                pack.copy_compressed_member(src, "ppt/presentation.xml", dst)
+        with zipfile.ZipFile(output) as zf:
+            assert zf.testzip() is None
+
+
+class TestStreamingCondenser:
+    """condense_xml writes what the minidom pass it replaced would."""
+
+    @pytest.mark.parametrize("name", sorted(SAMPLES))
+    def test_matches_minidom(self, tmp_path, name):
+        path = tmp_path / "part.xml"
+        path.write_bytes(SAMPLES[name].encode("utf-8"))
+        assert condense(path) == pack._condense_with_minidom(path)
+
+    def test_matches_minidom_for_unpacked_parts(self, unpacked_docx, unpacked_pptx):
+        for directory in (unpacked_docx, unpacked_pptx):
+            for path in directory.rglob("*"):
+                if pack.is_xml_part(path):
+                    assert condense(path) == pack._condense_with_minidom(path), path
+
+    def test_text_elements_keep_whitespace_and_comments(self, tmp_path):
+        path = tmp_path / "part.xml"
+        path.write_bytes(
+            b'<w:p xmlns:w="urn:w">\n  <w:t> <!--c--> </w:t>\n  <!--dropped-->\n</w:p>'
+        )
+        assert condense(path) == (
+            b'<?xml version="1.0" encoding="UTF-8"?>'
+            b'<w:p xmlns:w="urn:w"><w:t> <!--c--> </w:t></w:p>'
+        )
+
+    def test_doctype_falls_back_to_minidom(self, tmp_path):
+        path = tmp_path / "part.xml"
+        path.write_bytes(b'<!DOCTYPE a [<!ELEMENT a ANY>]><a>\n  <b>"x"</b>\n</a>')
+        assert condense(path) == pack._condense_with_minidom(path)
+
+
+class TestDeterministic:
+    """Deterministic output depends only on the unpacked content."""
+
+    def test_metadata_does_not_change_output(self, tmp_path, unpacked_docx):
+        first = tmp_path / "first.docx"
+        second = tmp_path / "second.docx"
+        pack_document(unpacked_docx, first, deterministic=True)
+        for i, path in enumerate(sorted(unpacked_docx.rglob("*"))):
+            if path.is_file():
+                os.utime(path, (1_000_000_000 + i, 1_000_000_000 + i))
+                path.chmod(0o600)
+        pack_document(unpacked_docx, second, deterministic=True)
+        assert second.read_bytes() == first.read_bytes()
+
+    def test_members_are_normalized(self, tmp_path, unpacked_docx):
+        output = tmp_path / "out.docx"
+        pack_document(unpacked_docx, output, deterministic=True)
+        with zipfile.ZipFile(output) as zf:
+            infos = zf.infolist()
+        assert infos[0].filename == "[Content_Types].xml"
+        for info in infos:
+            assert info.date_time == pack._MemberWriter.FIXED_DATE_TIME
+            assert info.external_attr == pack._MemberWriter.FIXED_EXTERNAL_ATTR
+
+
+class TestCheckStructure:
+    """The in-process checks that decide whether soffice has to run."""
+
+    def test_clean_package_passes(self, unpacked_docx, unpacked_pptx):
+        assert pack.check_structure(unpacked_docx)
+        assert pack.check_structure(unpacked_pptx)
+
+    def test_malformed_part_fails(self, unpacked_docx):
+        (unpacked_docx / "word/document.xml").write_text("<w:document", encoding="utf-8")
+        assert not pack.check_structure(unpacked_docx)
+
+    def test_broken_reference_fails(self, unpacked_docx):
+        rels = unpacked_docx / "word/_rels/document.xml.rels"
+        text = rels.read_text(encoding="utf-8")
+        assert 'Target="styles.xml"' in text
+        rels.write_text(
+            text.replace('Target="styles.xml"', 'Target="missing.xml"', 1),
+            encoding="utf-8",
+        )
+        assert not pack.check_structure(unpacked_docx)
+
+    def test_missing_content_type_fails(self, unpacked_pptx):
+        content_types = unpacked_pptx / "[Content_Types].xml"
+        text = content_types.read_text(encoding="utf-8")
+        start = text.index('<Override PartName="/ppt/slides/slide1.xml"')
+        end = text.index("/>", start) + 2
+        content_types.write_text(text[:start] + text[end:], encoding="utf-8")
+        assert not pack.check_structure(unpacked_pptx)
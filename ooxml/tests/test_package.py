@@ -0,0 +1,55 @@
+"""
+Tests for the package index in validation/package.py.
+"""
+
+import pytest
+from ooxml.scripts.validation.package import PackageIndex, as_package_source
+from ooxml.scripts.validation.parts import PartCache
+
+
+class TestResolveTarget:
+    """Relationship targets resolve to package names."""
+
+    @pytest.mark.parametrize(
+        "base_dir, target, expected",
+        [
+            ("word", "styles.xml", "word/styles.xml"),
+            ("", "word/document.xml", "word/document.xml"),
+            (
+                "ppt/slides",
+                "../slideLayouts/slideLayout1.xml",
+                "ppt/slideLayouts/slideLayout1.xml",
+            ),
+            ("ppt/slides", "../../customXml/item1.xml", "customXml/item1.xml"),
+            ("word", "media/../media/./image1.png", "word/media/image1.png"),
+            # Absolute targets are relative to the package root, not base_dir
+            ("word", "/word/media/image1.png", "word/media/image1.png"),
+            ("ppt/slides", "/ppt/../docProps/core.xml", "docProps/core.xml"),
+            ("", "/[Content_Types].xml", "[Content_Types].xml"),
+        ],
+    )
+    def test_internal_targets(self, base_dir, target, expected):
+        assert PackageIndex._resolve_target(base_dir, target) == expected
+
+    def test_target_above_package_root_stays_outside(self):
+        # Left as "../..." so that it never matches a part of the package
+        resolved = PackageIndex._resolve_target("word", "../../outside.xml")
+        assert resolved == "../outside.xml"
+
+    @pytest.mark.parametrize(
+        "target", [None, "", "http://example.com/a.png", "https://x", "mailto:a@b.c"]
+    )
+    def test_external_and_missing_targets(self, target):
+        assert PackageIndex._resolve_target("word", target) is None
+
+
+class TestRelationships:
+    """Relationships of an unpacked package resolve against their source part."""
+
+    def test_resolved_targets_exist(self, unpacked_pptx):
+        source = as_package_source(unpacked_pptx)
+        index = PackageIndex(source, PartCache(None, source))
+        rels = index.relationships("ppt/slides/_rels/slide1.xml.rels")
+        targets = {rel.part for rel in rels}
+        assert "ppt/slideLayouts/slideLayout1.xml" in targets
+        assert all(target in index for target in targets if target)
@@ -0,0 +1,98 @@
+"""
+Tests for per-check timings in validation/profile.py.
+"""
+
+import time
+
+import pytest
+from ooxml.scripts.validation import (
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    ValidationProfile,
+    base,
+)
+
+
+class TestElementVisitorAttribution:
+    """The shared element walk is split between the checks that use it."""
+
+    @pytest.mark.parametrize(
+        "validator_class, package",
+        [(DOCXSchemaValidator, "docx"), (PPTXSchemaValidator, "pptx")],
+    )
+    def test_every_visitor_check_gets_time(self, request, validator_class, package):
+        unpacked = request.getfixturevalue(f"unpacked_{package}")
+        original = request.getfixturevalue(f"{package}_file")
+        profile = ValidationProfile(unpacked)
+        validator = validator_class(unpacked, original, profile=profile)
+
+        for name in validator_class.ELEMENT_VISITORS:
+            assert getattr(validator, f"validate_{name}")()
+
+        checks = {check["name"]: check for check in profile.report()["checks"]}
+        prefix = validator_class.__name__
+        for name in validator_class.ELEMENT_VISITORS:
+            assert checks[f"{prefix}.validate_{name}"]["seconds"] > 0, name
+        # The walk itself is its own entry and carries the parses
+        walk = checks[f"{prefix}.element_walk"]
+        assert walk["calls"] == 1
+        assert walk["seconds"] >= 0
+
+    def test_attributed_time_is_not_counted_twice(self, unpacked_docx, docx_file):
+        profile = ValidationProfile(unpacked_docx)
+        validator = DOCXSchemaValidator(unpacked_docx, docx_file, profile=profile)
+        started = time.perf_counter()
+        validator.validate_unique_ids()
+        elapsed = time.perf_counter() - started
+
+        checks = {check["name"]: check["seconds"] for check in profile.report()["checks"]}
+        assert sum(checks.values()) <= elapsed
+
+
+class TestSchemaLoadAttribution:
+    """Compiling an XSD schema is recorded apart from the part that needed it."""
+
+    @pytest.fixture
+    def cold_schemas(self, monkeypatch):
+        monkeypatch.setattr(base, "_SCHEMA_CACHE", {})
+        monkeypatch.setattr(base, "_SCHEMA_LOAD_SECONDS", {})
+
+    def profile_xsd(self, unpacked, original, jobs=1):
+        profile = ValidationProfile(unpacked)
+        validator = DOCXSchemaValidator(unpacked, original, profile=profile, jobs=jobs)
+        assert validator.validate_against_xsd()
+        report = profile.report()
+        checks = {check["name"]: check for check in report["checks"]}
+        parts = {part["path"]: part for part in report["parts"]}
+        return checks, parts
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_schema_load_is_its_own_entry(
+        self, cold_schemas, unpacked_docx, docx_file, jobs
+    ):
+        checks, parts = self.profile_xsd(unpacked_docx, docx_file, jobs)
+        loads = {name: c for name, c in checks.items() if name.startswith("load_schema:")}
+        assert loads
+        assert all(load["seconds"] > 0 for load in loads.values())
+        # Compiling the schema takes far longer than validating the part
+        document_load = checks["load_schema:wml.xsd"]["seconds"]
+        assert parts["word/document.xml"]["xsd_seconds"] < document_load
+
+    def test_compiled_schemas_are_not_recorded_again(
+        self, cold_schemas, unpacked_docx, docx_file
+    ):
+        self.profile_xsd(unpacked_docx, docx_file)
+        checks, _ = self.profile_xsd(unpacked_docx, docx_file)
+        assert not [name for name in checks if name.startswith("load_schema:")]
+
+    def test_load_time_is_taken_out_of_the_check(
+        self, cold_schemas, unpacked_docx, docx_file
+    ):
+        profile = ValidationProfile(unpacked_docx)
+        validator = DOCXSchemaValidator(unpacked_docx, docx_file, profile=profile)
+        started = time.perf_counter()
+        validator.validate_against_xsd()
+        elapsed = time.perf_counter() - started
+
+        checks = {check["name"]: check["seconds"] for check in profile.report()["checks"]}
+        assert sum(checks.values()) <= elapsed
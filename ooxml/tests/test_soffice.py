@@ -0,0 +1,78 @@
+"""
+Tests for the soffice process management in soffice.py.
+"""
+
+import os
+import types
+
+import pytest
+
+from ooxml.scripts import soffice
+
+
+class FakeNoConnectException(Exception):
+    """Stands in for com.sun.star.connection.NoConnectException."""
+
+
+@pytest.fixture
+def fake_soffice(tmp_path):
+    """An executable that stays running like a soffice listener would."""
+    path = tmp_path / "soffice"
+    path.write_text("#!/bin/sh\nexec sleep 60\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+def fake_uno(resolve):
+    """Return a stand-in for the uno module whose resolver calls resolve(url)."""
+    resolver = types.SimpleNamespace(resolve=resolve)
+    service_manager = types.SimpleNamespace(
+        createInstanceWithContext=lambda name, context: resolver
+    )
+    context = types.SimpleNamespace(ServiceManager=service_manager)
+    return types.SimpleNamespace(getComponentContext=lambda: context)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="fake soffice is a shell script")
+class TestSofficeProcessStart:
+    """A failed start never leaves a soffice process or profile behind."""
+
+    @pytest.fixture(autouse=True)
+    def no_connect_exception(self, monkeypatch):
+        monkeypatch.setattr(
+            soffice, "NoConnectException", FakeNoConnectException, raising=False
+        )
+
+    @pytest.mark.parametrize("error", [RuntimeError, KeyboardInterrupt])
+    def test_error_while_connecting_stops_process(self, monkeypatch, fake_soffice, error):
+        started = []
+
+        def resolve(url):
+            started.append(process._process)
+            raise error("bridge failed")
+
+        monkeypatch.setattr(soffice, "uno", fake_uno(resolve))
+        process = soffice.SofficeProcess(soffice=fake_soffice)
+        with pytest.raises(error):
+            process.start()
+
+        assert started[0].poll() is not None
+        assert process._process is None
+        assert process._profile_dir is None
+
+    def test_timeout_stops_process(self, monkeypatch, fake_soffice):
+        def resolve(url):
+            raise FakeNoConnectException()
+
+        monkeypatch.setattr(soffice, "uno", fake_uno(resolve))
+        process = soffice.SofficeProcess(soffice=fake_soffice, startup_timeout=0.2)
+        with pytest.raises(soffice.SofficeUnavailable, match="Timeout"):
+            process.start()
+        assert process._process is None
+
+    def test_missing_executable(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(soffice, "uno", fake_uno(lambda url: None))
+        process = soffice.SofficeProcess(soffice=str(tmp_path / "missing"))
+        with pytest.raises(soffice.SofficeUnavailable, match="not found"):
+            process.start()
+        assert process._profile_dir is None
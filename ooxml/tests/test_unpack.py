@@ -0,0 +1,120 @@
+"""
+Tests for unpacking packages with unpack.py.
+"""
+
+import io
+import zipfile
+
+import defusedxml.minidom
+import pytest
+
+from ooxml.scripts.unpack import (
+    StreamingPrettyPrinter,
+    select_members,
+    unpack_document,
+)
+
+# Parts exercising the node types and characters minidom writes specially
+SAMPLES = {
+    "namespaces": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="urn:w" xmlns="urn:default" xmlns:r="urn:r">'
+        '<w:body><w:p r:id="rId1"><w:r><w:t xml:space="preserve"> a b </w:t>'
+        "</w:r></w:p><w:sectPr/></w:body></w:document>"
+    ),
+    "cdata": "<a><b><![CDATA[x < y & z]]></b><c>t<![CDATA[]]>u</c></a>",
+    "processing_instructions": (
+        '<?xml version="1.0"?><?mso-application progid="Word.Document"?>'
+        "<a><?pi data?><b/><?empty?></a>"
+    ),
+    "comments": "<!-- before --><a><!-- inside --><b>x</b>tail<!--c--></a><!--after-->",
+    "non_ascii": "<a t=\"café ☃\">über \U0001f600 中文</a>",
+    "special_characters": (
+        '<a q="&quot;&apos;&lt;&gt;&amp;" ws="a&#10;b&#9;c&#13;d">'
+        "\"quoted\" &amp; 'single' &lt;tag&gt;</a>"
+    ),
+    "mixed_content": "<a>lead<b>inner</b>middle<c/><d>x<e/>y</d>\n  trailing  </a>",
+    "whitespace_text": "<a>\n\t<b>  </b>\r\n<c>\ttab&#10;newline</c></a>",
+}
+
+
+def pretty_print(data):
+    """Return the output of StreamingPrettyPrinter for an XML byte string."""
+    buffer = io.BytesIO()
+    writer = io.TextIOWrapper(
+        buffer, encoding="ascii", errors="xmlcharrefreplace", newline="\n"
+    )
+    StreamingPrettyPrinter(writer).parse(io.BytesIO(data))
+    writer.flush()
+    return buffer.getvalue()
+
+
+def minidom_pretty_print(data):
+    """Return the output of minidom's toprettyxml for an XML byte string."""
+    return defusedxml.minidom.parseString(data).toprettyxml(indent="  ", encoding="ascii")
+
+
+class TestStreamingPrettyPrinter:
+    """The streaming printer writes what the running minidom would."""
+
+    @pytest.mark.parametrize("name", sorted(SAMPLES))
+    def test_matches_minidom(self, name):
+        data = SAMPLES[name].encode("utf-8")
+        assert pretty_print(data) == minidom_pretty_print(data)
+
+    def test_matches_minidom_for_generated_parts(self, docx_file, pptx_file):
+        for path in (docx_file, pptx_file):
+            with zipfile.ZipFile(path) as zf:
+                for name in zf.namelist():
+                    if name.endswith((".xml", ".rels")):
+                        data = zf.read(name)
+                        assert pretty_print(data) == minidom_pretty_print(data), name
+
+
+class TestUnpackDocument:
+    """Unpacked parts are pretty-printed; other members are copied."""
+
+    def test_parts_match_minidom(self, tmp_path, pptx_file):
+        output = tmp_path / "out"
+        unpack_document(pptx_file, output, jobs=2)
+        with zipfile.ZipFile(pptx_file) as zf:
+            for name in zf.namelist():
+                data = zf.read(name)
+                if name.endswith((".xml", ".rels")):
+                    data = minidom_pretty_print(data)
+                assert (output / name).read_bytes() == data, name
+
+    def test_doctype_falls_back_to_minidom(self, tmp_path):
+        source = tmp_path / "doctype.docx"
+        data = b'<!DOCTYPE a [<!ELEMENT a (#PCDATA)>]><a>"x"</a>'
+        with zipfile.ZipFile(source, "w") as zf:
+            zf.writestr("word/document.xml", data)
+        unpack_document(source, tmp_path / "out")
+        written = (tmp_path / "out/word/document.xml").read_bytes()
+        assert written == minidom_pretty_print(data)
+
+
+class TestSelectMembers:
+    """--include and --lazy pick the members that get unpacked."""
+
+    NAMES = [
+        "[Content_Types].xml",
+        "_rels/.rels",
+        "ppt/presentation.xml",
+        "ppt/_rels/presentation.xml.rels",
+        "ppt/slides/slide1.xml",
+        "ppt/slides/slide2.xml",
+        "ppt/media/image1.png",
+    ]
+
+    def test_all_members_by_default(self):
+        selected = select_members(self.NAMES)
+        assert sorted(selected) == sorted(self.NAMES)
+
+    def test_lazy_keeps_content_types_and_relationships(self):
+        selected = select_members(self.NAMES, include=["ppt/slides/slide2.xml"], lazy=True)
+        assert "ppt/slides/slide2.xml" in selected
+        assert "[Content_Types].xml" in selected
+        assert "ppt/_rels/presentation.xml.rels" in selected
+        assert "ppt/slides/slide1.xml" not in selected
+        assert "ppt/media/image1.png" not in selected
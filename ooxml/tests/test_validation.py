@@ -0,0 +1,151 @@
+"""
+Tests for work the validators share across parts, checks and runs.
+"""
+
+from pathlib import Path
+
+import lxml.etree
+import pytest
+from conftest import add_schema_error
+from ooxml.scripts.validation import (
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    ValidationProfile,
+    base,
+)
+
+SCHEMAS_DIR = Path(base.__file__).resolve().parents[2] / "schemas"
+
+
+class TestLoadSchema:
+    """Each schema is compiled once per process."""
+
+    @pytest.fixture
+    def compiles(self, monkeypatch):
+        monkeypatch.setattr(base, "_SCHEMA_CACHE", {})
+        monkeypatch.setattr(base, "_SCHEMA_LOAD_SECONDS", {})
+        calls = []
+        compile_schema = lxml.etree.XMLSchema
+
+        def counting(doc):
+            calls.append(doc.docinfo.URL)
+            return compile_schema(doc)
+
+        monkeypatch.setattr(lxml.etree, "XMLSchema", counting)
+        return calls
+
+    def test_same_schema_object(self, compiles):
+        schema_path = SCHEMAS_DIR / "mce/mc.xsd"
+        assert base.load_schema(schema_path) is base.load_schema(str(schema_path))
+        assert len(compiles) == 1
+
+    def test_shared_by_validators(self, compiles, unpacked_docx, docx_file):
+        for _ in range(2):
+            DOCXSchemaValidator(unpacked_docx, docx_file).validate_against_xsd()
+        assert compiles
+        assert len(compiles) == len(set(compiles))
+
+
+class TestParallelXSD:
+    """Validating parts in worker processes reports what one process does."""
+
+    @pytest.mark.parametrize("broken", [False, True])
+    def test_same_report(self, capsys, unpacked_docx, docx_file, broken):
+        if broken:
+            add_schema_error(unpacked_docx)
+        reports = []
+        for jobs in (1, 2):
+            validator = DOCXSchemaValidator(
+                unpacked_docx, docx_file, verbose=True, jobs=jobs
+            )
+            result = validator.validate_against_xsd()
+            reports.append((result, capsys.readouterr().out))
+        assert reports[0] == reports[1]
+        assert reports[0][0] is not broken
+
+
+class TestSharedParse:
+    """Every check reads parts from one parse per validator."""
+
+    @pytest.mark.parametrize(
+        "validator_class, package",
+        [(DOCXSchemaValidator, "docx"), (PPTXSchemaValidator, "pptx")],
+    )
+    def test_each_part_parsed_once(self, request, capsys, validator_class, package):
+        unpacked = request.getfixturevalue(f"unpacked_{package}")
+        original = request.getfixturevalue(f"{package}_file")
+        profile = ValidationProfile(unpacked)
+        assert validator_class(unpacked, original, profile=profile).validate()
+
+        parts = profile.report()["parts"]
+        assert parts
+        for part in parts:
+            assert part["parses"] <= 1, part["path"]
+        assert any(part["reads"] > 1 for part in parts)
+
+
+class TestXSDPreprocessing:
+    """Parts are preprocessed in place, as the copying implementation did."""
+
+    PART = (
+        b'<?xml version="1.0" encoding="UTF-8"?>\n'
+        b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+        b' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+        b' xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml"'
+        b' xmlns:unused="urn:unused" mc:Ignorable="w14"><w:body>'
+        b'<w:p w14:paraId="1A2B3C4D">{{greeting}}<w:r><w:t>{{kept}}</w:t></w:r>'
+        b"<w14:extra><w:r/></w14:extra> tail {{gone}}"
+        b'<w:r><w:rPr><w:b w:val="maybe"/></w:rPr></w:r></w:p>'
+        b"<!-- {{comment}} --><w:sectPr/></w:body></w:document>"
+    )
+    # Namespace declarations stay; the schema ignores them
+    PREPROCESSED = (
+        b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+        b' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+        b' xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml"'
+        b' xmlns:unused="urn:unused"><w:body>'
+        b"<w:p><w:r><w:t>{{kept}}</w:t></w:r>"
+        b'<w:r><w:rPr><w:b w:val="maybe"/></w:rPr></w:r></w:p>'
+        b"<!-- {{comment}} --><w:sectPr/></w:body></w:document>"
+    )
+    ERRORS = {
+        "Element '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}b', "
+        "attribute '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val': "
+        "'maybe' is not a valid value of the union type "
+        "'{http://schemas.openxmlformats.org/officeDocument/2006/sharedTypes}ST_OnOff'."
+    }
+
+    @pytest.fixture
+    def document(self, unpacked_docx):
+        path = unpacked_docx / "word/document.xml"
+        path.write_bytes(self.PART)
+        return path.resolve()
+
+    def test_preprocessed_tree(self, unpacked_docx, document):
+        validator = DOCXSchemaValidator(unpacked_docx, None)
+        xml_doc = lxml.etree.parse(str(document))
+
+        warnings = validator._remove_template_tags_from_text_nodes(xml_doc)
+        assert validator._preprocess_for_mc_ignorable(xml_doc) is xml_doc
+        assert validator._clean_ignorable_namespaces(xml_doc) is xml_doc
+
+        assert lxml.etree.tostring(xml_doc) == self.PREPROCESSED
+        assert warnings == [
+            "Found template tag in text content: {{greeting}}",
+            "Found template tag in tail content: {{gone}}",
+        ]
+
+    def test_xsd_errors(self, unpacked_docx, document):
+        validator = DOCXSchemaValidator(unpacked_docx, None)
+        valid, errors = validator._validate_single_file_xsd(
+            document, validator.unpacked_dir
+        )
+        assert not valid
+        assert errors == self.ERRORS
+
+    def test_shared_parse_is_left_alone(self, unpacked_docx, document):
+        validator = DOCXSchemaValidator(unpacked_docx, None)
+        shared = validator.parts.get(document).tree
+        before = lxml.etree.tostring(shared)
+        validator._validate_single_file_xsd(document, validator.unpacked_dir)
+        assert lxml.etree.tostring(shared) == before
@@ -0,0 +1,165 @@
+"""
+Tests for the per-element checks that share one walk of each part.
+
+The expected errors are what the separate walk of each check reported before
+the checks were merged into ElementVisitors; a part containing an XML comment
+used to abort those walks with a TypeError instead.
+"""
+
+import pytest
+from conftest import edit
+from ooxml.scripts.validation import DOCXSchemaValidator, PPTXSchemaValidator
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MC = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<w:document xmlns:w="{w}" xmlns:mc="{mc}">
+  <w:body>{comment}
+    <w:p>
+      <w:bookmarkStart w:id="1" w:name="a"/>
+      <w:r>
+        <w:t> leading</w:t>
+      </w:r>
+      <w:r>
+        <w:t xml:space="preserve"> kept </w:t>
+      </w:r>
+      <w:r>
+        <w:t>trailing </w:t>
+      </w:r>
+      <w:bookmarkEnd w:id="1"/>
+      <w:bookmarkStart w:id="1" w:name="b"/>
+    </w:p>
+    <w:del w:id="10" w:author="A">
+      <w:r>
+        <w:t>deleted</w:t>
+        <w:delText>fine</w:delText>
+      </w:r>
+    </w:del>
+    <w:ins w:id="11" w:author="A">
+      <w:r>
+        <w:t>inserted</w:t>
+        <w:delText>odd</w:delText>
+      </w:r>
+      <w:del w:id="12" w:author="A">
+        <w:r>
+          <w:delText>fine</w:delText>
+        </w:r>
+      </w:del>
+    </w:ins>
+    <mc:AlternateContent>
+      <mc:Choice Requires="w14">
+        <w:bookmarkStart w:id="2" w:name="c"/>
+      </mc:Choice>
+      <mc:Fallback>
+        <w:bookmarkStart w:id="2" w:name="c"/>
+      </mc:Fallback>
+    </mc:AlternateContent>
+    <w:sectPr/>
+  </w:body>
+</w:document>
+"""
+
+DOCX_ERRORS = {
+    "unique_ids": [
+        "  word/document.xml: Line 16: Duplicate id='1' in <bookmarkstart> "
+        "(first occurrence at line 5)"
+    ],
+    "all_relationship_ids": [],
+    "whitespace_preservation": [
+        "  word/document.xml: Line 7: w:t element with whitespace missing "
+        "xml:space='preserve': ' leading'",
+        "  word/document.xml: Line 13: w:t element with whitespace missing "
+        "xml:space='preserve': 'trailing '",
+    ],
+    "deletions": ["  word/document.xml: Line 20: <w:t> found within <w:del>: 'deleted'"],
+    "insertions": ["  word/document.xml: Line 27: <w:delText> within <w:ins>: 'odd'"],
+}
+
+PPTX_ERRORS = {
+    "unique_ids": [
+        "  ppt/presentation.xml: Line 9: Duplicate id='256' in <sldid> "
+        "(first occurrence at line 7)"
+    ],
+    "all_relationship_ids": [
+        "  ppt/presentation.xml: Line 10: <sldId> references non-existent "
+        "relationship 'rId99' (valid IDs: rId1, rId2, rId3, rId4, rId5)"
+    ],
+    "uuid_ids": [
+        "  ppt/presentation.xml: Line 12: ID '{12345678-1234-1234-1234-12345678901G}' "
+        "appears to be a UUID but contains invalid hex characters",
+        "  ppt/slides/slide1.xml: Line 8: ID 'abcdefgh-1234-1234-1234-123456789012' "
+        "appears to be a UUID but contains invalid hex characters",
+    ],
+}
+
+
+@pytest.fixture(params=[False, True], ids=["plain", "with_comment"])
+def comment(request):
+    """An XML comment to add on an existing line of each edited part, or ''."""
+    return "<!-- reviewed -->" if request.param else ""
+
+
+@pytest.fixture
+def visitor_docx(unpacked_docx, comment):
+    """unpacked_docx with duplicate IDs, whitespace, deletion and insertion errors.
+
+    The bookmarks inside mc:AlternateContent repeat an ID by design and are
+    not reported.
+    """
+    (unpacked_docx / "word/document.xml").write_text(
+        DOCUMENT.format(w=W, mc=MC, comment=comment), encoding="utf-8"
+    )
+    return unpacked_docx
+
+
+@pytest.fixture
+def visitor_pptx(unpacked_pptx, comment):
+    """unpacked_pptx with duplicate slide IDs, a missing r:id and malformed UUIDs."""
+    edit(
+        unpacked_pptx / "ppt/presentation.xml",
+        '<p:sldId id="258" r:id="rId5"/>',
+        f'<p:sldId id="256" r:id="rId5"/>{comment}\n'
+        '    <p:sldId id="259" r:id="rId99"/>',
+    )
+    edit(
+        unpacked_pptx / "ppt/presentation.xml",
+        "<p:sldSz ",
+        '<p:sldSz id="{12345678-1234-1234-1234-12345678901G}" ',
+    )
+    edit(
+        unpacked_pptx / "ppt/slides/slide1.xml",
+        "<p:cNvGrpSpPr/>",
+        f"<p:cNvGrpSpPr/>{comment}\n"
+        '        <p:cNvPr id="abcdefgh-1234-1234-1234-123456789012" name="x"/>',
+    )
+    return unpacked_pptx
+
+
+class TestElementVisitors:
+    """Each visitor reports what its check's own walk reported."""
+
+    @pytest.mark.parametrize("check", sorted(DOCX_ERRORS))
+    def test_docx(self, visitor_docx, check):
+        validator = DOCXSchemaValidator(visitor_docx, None)
+        assert validator.element_check_errors(check) == DOCX_ERRORS[check]
+
+    @pytest.mark.parametrize("check", sorted(PPTX_ERRORS))
+    def test_pptx(self, visitor_pptx, check):
+        validator = PPTXSchemaValidator(visitor_pptx, None)
+        assert validator.element_check_errors(check) == PPTX_ERRORS[check]
+
+    def test_checks_share_one_walk(self, monkeypatch, visitor_docx):
+        validator = DOCXSchemaValidator(visitor_docx, None)
+        walked = []
+        walk_part = validator._walk_part
+
+        def record(xml_file, *args):
+            walked.append(xml_file)
+            walk_part(xml_file, *args)
+
+        monkeypatch.setattr(validator, "_walk_part", record)
+        for check in DOCX_ERRORS:
+            validator.element_check_errors(check)
+        assert walked
+        assert len(walked) == len(set(walked))
@@ -0,0 +1,98 @@
+"""
+Tests for validating an Office file in place of its unpacked directory.
+"""
+
+import re
+
+import pytest
+from conftest import add_schema_error, edit
+from ooxml.scripts.pack import pack_document
+from ooxml.scripts.validation import (
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+)
+
+
+@pytest.fixture
+def broken_pptx(unpacked_pptx):
+    """unpacked_pptx with schema, relationship ID and broken reference errors."""
+    presentation = unpacked_pptx / "ppt/presentation.xml"
+    edit(presentation, "<p:notesSz", "<p:bogus/><p:notesSz")
+    edit(presentation, 'r:id="rId4"', 'r:id="rId99"')
+    edit(
+        unpacked_pptx / "ppt/slides/_rels/slide1.xml.rels",
+        'Target="../media/image1.png"',
+        'Target="../media/missing.png"',
+    )
+    (unpacked_pptx / "ppt/media/orphan.png").write_bytes(b"")
+    return unpacked_pptx
+
+
+@pytest.fixture
+def broken_docx(unpacked_docx):
+    """unpacked_docx with a schema error, a broken reference and an untracked edit."""
+    add_schema_error(unpacked_docx)
+    edit(unpacked_docx / "word/document.xml", "fox", "cat")
+    edit(
+        unpacked_docx / "word/_rels/document.xml.rels",
+        'Target="styles.xml"',
+        'Target="missing.xml"',
+    )
+    return unpacked_docx
+
+
+def validation_output(capsys, validator_classes, package, original):
+    """Run the validators on package and return their results and output.
+
+    Line numbers are replaced, as the parts in a packed file are condensed
+    onto fewer lines than the pretty-printed ones.
+    """
+    results = [
+        validator_class(package, original, verbose=True).validate()
+        for validator_class in validator_classes
+    ]
+    output = capsys.readouterr().out
+    output = re.sub(r"(?i)\bline \d+", "line N", output)
+    output = re.sub(r"\.(xml|rels):\d+", r".\1:N", output)
+    return results, output
+
+
+class TestZipMatchesDirectory:
+    """Validating a packed file reports what validating its directory does."""
+
+    @pytest.mark.parametrize(
+        "package, original, validator_classes",
+        [
+            ("broken_pptx", "pptx_file", [PPTXSchemaValidator]),
+            ("broken_docx", "docx_file", [DOCXSchemaValidator, RedliningValidator]),
+        ],
+    )
+    def test_same_errors(
+        self, request, tmp_path, capsys, package, original, validator_classes
+    ):
+        directory = request.getfixturevalue(package)
+        original = request.getfixturevalue(original)
+        packed = tmp_path / f"packed{original.suffix}"
+        assert pack_document(directory, packed)  # validate=False
+        capsys.readouterr()
+
+        from_directory = validation_output(
+            capsys, validator_classes, directory, original
+        )
+        from_zip = validation_output(capsys, validator_classes, packed, original)
+        assert from_directory[0] == from_zip[0]
+        assert False in from_directory[0]
+        assert "NEW validation errors" in from_directory[1]
+        assert "line N" in from_directory[1]
+        assert from_zip[1] == from_directory[1]
+
+    def test_clean_package_passes_both_ways(
+        self, tmp_path, capsys, unpacked_pptx, pptx_file
+    ):
+        packed = tmp_path / "packed.pptx"
+        pack_document(unpacked_pptx, packed)
+        for package in (unpacked_pptx, packed):
+            assert validation_output(
+                capsys, [PPTXSchemaValidator], package, pptx_file
+            )[0] == [True]
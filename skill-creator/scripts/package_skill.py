@@ -10,11 +10,16 @@ Example:
     python utils/package_skill.py skills/public/my-skill ./dist
 """
 
+import os
 import sys
 import zipfile
 from pathlib import Path
 from quick_validate import validate_skill
 
+# Development-only folders and files left out of packaged skills
+EXCLUDED_DIRS = {'__pycache__', '.pytest_cache', 'tests'}
+EXCLUDED_FILES = {'benchmark.py'}
+
 
 def package_skill(skill_path, output_dir=None):
     """
@@ -66,9 +71,14 @@ def package_skill(skill_path, output_dir=None):
     # Create the .skill file (zip format)
     try:
         with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
+            # Walk through the skill directory, following symlinked folders
+            # (e.g. a shared ooxml/) so the packaged skill is self-contained
+            for root, dirs, files in os.walk(skill_path, followlinks=True):
+                dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS)
+                for file_name in sorted(files):
+                    if file_name in EXCLUDED_FILES:
+                        continue
+                    file_path = Path(root) / file_name
                     # Calculate the relative path within the zip
                     arcname = file_path.relative_to(skill_path.parent)
                     zipf.write(file_path, arcname)